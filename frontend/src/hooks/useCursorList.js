@@ -0,0 +1,45 @@
+import { useCallback, useEffect, useRef, useState } from 'react'
+
+// Listado paginado por cursor: muestra la primera página y pide las siguientes bajo demanda
+// (`loadMore`), en lugar de recorrer todo el listado antes de renderizar.
+export function useCursorList(fetchPage) {
+  const [items, setItems] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loading, setLoading] = useState(true)
+  // Solo la última petición actualiza el estado (recargar descarta un "cargar más" en curso)
+  const latest = useRef(0)
+
+  const load = useCallback(async (cursor) => {
+    const request = ++latest.current
+    try {
+      const page = await fetchPage(cursor)
+      if (request !== latest.current) return
+      setItems((previous) => (cursor ? [...previous, ...page.results] : page.results))
+      setNextCursor(page.nextCursor)
+    } catch (error) {
+      console.error(error)
+    } finally {
+      if (request === latest.current) setLoading(false)
+    }
+  }, [fetchPage])
+
+  const reload = useCallback(() => {
+    setLoading(true)
+    return load(null)
+  }, [load])
+
+  const loadMore = useCallback(() => {
+    if (!nextCursor) return Promise.resolve()
+    setLoading(true)
+    return load(nextCursor)
+  }, [load, nextCursor])
+
+  useEffect(() => {
+    load(null)
+    return () => {
+      latest.current += 1
+    }
+  }, [load])
+
+  return { items, hasMore: Boolean(nextCursor), loading, loadMore, reload }
+}
@@ -1,12 +1,13 @@
-import React, { useEffect, useState } from 'react';
+import React, { useState } from 'react';
 import { Search, Filter, Plus, X, User } from 'lucide-react';
 import { Button } from '../components/ui/BaseComponents';
 import './Clients.css';
 import { fetchClients, createClient } from '../services/clients';
+import { useCursorList } from '../hooks/useCursorList';
 
 const Clients = () => {
     const [showModal, setShowModal] = useState(false);
-    const [clients, setClients] = useState([]);
+    const { items: clients, hasMore, loading, loadMore, reload } = useCursorList(fetchClients);
     const [formData, setFormData] = useState({
         name: '',
         email: '',
@@ -14,24 +15,11 @@ const Clients = () => {
         address: ''
     });
 
-    const loadClients = async () => {
-        try {
-            const data = await fetchClients();
-            setClients(data);
-        } catch (error) {
-            console.error('Error loading clients:', error);
-        }
-    };
-
-    useEffect(() => {
-        loadClients();
-    }, []);
-
     const handleSubmit = async (e) => {
         e.preventDefault();
         try {
             await createClient(formData);
-            await loadClients();
+            await reload();
             setShowModal(false);
             setFormData({ name: '', email: '', phone: '', address: '' });
         } catch (error) {
@@ -127,6 +115,13 @@ const Clients = () => {
                         </tbody>
                     </table>
                 </div>
+                {hasMore && (
+                    <div style={{display: 'flex', justifyContent: 'center', marginTop: '1rem'}}>
+                        <Button className="btn-secondary" onClick={loadMore} disabled={loading}>
+                            {loading ? 'Cargando...' : 'Cargar más'}
+                        </Button>
+                    </div>
+                )}
             </div>
 
             {/* Modal */}
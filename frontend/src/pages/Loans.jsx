@@ -1,9 +1,10 @@
-import React, { useEffect, useMemo, useState } from 'react';
+import React, { useMemo, useState } from 'react';
 import { Search, Filter, Plus, X, ChevronDown } from 'lucide-react';
 import { Button } from '../components/ui/BaseComponents';
 import './Loans.css';
 import { fetchClients } from '../services/clients';
 import { createLoan, fetchLoans } from '../services/loans';
+import { useCursorList } from '../hooks/useCursorList';
 
 const Loans = () => {
     const [showModal, setShowModal] = useState(false);
@@ -14,8 +15,11 @@ const Loans = () => {
         monthly_rate: '15'
     });
 
-    const [clients, setClients] = useState([]);
-    const [loans, setLoans] = useState([]);
+    // Primera página de cada listado; el resto se pide con "Cargar más".
+    const clientList = useCursorList(fetchClients);
+    const loanList = useCursorList(fetchLoans);
+    const clients = clientList.items;
+    const loans = loanList.items;
 
     const clientsById = useMemo(() => {
         const map = new Map();
@@ -25,35 +29,11 @@ const Loans = () => {
         return map;
     }, [clients]);
 
-    useEffect(() => {
-        let cancelled = false;
-
-        const load = async () => {
-            try {
-                const [clientsData, loansData] = await Promise.all([
-                    fetchClients(),
-                    fetchLoans(),
-                ]);
-                if (cancelled) return;
-                setClients(clientsData);
-                setLoans(loansData);
-            } catch (error) {
-                console.error(error);
-            }
-        };
-
-        load();
-        return () => {
-            cancelled = true;
-        };
-    }, []);
-
     const handleSubmit = async (e) => {
         e.preventDefault();
         try {
             await createLoan(formData);
-            const loansData = await fetchLoans();
-            setLoans(loansData);
+            await loanList.reload();
             setShowModal(false);
             setFormData({
                 client_id: '',
@@ -145,6 +125,13 @@ const Loans = () => {
                         </tbody>
                     </table>
                 </div>
+                {loanList.hasMore && (
+                    <div style={{display: 'flex', justifyContent: 'center', marginTop: '1rem'}}>
+                        <Button className="btn-secondary" onClick={loanList.loadMore} disabled={loanList.loading}>
+                            {loanList.loading ? 'Cargando...' : 'Cargar más'}
+                        </Button>
+                    </div>
+                )}
             </div>
 
             {/* Modal */}
@@ -181,6 +168,17 @@ const Loans = () => {
                                     </select>
                                     <ChevronDown size={16} style={{position: 'absolute', right: '1rem', top: '50%', transform: 'translateY(-50%)', pointerEvents: 'none', color: 'var(--text-secondary)'}} />
                                 </div>
+                                {clientList.hasMore && (
+                                    <Button
+                                        type="button"
+                                        className="btn-secondary"
+                                        onClick={clientList.loadMore}
+                                        disabled={clientList.loading}
+                                        style={{marginTop: '0.5rem', padding: '0.4rem 0.8rem', fontSize: '0.8rem'}}
+                                    >
+                                        {clientList.loading ? 'Cargando...' : 'Cargar más clientes'}
+                                    </Button>
+                                )}
                             </div>
 
                             <div className="form-row">
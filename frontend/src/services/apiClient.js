@@ -163,3 +163,10 @@ apiClient.interceptors.response.use(
     return Promise.reject(structuredError)
   }
 )
+
+// Una página de un listado por cursor (`results` + `next_cursor`); `nextCursor` es null en la última.
+// Para exportar el listado completo usar `?stream=ndjson` en lugar de recorrer las páginas.
+export async function fetchPage(url, cursor = null, params = {}) {
+  const { data } = await apiClient.get(url, { params: { ...params, ...(cursor ? { cursor } : {}) } })
+  return { results: data.results, nextCursor: data.next_cursor }
+}
@@ -1,8 +1,7 @@
-import { apiClient } from './apiClient'
+import { apiClient, fetchPage } from './apiClient'
 
-export async function fetchClients() {
-  const { data } = await apiClient.get('/clients/')
-  return data
+export async function fetchClients(cursor = null) {
+  return fetchPage('/clients/', cursor)
 }
 
 export async function createClient(clientData) {
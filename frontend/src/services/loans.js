@@ -1,8 +1,7 @@
-import { apiClient } from './apiClient'
+import { apiClient, fetchPage } from './apiClient'
 
-export async function fetchLoans() {
-  const { data } = await apiClient.get('/loans/')
-  return data
+export async function fetchLoans(cursor = null) {
+  return fetchPage('/loans/', cursor)
 }
 
 export async function createLoan(payload) {
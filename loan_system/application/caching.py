@@ -0,0 +1,188 @@
+"""Caché de lectura para los repositorios de clientes y préstamos.
+
+`CachedClientRepository` y `CachedLoanRepository` envuelven cualquier
+implementación de `ClientRepository`/`LoanRepository` (ver `ports.py`):
+
+- Mapa de identidad: cada entidad se lee una vez por instancia y las lecturas
+  siguientes devuelven el mismo objeto. Las vistas crean los repositorios por
+  request, así que el mapa vive lo que dura el request.
+- Nivel compartido opcional (`SharedCache`): entradas con TTL visibles para otros
+  requests y procesos. `create`/`save`/`save_many` actualizan el mapa e invalidan
+  las claves del nivel compartido.
+
+Lo que cambia con cada cuota o pago (`has_active_debt`, `with_active_debt`) se
+delega siempre. Los contadores de aciertos y fallos se acumulan por instancia
+(`stats`) y por proceso (`cache_stats()`).
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, Optional
+from uuid import UUID
+
+from domain.entities import Client, Loan, LoanStatus
+
+from .ports import ClientRepository, LoanRepository, SharedCache
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # mapa de identidad
+    shared_hits: int = 0
+    misses: int = 0  # leídas del repositorio envuelto
+
+
+CLIENTS = "client"
+LOANS = "loan"
+
+_totals: dict[str, CacheStats] = {}
+_totals_lock = threading.Lock()
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Aciertos/fallos acumulados en el proceso, por repositorio."""
+    with _totals_lock:
+        return {name: asdict(stats) for name, stats in _totals.items()}
+
+
+def reset_cache_stats() -> None:
+    with _totals_lock:
+        _totals.clear()
+
+
+def cache_key(name: str, entity_id: UUID) -> str:
+    """Clave del nivel compartido (para invalidar escrituras hechas fuera del repositorio)."""
+    return f"repo:{name}:{entity_id}"
+
+
+class _ReadThrough:
+    def __init__(self, name: str, shared: Optional[SharedCache], ttl: int) -> None:
+        self._name = name
+        self._shared = shared if ttl > 0 else None
+        self._ttl = ttl
+        self._identity: dict[UUID, object] = {}
+        self.stats = CacheStats()
+
+    def key(self, entity_id: UUID) -> str:
+        return cache_key(self._name, entity_id)
+
+    def get(self, entity_id: UUID, load: Callable[[UUID], object]):
+        return self.get_many([entity_id], lambda ids: {entity_id: load(entity_id)})[entity_id]
+
+    def get_many(self, entity_ids: Iterable[UUID], load_many: Callable[[list[UUID]], dict]) -> dict:
+        found: dict[UUID, object] = {}
+        missing: list[UUID] = []
+        for entity_id in dict.fromkeys(entity_ids):
+            entity = self._identity.get(entity_id)
+            if entity is None:
+                missing.append(entity_id)
+            else:
+                found[entity_id] = entity
+        hits = len(found)
+
+        shared_hits = 0
+        if missing and self._shared is not None:
+            cached = self._shared.get_many([self.key(entity_id) for entity_id in missing])
+            still_missing = []
+            for entity_id in missing:
+                entity = cached.get(self.key(entity_id))
+                if entity is None:
+                    still_missing.append(entity_id)
+                else:
+                    found[entity_id] = self._identity[entity_id] = entity
+            shared_hits = len(missing) - len(still_missing)
+            missing = still_missing
+
+        if missing:
+            loaded = load_many(missing)
+            self._identity.update(loaded)
+            found.update(loaded)
+            if self._shared is not None and loaded:
+                self._shared.set_many({self.key(entity_id): entity for entity_id, entity in loaded.items()}, self._ttl)
+
+        self._count(hits, shared_hits, len(missing))
+        return found
+
+    def written(self, entities: Iterable) -> None:
+        """Entidades guardadas: el mapa queda con la versión nueva y el nivel compartido se invalida."""
+        keys = []
+        for entity in entities:
+            self._identity[entity.id] = entity
+            keys.append(self.key(entity.id))
+        if self._shared is not None and keys:
+            self._shared.delete_many(keys)
+
+    def _count(self, hits: int, shared_hits: int, misses: int) -> None:
+        self.stats.hits += hits
+        self.stats.shared_hits += shared_hits
+        self.stats.misses += misses
+        with _totals_lock:
+            totals = _totals.setdefault(self._name, CacheStats())
+            totals.hits += hits
+            totals.shared_hits += shared_hits
+            totals.misses += misses
+
+
+class CachedClientRepository:
+    def __init__(self, inner: ClientRepository, shared: Optional[SharedCache] = None, ttl: int = 0) -> None:
+        self._inner = inner
+        self._cache = _ReadThrough(CLIENTS, shared, ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def get(self, client_id: UUID) -> Client:
+        return self._cache.get(client_id, self._inner.get)
+
+    def get_many(self, client_ids: Iterable[UUID]) -> dict[UUID, Client]:
+        return self._cache.get_many(client_ids, self._inner.get_many)
+
+    def has_active_debt(self, client_id: UUID) -> bool:
+        return self._inner.has_active_debt(client_id)
+
+    def with_active_debt(self, client_ids: Iterable[UUID]) -> set[UUID]:
+        return self._inner.with_active_debt(client_ids)
+
+
+class CachedLoanRepository:
+    def __init__(self, inner: LoanRepository, shared: Optional[SharedCache] = None, ttl: int = 0) -> None:
+        self._inner = inner
+        self._cache = _ReadThrough(LOANS, shared, ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def create(self, loan: Loan) -> Loan:
+        created = self._inner.create(loan)
+        self._cache.written([created])
+        return created
+
+    def get(self, loan_id: UUID) -> Loan:
+        return self._cache.get(loan_id, self._inner.get)
+
+    def get_many(self, loan_ids: Iterable[UUID]) -> dict[UUID, Loan]:
+        return self._cache.get_many(loan_ids, self._inner.get_many)
+
+    def save(self, loan: Loan) -> None:
+        self._inner.save(loan)
+        self._cache.written([loan])
+
+    def save_many(self, loans: Iterable[Loan]) -> None:
+        loans = list(loans)
+        self._inner.save_many(loans)
+        self._cache.written(loans)
+
+    # Sin guardar también se invalida: si la versión compartida estaba desactualizada, se descarta.
+    def save_if_status(self, loan: Loan, expected: LoanStatus) -> bool:
+        saved = self._inner.save_if_status(loan, expected)
+        self._cache.written([loan])
+        return saved
+
+    def save_many_if_status(self, loans: Iterable[Loan], expected: LoanStatus) -> int:
+        loans = list(loans)
+        saved = self._inner.save_many_if_status(loans, expected)
+        self._cache.written(loans)
+        return saved
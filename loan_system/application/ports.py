@@ -2,43 +2,109 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Protocol
+from typing import Iterable, Optional, Protocol
 from uuid import UUID
 
-from domain.entities import AuditEvent, Client, Installment, Loan, Payment
+from domain.entities import AuditEvent, Client, Installment, InstallmentStatus, Loan, LoanStatus, Payment
 
 
 class ClientRepository(Protocol):
     def get(self, client_id: UUID) -> Client: ...
 
+    def get_many(self, client_ids: Iterable[UUID]) -> dict[UUID, Client]: ...
+
     def has_active_debt(self, client_id: UUID) -> bool: ...
 
+    def with_active_debt(self, client_ids: Iterable[UUID]) -> set[UUID]: ...
+
 
 class LoanRepository(Protocol):
     def create(self, loan: Loan) -> Loan: ...
 
     def get(self, loan_id: UUID) -> Loan: ...
 
+    def get_many(self, loan_ids: Iterable[UUID]) -> dict[UUID, Loan]: ...
+
     def save(self, loan: Loan) -> None: ...
 
+    def save_many(self, loans: Iterable[Loan]) -> None: ...
+
+    def save_if_status(self, loan: Loan, expected: LoanStatus) -> bool:
+        """Guarda el nuevo estado solo si el préstamo sigue en `expected` (False si otra operación lo cambió)."""
+        ...
+
+    def save_many_if_status(self, loans: Iterable[Loan], expected: LoanStatus) -> int:
+        """Como `save_if_status` en bloque; devuelve cuántos préstamos se guardaron."""
+        ...
+
 
 class InstallmentRepository(Protocol):
     def list_by_loan(self, loan_id: UUID) -> list[Installment]: ...
 
+    def get(self, installment_id: UUID) -> Installment: ...
+
     def get_for_update(self, installment_id: UUID) -> Installment: ...
 
+    def get_many_for_update(self, installment_ids: Iterable[UUID]) -> dict[UUID, Installment]: ...
+
     def save(self, installment: Installment) -> None: ...
 
+    def save_many(self, installments: Iterable[Installment]) -> None: ...
+
+    def save_if_status(self, installment: Installment, expected: InstallmentStatus) -> bool:
+        """Guarda el nuevo estado solo si la cuota sigue en `expected` (False si otra operación la cambió)."""
+        ...
+
 
 class PaymentRepository(Protocol):
     def exists_by_reference(self, reference: str) -> bool: ...
 
-    def create(self, payment: Payment) -> Payment: ...
+    def existing_references(self, references: Iterable[str]) -> set[str]: ...
+
+    def create(self, payment: Payment) -> Payment:
+        """Inserta el pago; lanza `Conflict` si la referencia ya existe."""
+        ...
+
+    def create_many(self, payments: Iterable[Payment]) -> None:
+        """Inserta los pagos en bloque; lanza `Conflict` si alguna referencia ya existe."""
+        ...
 
 
 class AuditRepository(Protocol):
     def append(self, event: AuditEvent) -> None: ...
 
+    def append_many(self, events: Iterable[AuditEvent]) -> None: ...
+
+
+class AnalyticsProjection(Protocol):
+    """Proyección incremental de métricas (snapshot del dashboard)."""
+
+    def loan_created(self, loan: Loan) -> None: ...
+
+    def loan_decided(self, loan: Loan) -> None: ...
+
+    def payment_registered(self, payment: Payment, previous_status: InstallmentStatus) -> None: ...
+
+    def payments_registered(self, payments: Iterable[tuple[Payment, InstallmentStatus]]) -> None: ...
+
+
+class InstallmentScheduler(Protocol):
+    """Solicita la generación del plan de cuotas de un préstamo aprobado."""
+
+    def loan_approved(self, loan: Loan, approved_at: datetime) -> None: ...
+
+    def loans_approved(self, loans: Iterable[Loan], approved_at: datetime) -> None: ...
+
+
+class SharedCache(Protocol):
+    """Caché clave/valor compartida entre requests (nivel opcional de los repositorios cacheados)."""
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, object]: ...
+
+    def set_many(self, values: dict[str, object], ttl: int) -> None: ...
+
+    def delete_many(self, keys: Iterable[str]) -> None: ...
+
 
 class Clock(Protocol):
     def now(self) -> datetime: ...
@@ -0,0 +1,124 @@
+"""Unidad de trabajo: escrituras diferidas de un caso de uso o de un request.
+
+Los casos de uso registran lo que cambian en lugar de escribir cada repositorio
+por separado:
+
+- `add(entity)`: préstamo o pago nuevo; se inserta al vaciar, con su estado final.
+- `track(entity)`: entidad leída que puede cambiar. Se guarda una copia y al
+  vaciar solo se escribe si difiere, así que un cambio nulo no genera UPDATE.
+  Registrar dos veces la misma entidad conserva la primera copia: varios cambios
+  sobre ella terminan en una sola escritura.
+- `record(event)`: evento de auditoría.
+
+`flush()` escribe préstamos, cuotas, pagos y auditoría, en ese orden, con las
+operaciones en bloque de los puertos (`save_many`, `create_many`, `append_many`)
+cuando hay más de un elemento. Una cuota registrada sin `locked` se guarda con
+`save_if_status` contra el estado leído y, si otra operación la cambió entre
+medio, se lanza `Conflict`; las bloqueadas (`get_many_for_update`) van a
+`save_many`. Los préstamos se guardan igual, con `save_if_status` contra el
+estado leído: una lectura desactualizada (por ejemplo desde la caché
+compartida) no puede decidir dos veces el mismo préstamo.
+
+Funciona con cualquier implementación de los puertos, incluidos los dobles en
+memoria de los tests. La transacción la pone quien llama: en infraestructura,
+`unit_of_work()` vacía la unidad justo antes del COMMIT.
+"""
+from __future__ import annotations
+
+import copy
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+from uuid import UUID
+
+from domain.entities import AuditEvent, Installment, Loan, LoanStatus, Payment
+
+from .exceptions import Conflict
+from .ports import AuditRepository, InstallmentRepository, LoanRepository, PaymentRepository
+
+
+Tracked = Union[Loan, Installment]
+
+
+class UnitOfWork:
+    def __init__(
+        self,
+        loans: Optional[LoanRepository] = None,
+        installments: Optional[InstallmentRepository] = None,
+        payments: Optional[PaymentRepository] = None,
+        audit: Optional[AuditRepository] = None,
+    ) -> None:
+        self.loans = loans
+        self.installments = installments
+        self.payments = payments
+        self.audit = audit
+        self._new: dict[UUID, Union[Loan, Payment]] = {}
+        self._tracked: dict[tuple[type, UUID], tuple[Tracked, Tracked, bool]] = {}
+        self._events: list[AuditEvent] = []
+
+    def add(self, entity: Union[Loan, Payment]) -> None:
+        self._new[entity.id] = entity
+
+    def track(self, entity: Tracked, locked: bool = False) -> Tracked:
+        key = (type(entity), entity.id)
+        if key not in self._tracked and entity.id not in self._new:
+            self._tracked[key] = (entity, copy.copy(entity), locked)
+        return entity
+
+    def record(self, event: AuditEvent) -> None:
+        self._events.append(event)
+
+    def dirty(self) -> list[Tracked]:
+        """Entidades registradas con `track` que cambiaron desde que se leyeron."""
+        return [entity for entity, original, _ in self._tracked.values() if entity != original]
+
+    def flush(self) -> None:
+        new, tracked, events = list(self._new.values()), list(self._tracked.values()), self._events
+        self._new, self._tracked, self._events = {}, {}, []
+        changed = [(entity, original, locked) for entity, original, locked in tracked if entity != original]
+
+        for loan in (entity for entity in new if isinstance(entity, Loan)):
+            self.loans.create(loan)
+        loans_by_expected: dict[LoanStatus, list[Loan]] = {}
+        for entity, original, _ in changed:
+            if isinstance(entity, Loan):
+                loans_by_expected.setdefault(original.status, []).append(entity)
+        for expected, loans in loans_by_expected.items():
+            if len(loans) == 1:
+                saved = int(self.loans.save_if_status(loans[0], expected))
+            else:
+                saved = self.loans.save_many_if_status(loans, expected)
+            if saved != len(loans):
+                raise Conflict("El préstamo fue modificado por otra operación")
+
+        locked_installments = []
+        for entity, original, locked in changed:
+            if not isinstance(entity, Installment):
+                continue
+            if locked:
+                locked_installments.append(entity)
+            elif not self.installments.save_if_status(entity, original.status):
+                raise Conflict("La cuota fue modificada por otra operación")
+        _write(self.installments, "save", "save_many", locked_installments)
+
+        _write(self.payments, "create", "create_many", [entity for entity in new if isinstance(entity, Payment)])
+        _write(self.audit, "append", "append_many", events)
+
+
+def _write(repository, one: str, many: str, items: list) -> None:
+    # Un solo elemento va por la operación individual: los puertos (y sus dobles)
+    # no están obligados a tener la versión en bloque para casos de a uno.
+    if len(items) == 1:
+        getattr(repository, one)(items[0])
+    elif items:
+        getattr(repository, many)(items)
+
+
+@contextmanager
+def pending_writes(uow: Optional[UnitOfWork], **repositories) -> Iterator[UnitOfWork]:
+    """La unidad del request si la hay; si no, una propia que se vacía al salir del bloque."""
+    if uow is not None:
+        yield uow
+        return
+    own = UnitOfWork(**repositories)
+    yield own
+    own.flush()
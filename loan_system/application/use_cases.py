@@ -1,31 +1,38 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 from uuid import UUID, uuid4
 
 from domain.entities import (
     AuditEvent,
+    Client,
+    Installment,
     InstallmentStatus,
     Loan,
     LoanStatus,
     Payment,
     french_monthly_payment,
 )
-from domain.exceptions import BusinessRuleViolation
+from domain.exceptions import BusinessRuleViolation, DomainError
 from domain.value_objects import Money, Rate
 
-from .exceptions import Conflict, Forbidden
+from .exceptions import ApplicationError, Conflict, Forbidden, NotFound
 from .ports import (
     Actor,
+    AnalyticsProjection,
     AuditRepository,
     ClientRepository,
     Clock,
     InstallmentRepository,
+    InstallmentScheduler,
     LoanRepository,
     PaymentRepository,
 )
+from .unit_of_work import UnitOfWork, pending_writes
 
 
 @dataclass(frozen=True)
@@ -50,11 +57,15 @@ class CreateLoanUseCase:
         clients: ClientRepository,
         audit: AuditRepository,
         clock: Clock,
+        analytics: Optional[AnalyticsProjection] = None,
+        uow: Optional[UnitOfWork] = None,
     ) -> None:
         self._loans = loans
         self._clients = clients
         self._audit = audit
         self._clock = clock
+        self._analytics = analytics
+        self._uow = uow
 
     def execute(self, actor: Actor, cmd: CreateLoanCommand) -> CreateLoanResult:
         if actor.role not in {"ADMIN", "ANALYST"}:
@@ -79,21 +90,23 @@ class CreateLoanUseCase:
         if monthly_payment.amount > client.payment_capacity_monthly.amount:
             raise BusinessRuleViolation("Excede capacidad de pago")
 
-        created = self._loans.create(loan)
-
-        self._audit.append(
-            AuditEvent(
-                id=uuid4(),
-                actor_user_id=actor.user_id,
-                action="loan.created",
-                occurred_at=self._clock.now(),
-                before={},
-                after={"loan_id": str(created.id), "status": created.status.value},
-                meta={"client_id": str(client.id)},
+        with pending_writes(self._uow, loans=self._loans, audit=self._audit) as uow:
+            uow.add(loan)
+            if self._analytics is not None:
+                self._analytics.loan_created(loan)
+            uow.record(
+                AuditEvent(
+                    id=uuid4(),
+                    actor_user_id=actor.user_id,
+                    action="loan.created",
+                    occurred_at=self._clock.now(),
+                    before={},
+                    after={"loan_id": str(loan.id), "status": loan.status.value},
+                    meta={"client_id": str(client.id)},
+                )
             )
-        )
 
-        return CreateLoanResult(loan_id=created.id, monthly_payment=monthly_payment.amount)
+        return CreateLoanResult(loan_id=loan.id, monthly_payment=monthly_payment.amount)
 
 
 @dataclass(frozen=True)
@@ -111,18 +124,68 @@ class QuoteLoanResult:
     total_interest: Decimal
 
 
+QUOTE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=QUOTE_CACHE_SIZE)
+def _price_quote(
+    principal_amount: Decimal,
+    currency: str,
+    monthly_rate: Decimal,
+    term_months: int,
+) -> QuoteLoanResult:
+    principal = Money(principal_amount, currency)
+    rate = Rate(monthly_rate)
+    monthly = french_monthly_payment(principal, rate, term_months)
+    total_payment = (monthly.amount * Decimal(term_months)).quantize(Decimal("0.01"))
+    total_interest = (total_payment - principal.amount).quantize(Decimal("0.01"))
+    return QuoteLoanResult(
+        monthly_payment=monthly.amount,
+        total_payment=total_payment,
+        total_interest=total_interest,
+    )
+
+
 class QuoteLoanUseCase:
+    """Cotización pura (sin efectos): se memoiza por comando normalizado.
+
+    `Decimal("0.02")` y `Decimal("0.020000")` son iguales y comparten entrada;
+    el LRU acota la memoria al repetir combinaciones desde los sliders del front.
+    """
+
     def execute(self, cmd: QuoteLoanCommand) -> QuoteLoanResult:
-        principal = Money(cmd.principal_amount, cmd.currency)
-        rate = Rate(cmd.monthly_rate)
-        monthly = french_monthly_payment(principal, rate, cmd.term_months)
-        total_payment = (monthly.amount * Decimal(cmd.term_months)).quantize(Decimal("0.01"))
-        total_interest = (total_payment - principal.amount).quantize(Decimal("0.01"))
-        return QuoteLoanResult(
-            monthly_payment=monthly.amount,
-            total_payment=total_payment,
-            total_interest=total_interest,
-        )
+        return _price_quote(cmd.principal_amount, cmd.currency, cmd.monthly_rate, cmd.term_months)
+
+
+@dataclass(frozen=True)
+class QuoteLoanGridCommand:
+    principal_amount: Decimal
+    currency: str
+    monthly_rates: tuple[Decimal, ...]
+    term_months: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class QuoteLoanGridItem:
+    monthly_rate: Decimal
+    term_months: int
+    quote: QuoteLoanResult
+
+
+class QuoteLoanGridUseCase:
+    """Cotiza todas las combinaciones tasa × plazo para un mismo principal."""
+
+    def execute(self, cmd: QuoteLoanGridCommand) -> list[QuoteLoanGridItem]:
+        quote = QuoteLoanUseCase()
+        return [
+            QuoteLoanGridItem(
+                monthly_rate=rate,
+                term_months=term,
+                quote=quote.execute(QuoteLoanCommand(cmd.principal_amount, cmd.currency, rate, term)),
+            )
+            for rate in cmd.monthly_rates
+            for term in cmd.term_months
+        ]
 
 
 @dataclass(frozen=True)
@@ -139,45 +202,145 @@ class DecideLoanUseCase:
         clients: ClientRepository,
         audit: AuditRepository,
         clock: Clock,
+        analytics: Optional[AnalyticsProjection] = None,
+        installments: Optional[InstallmentScheduler] = None,
+        uow: Optional[UnitOfWork] = None,
     ) -> None:
         self._loans = loans
         self._clients = clients
         self._audit = audit
         self._clock = clock
+        self._analytics = analytics
+        self._installments = installments
+        self._uow = uow
 
     def execute(self, actor: Actor, cmd: DecideLoanCommand) -> None:
         if actor.role not in {"ADMIN", "ANALYST"}:
             raise Forbidden("Rol no autorizado")
 
-        loan = self._loans.get(cmd.loan_id)
-        client = self._clients.get(loan.client_id)
-
-        if cmd.approve:
-            if client.is_delinquent:
-                raise BusinessRuleViolation("Cliente moroso")
-            monthly_payment = french_monthly_payment(loan.principal, loan.rate, loan.term_months)
-            if monthly_payment.amount > client.payment_capacity_monthly.amount:
-                raise BusinessRuleViolation("Excede capacidad de pago")
-            if self._clients.has_active_debt(client.id):
-                raise BusinessRuleViolation("Cliente con deuda activa")
-            loan.approve()
-            action = "loan.approved"
-        else:
-            loan.reject()
-            action = "loan.rejected"
-
-        self._loans.save(loan)
-        self._audit.append(
-            AuditEvent(
-                id=uuid4(),
-                actor_user_id=actor.user_id,
-                action=action,
-                occurred_at=self._clock.now(),
-                before={},
-                after={"loan_id": str(loan.id), "status": loan.status.value, "reason": cmd.reason},
-                meta={"client_id": str(client.id)},
-            )
-        )
+        with pending_writes(self._uow, loans=self._loans, audit=self._audit) as uow:
+            loan = uow.track(self._loans.get(cmd.loan_id))
+            client = self._clients.get(loan.client_id)
+
+            action = _apply_decision(loan, client, cmd.approve, lambda: self._clients.has_active_debt(client.id))
+
+            if self._analytics is not None:
+                self._analytics.loan_decided(loan)
+            if self._installments is not None and loan.status == LoanStatus.APPROVED:
+                self._installments.loan_approved(loan, self._clock.now())
+            uow.record(_decision_event(actor, action, loan, client, cmd.reason, self._clock.now()))
+
+
+@dataclass(frozen=True)
+class DecideLoansBatchCommand:
+    decisions: tuple[DecideLoanCommand, ...]
+
+
+@dataclass(frozen=True)
+class LoanDecisionOutcome:
+    loan_id: UUID
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+
+class DecideLoansBatchUseCase:
+    """Decide muchos préstamos con lecturas y escrituras agrupadas.
+
+    Aplica las mismas reglas que `DecideLoanUseCase`, pero carga préstamos,
+    clientes y deuda activa en tres consultas y persiste estados y auditoría en
+    bloque. Los errores de negocio se reportan por préstamo sin abortar el lote;
+    una aprobación cuenta como deuda activa para el resto del lote.
+    """
+
+    def __init__(
+        self,
+        loans: LoanRepository,
+        clients: ClientRepository,
+        audit: AuditRepository,
+        clock: Clock,
+        analytics: Optional[AnalyticsProjection] = None,
+        installments: Optional[InstallmentScheduler] = None,
+        uow: Optional[UnitOfWork] = None,
+    ) -> None:
+        self._loans = loans
+        self._clients = clients
+        self._audit = audit
+        self._clock = clock
+        self._analytics = analytics
+        self._installments = installments
+        self._uow = uow
+
+    def execute(self, actor: Actor, cmd: DecideLoansBatchCommand) -> list[LoanDecisionOutcome]:
+        if actor.role not in {"ADMIN", "ANALYST"}:
+            raise Forbidden("Rol no autorizado")
+
+        loans = self._loans.get_many({d.loan_id for d in cmd.decisions})
+        clients = self._clients.get_many({loan.client_id for loan in loans.values()})
+        in_debt = self._clients.with_active_debt(clients.keys())
+
+        now = self._clock.now()
+        outcomes: list[LoanDecisionOutcome] = []
+        decided: dict[UUID, Loan] = {}
+        with pending_writes(self._uow, loans=self._loans, audit=self._audit) as uow:
+            for decision in cmd.decisions:
+                loan = loans.get(decision.loan_id)
+                if loan is None:
+                    outcomes.append(LoanDecisionOutcome(decision.loan_id, error="Préstamo no encontrado"))
+                    continue
+                client = clients[uow.track(loan).client_id]
+                try:
+                    action = _apply_decision(loan, client, decision.approve, lambda: client.id in in_debt)
+                except DomainError as exc:
+                    outcomes.append(LoanDecisionOutcome(loan.id, error=str(exc)))
+                    continue
+                if loan.status == LoanStatus.APPROVED:
+                    in_debt.add(client.id)
+                decided[loan.id] = loan
+                uow.record(_decision_event(actor, action, loan, client, decision.reason, now))
+                outcomes.append(LoanDecisionOutcome(loan.id, status=loan.status.value))
+
+            if self._analytics is not None:
+                for loan in decided.values():
+                    self._analytics.loan_decided(loan)
+            if self._installments is not None:
+                approved = [loan for loan in decided.values() if loan.status == LoanStatus.APPROVED]
+                if approved:
+                    self._installments.loans_approved(approved, now)
+        return outcomes
+
+
+def _apply_decision(loan: Loan, client: Client, approve: bool, has_active_debt: Callable[[], bool]) -> str:
+    if approve:
+        if client.is_delinquent:
+            raise BusinessRuleViolation("Cliente moroso")
+        monthly_payment = french_monthly_payment(loan.principal, loan.rate, loan.term_months)
+        if monthly_payment.amount > client.payment_capacity_monthly.amount:
+            raise BusinessRuleViolation("Excede capacidad de pago")
+        if has_active_debt():
+            raise BusinessRuleViolation("Cliente con deuda activa")
+        loan.approve()
+        return "loan.approved"
+    loan.reject()
+    return "loan.rejected"
+
+
+def _decision_event(
+    actor: Actor,
+    action: str,
+    loan: Loan,
+    client: Client,
+    reason: Optional[str],
+    occurred_at: datetime,
+) -> AuditEvent:
+    return AuditEvent(
+        id=uuid4(),
+        actor_user_id=actor.user_id,
+        action=action,
+        occurred_at=occurred_at,
+        before={},
+        after={"loan_id": str(loan.id), "status": loan.status.value, "reason": reason},
+        meta={"client_id": str(client.id)},
+    )
 
 
 @dataclass(frozen=True)
@@ -195,20 +358,21 @@ class RegisterPaymentUseCase:
         payments: PaymentRepository,
         audit: AuditRepository,
         clock: Clock,
+        analytics: Optional[AnalyticsProjection] = None,
+        uow: Optional[UnitOfWork] = None,
     ) -> None:
         self._installments = installments
         self._payments = payments
         self._audit = audit
         self._clock = clock
+        self._analytics = analytics
+        self._uow = uow
 
     def execute(self, actor: Actor, cmd: RegisterPaymentCommand) -> UUID:
         if actor.role not in {"ADMIN", "ANALYST", "CLIENT"}:
             raise Forbidden("Rol no autorizado")
 
-        if self._payments.exists_by_reference(cmd.reference):
-            raise Conflict("Pago duplicado")
-
-        installment = self._installments.get_for_update(cmd.installment_id)
+        installment = self._installments.get(cmd.installment_id)
         if installment.status == InstallmentStatus.PAID:
             raise Conflict("La cuota ya está pagada")
 
@@ -216,30 +380,139 @@ class RegisterPaymentUseCase:
         if money.amount != installment.amount.amount or money.currency != installment.amount.currency:
             raise BusinessRuleViolation("Monto inválido para la cuota")
 
-        installment.mark_paid()
-        self._installments.save(installment)
+        writes = {"installments": self._installments, "payments": self._payments, "audit": self._audit}
+        with pending_writes(self._uow, **writes) as uow:
+            # Sin bloqueo: al vaciar, la cuota se guarda con un UPDATE condicionado al
+            # estado leído, que descarta pagos concurrentes sin un SELECT ... FOR UPDATE.
+            previous_status = uow.track(installment).status
+            installment.mark_paid()
+
+            payment = Payment(
+                id=uuid4(),
+                loan_id=installment.loan_id,
+                installment_id=installment.id,
+                reference=cmd.reference,
+                amount=money,
+                paid_at=self._clock.now(),
+            )
+            payment.validate()
+            # La unicidad de `reference` la garantiza la base: un duplicado lanza Conflict y
+            # la transacción del caller revierte el cambio de estado de la cuota.
+            uow.add(payment)
+            if self._analytics is not None:
+                self._analytics.payment_registered(payment, previous_status)
+            uow.record(_payment_event(actor, payment, self._clock.now()))
+
+        return payment.id
+
+
+@dataclass(frozen=True)
+class RegisterPaymentsBatchCommand:
+    payments: tuple[RegisterPaymentCommand, ...]
+
+
+@dataclass(frozen=True)
+class PaymentOutcome:
+    installment_id: UUID
+    reference: str
+    payment_id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class RegisterPaymentsBatchUseCase:
+    """Registra un bloque de pagos (archivos de conciliación bancaria).
+
+    Aplica las mismas validaciones que `RegisterPaymentUseCase`, pero bloquea las
+    cuotas del bloque en una consulta, detecta referencias ya registradas con un
+    único `IN` y persiste cuotas, pagos y auditoría en bloque. Los rechazos se
+    informan por fila sin abortar el bloque; una referencia o cuota repetida
+    dentro del mismo bloque se rechaza a partir de su segunda aparición.
+    """
+
+    def __init__(
+        self,
+        installments: InstallmentRepository,
+        payments: PaymentRepository,
+        audit: AuditRepository,
+        clock: Clock,
+        analytics: Optional[AnalyticsProjection] = None,
+        uow: Optional[UnitOfWork] = None,
+    ) -> None:
+        self._installments = installments
+        self._payments = payments
+        self._audit = audit
+        self._clock = clock
+        self._analytics = analytics
+        self._uow = uow
+
+    def execute(self, actor: Actor, cmd: RegisterPaymentsBatchCommand) -> list[PaymentOutcome]:
+        if actor.role not in {"ADMIN", "ANALYST"}:
+            raise Forbidden("Rol no autorizado")
+
+        installments = self._installments.get_many_for_update({p.installment_id for p in cmd.payments})
+        seen = self._payments.existing_references({p.reference for p in cmd.payments})
+
+        now = self._clock.now()
+        outcomes: list[PaymentOutcome] = []
+        paid: list[tuple[Payment, InstallmentStatus]] = []
+        writes = {"installments": self._installments, "payments": self._payments, "audit": self._audit}
+        with pending_writes(self._uow, **writes) as uow:
+            for installment in installments.values():
+                uow.track(installment, locked=True)
+            for item in cmd.payments:
+                try:
+                    payment, previous_status = self._accept(item, installments.get(item.installment_id), seen, now)
+                except (ApplicationError, DomainError) as exc:
+                    outcomes.append(PaymentOutcome(item.installment_id, item.reference, error=str(exc)))
+                    continue
+                seen.add(payment.reference)
+                paid.append((payment, previous_status))
+                uow.add(payment)
+                uow.record(_payment_event(actor, payment, now))
+                outcomes.append(PaymentOutcome(item.installment_id, item.reference, payment_id=payment.id))
+
+            if self._analytics is not None:
+                self._analytics.payments_registered(paid)
+        return outcomes
+
+    @staticmethod
+    def _accept(
+        item: RegisterPaymentCommand,
+        installment: Optional[Installment],
+        seen: set[str],
+        now: datetime,
+    ) -> tuple[Payment, InstallmentStatus]:
+        if item.reference in seen:
+            raise Conflict("Pago duplicado")
+        if installment is None:
+            raise NotFound("Cuota no encontrada")
+        if installment.status == InstallmentStatus.PAID:
+            raise Conflict("La cuota ya está pagada")
+        money = Money(item.amount, item.currency)
+        if money.amount != installment.amount.amount or money.currency != installment.amount.currency:
+            raise BusinessRuleViolation("Monto inválido para la cuota")
 
         payment = Payment(
             id=uuid4(),
             loan_id=installment.loan_id,
             installment_id=installment.id,
-            reference=cmd.reference,
+            reference=item.reference,
             amount=money,
-            paid_at=self._clock.now(),
+            paid_at=now,
         )
         payment.validate()
-        created = self._payments.create(payment)
-
-        self._audit.append(
-            AuditEvent(
-                id=uuid4(),
-                actor_user_id=actor.user_id,
-                action="payment.registered",
-                occurred_at=self._clock.now(),
-                before={},
-                after={"payment_id": str(created.id), "reference": created.reference},
-                meta={"installment_id": str(installment.id), "loan_id": str(installment.loan_id)},
-            )
-        )
-
-        return created.id
+        previous_status = installment.status
+        installment.mark_paid()
+        return payment, previous_status
+
+
+def _payment_event(actor: Actor, payment: Payment, occurred_at: datetime) -> AuditEvent:
+    return AuditEvent(
+        id=uuid4(),
+        actor_user_id=actor.user_id,
+        action="payment.registered",
+        occurred_at=occurred_at,
+        before={},
+        after={"payment_id": str(payment.id), "reference": payment.reference},
+        meta={"installment_id": str(payment.installment_id), "loan_id": str(payment.loan_id)},
+    )
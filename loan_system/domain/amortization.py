@@ -0,0 +1,168 @@
+"""Tabla de amortización (método francés)."""
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Iterable
+
+from .entities import french_monthly_payment
+from .exceptions import ValidationError
+from .value_objects import Money, Rate, quantize_money
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduledInstallment:
+    number: int
+    due_date: date
+    payment: Money
+    interest: Money
+    principal: Money
+    balance: Money
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleRequest:
+    principal: Money
+    rate: Rate
+    term_months: int
+    start_date: date
+
+
+def add_months(value: date, months: int) -> date:
+    """Suma meses calendario ajustando al último día del mes si es necesario."""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return date(year, month, day)
+
+
+_AmountRow = tuple[Money, Money, Money, Money]
+
+
+def _amount_rows(principal: Money, rate: Rate, term_months: int) -> list[_AmountRow]:
+    """(cuota, interés, capital, saldo) por período, en centavos exactos.
+
+    Los intereses se redondean período a período; la última cuota absorbe la
+    diferencia para que el capital amortizado sume exactamente el principal.
+    """
+    payment = french_monthly_payment(principal, rate, term_months).amount
+    r = rate.monthly_rate
+    balance = principal.amount
+    rows = []
+    for number in range(1, term_months + 1):
+        interest = quantize_money(balance * r)
+        if number == term_months:
+            amortized = balance
+        else:
+            amortized = min(payment - interest, balance)
+        balance -= amortized
+        rows.append(
+            (
+                Money(interest + amortized, principal.currency),
+                Money(interest, principal.currency),
+                Money(amortized, principal.currency),
+                Money(balance, principal.currency),
+            )
+        )
+    return rows
+
+
+def _build(amounts: list[_AmountRow], due_dates: list[date]) -> list[ScheduledInstallment]:
+    return [
+        ScheduledInstallment(
+            number=number,
+            due_date=due_date,
+            payment=payment,
+            interest=interest,
+            principal=amortized,
+            balance=balance,
+        )
+        for number, (due_date, (payment, interest, amortized, balance)) in enumerate(zip(due_dates, amounts), start=1)
+    ]
+
+
+def amortization_schedule(
+    principal: Money,
+    rate: Rate,
+    term_months: int,
+    start_date: date,
+) -> list[ScheduledInstallment]:
+    """Cuotas mensuales con desglose de interés, capital y saldo.
+
+    La cuota `k` vence `k` meses después de `start_date`.
+    """
+    if term_months <= 0:
+        raise ValidationError("Plazo inválido")
+    amounts = _amount_rows(principal, rate, term_months)
+    due_dates = [add_months(start_date, k) for k in range(1, term_months + 1)]
+    return _build(amounts, due_dates)
+
+
+def amortization_schedules(requests: Iterable[ScheduleRequest]) -> list[list[ScheduledInstallment]]:
+    """Calcula muchas tablas a la vez (mismo orden que `requests`).
+
+    Las carteras repiten montos, tasas, plazos y fechas de inicio: los importes
+    se calculan una vez por (principal, tasa, plazo) y los vencimientos una vez
+    por (fecha, plazo), y los `Money` (inmutables) se comparten entre tablas.
+    El resultado es idéntico a `amortization_schedule`.
+    """
+    amounts_cache: dict[tuple[Decimal, str, Decimal, int], list[_AmountRow]] = {}
+    dates_cache: dict[tuple[date, int], list[date]] = {}
+    schedules = []
+    for req in requests:
+        if req.term_months <= 0:
+            raise ValidationError("Plazo inválido")
+        amount_key = (req.principal.amount, req.principal.currency, req.rate.monthly_rate, req.term_months)
+        amounts = amounts_cache.get(amount_key)
+        if amounts is None:
+            amounts = amounts_cache[amount_key] = _amount_rows(req.principal, req.rate, req.term_months)
+        date_key = (req.start_date, req.term_months)
+        due_dates = dates_cache.get(date_key)
+        if due_dates is None:
+            due_dates = dates_cache[date_key] = [add_months(req.start_date, k) for k in range(1, req.term_months + 1)]
+        schedules.append(_build(amounts, due_dates))
+    return schedules
+
+
+@dataclass(frozen=True, slots=True)
+class RepriceRequest:
+    """Cuotas abiertas de un préstamo (en orden), calculadas con `rate`, a re-tasar con `new_rate`."""
+
+    open_payments: tuple[Money, ...]
+    rate: Rate
+    new_rate: Rate
+
+
+def outstanding_balance(payments: Iterable[Money], rate: Rate) -> Money:
+    """Saldo de capital: valor presente de las cuotas restantes a la tasa con que se calcularon."""
+    factor = Decimal(1) + rate.monthly_rate
+    payments = list(payments)
+    total = sum((p.amount / factor**k for k, p in enumerate(payments, start=1)), Decimal(0))
+    return Money(total, payments[0].currency if payments else "USD")
+
+
+def repriced_payments(requests: Iterable[RepriceRequest]) -> list[list[Money]]:
+    """Importes de las cuotas abiertas de cada préstamo con la nueva tasa.
+
+    El saldo pendiente (`outstanding_balance`) se amortiza con `new_rate` en la
+    misma cantidad de cuotas; la última absorbe el redondeo. Si la tasa no cambia,
+    las cuotas quedan como están. Igual que en `amortization_schedules`, las tablas
+    se calculan una vez por combinación repetida.
+    """
+    plans: dict[tuple[Decimal, str, Decimal, int], list[Money]] = {}
+    results = []
+    for req in requests:
+        if not req.open_payments or req.new_rate.monthly_rate == req.rate.monthly_rate:
+            results.append(list(req.open_payments))
+            continue
+        balance = outstanding_balance(req.open_payments, req.rate)
+        term = len(req.open_payments)
+        key = (balance.amount, balance.currency, req.new_rate.monthly_rate, term)
+        payments = plans.get(key)
+        if payments is None:
+            payments = plans[key] = [row[0] for row in _amount_rows(balance, req.new_rate, term)]
+        results.append(payments)
+    return results
@@ -1,21 +1,149 @@
 from __future__ import annotations
 
+from datetime import date
+from typing import Optional
+
 from celery import shared_task
 
 
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def generate_installments_task(self, loan_id: str, start_date_iso: Optional[str] = None) -> dict:
+    from infrastructure.django_apps.loans.installments import generate_installments
+
+    result = generate_installments([loan_id], _parse_date(start_date_iso))
+    return {"status": "ok", "loan_id": loan_id, **result}
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def generate_installments_batch_task(self, loan_ids: list[str], start_date_iso: Optional[str] = None) -> dict:
+    # Una sola transacción y un INSERT por lote para todo el backlog de aprobaciones.
+    from infrastructure.django_apps.loans.installments import generate_installments
+
+    result = generate_installments(loan_ids, _parse_date(start_date_iso))
+    return {"status": "ok", **result}
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def mark_overdue_installments_task(self, today_iso: Optional[str] = None) -> dict:
+    # Nocturna (beat): cada bloque confirma por separado, así un reintento sigue donde quedó.
+    from infrastructure.django_apps.loans.overdue import sweep_overdue_installments
+
+    result = sweep_overdue_installments(_parse_date(today_iso))
+    return {"status": "ok", **result}
+
+
+def _reprice_options(new_rate: str, current_rate: Optional[str], dry_run: bool):
+    from decimal import Decimal
+
+    from infrastructure.django_apps.loans.repricing import RepriceOptions
+
+    return RepriceOptions(
+        new_rate=Decimal(new_rate),
+        current_rate=Decimal(current_rate) if current_rate is not None else None,
+        dry_run=dry_run,
+    )
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def recalc_interest_task(self, loan_id: str, new_rate: str, dry_run: bool = False) -> dict:
+    from infrastructure.django_apps.loans.repricing import reprice_loans
+
+    result = reprice_loans(_reprice_options(new_rate, None, dry_run), loan_ids=[loan_id])
+    return {"status": "ok", "loan_id": loan_id, **result}
+
+
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
-def generate_installments_task(self, loan_id: str) -> dict:
-    # Placeholder: generar cuotas para un préstamo aprobado.
-    return {"status": "todo", "loan_id": loan_id}
+def recalc_interest_range_task(
+    self,
+    lo: Optional[str],
+    hi: Optional[str],
+    new_rate: str,
+    current_rate: Optional[str] = None,
+    dry_run: bool = False,
+) -> dict:
+    # Un rango [lo, hi) de IDs de préstamo; los bloques ya confirmados no cambian al reintentar.
+    from uuid import UUID
+
+    from infrastructure.django_apps.loans.repricing import reprice_loans
+
+    result = reprice_loans(
+        _reprice_options(new_rate, current_rate, dry_run),
+        lo=UUID(lo) if lo else None,
+        hi=UUID(hi) if hi else None,
+    )
+    return {"status": "ok", "lo": lo, "hi": hi, **result}
+
+
+@shared_task(bind=True)
+def recalc_interest_portfolio_task(
+    self,
+    new_rate: str,
+    current_rate: Optional[str] = None,
+    dry_run: bool = False,
+    shards: int = 16,
+) -> dict:
+    # Reparte la cartera en `shards` rangos de UUID, uno por tarea (en paralelo entre workers).
+    from celery import group
+
+    from infrastructure.django_apps.loans.repricing import id_ranges
+
+    ranges = [(str(lo) if lo else None, str(hi) if hi else None) for lo, hi in id_ranges(shards)]
+    result = group(
+        recalc_interest_range_task.s(lo, hi, new_rate, current_rate, dry_run) for lo, hi in ranges
+    ).apply_async()
+    return {"status": "queued", "shards": len(ranges), "task_ids": [child.id for child in result.children]}
 
 
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
-def recalc_interest_task(self, loan_id: str) -> dict:
-    # Placeholder: recalcular intereses bajo evento controlado.
-    return {"status": "todo", "loan_id": loan_id}
+def audit_write_task(self, events: list[dict]) -> dict:
+    # Lote de eventos de auditoría encolado por BufferedAuditRepository(use_celery=True).
+    from infrastructure.repositories.django_repositories import deserialize_audit_event, write_audit_events
+
+    write_audit_events([deserialize_audit_event(event) for event in events])
+    return {"status": "ok", "events": len(events)}
+
+
+# ValueError: formato inválido o export_id ya usado con otro rango (`ExportMismatch`); reintentar no sirve.
+@shared_task(
+    bind=True, autoretry_for=(Exception,), dont_autoretry_for=(ValueError,), retry_backoff=True, max_retries=5
+)
+def audit_export_task(self, since_iso: str, until_iso: Optional[str] = None, fmt: str = "ndjson") -> dict:
+    # Los reintentos reanudan desde el checkpoint de la exportación (mismo export_id).
+    from django.utils.dateparse import parse_datetime
+
+    from infrastructure.django_apps.audit.export import ExportOptions, export_audit_log
+
+    options = ExportOptions(
+        since=parse_datetime(since_iso),
+        until=parse_datetime(until_iso) if until_iso else None,
+        fmt=fmt,
+    )
+    manifest = export_audit_log(options)
+    return {
+        "status": "ok",
+        "since": since_iso,
+        "export_id": manifest["export_id"],
+        "rows": manifest["rows"],
+        "parts": len(manifest["parts"]),
+    }
 
 
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
-def audit_export_task(self, since_iso: str) -> dict:
-    # Placeholder: exportar auditoría.
-    return {"status": "todo", "since": since_iso}
+def audit_maintenance_task(self, ahead: int = 2) -> dict:
+    # Mensual (beat): crea las particiones próximas y archiva los meses fríos.
+    from django.conf import settings
+    from django.utils import timezone
+
+    from domain.amortization import add_months
+    from infrastructure.django_apps.audit import partitions
+    from infrastructure.django_apps.audit.archive import archive_month, cold_months
+
+    current = partitions.month_of(timezone.now())
+    created = partitions.ensure_partitions(add_months(current, k) for k in range(ahead + 1))
+    cold = cold_months(timezone.localdate(), settings.AUDIT_HOT_MONTHS)
+    archived = [archive_month(month)["export_id"] for month in cold]
+    return {"status": "ok", "created": [f"{month:%Y-%m}" for month in created], "archived": archived}
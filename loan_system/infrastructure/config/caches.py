@@ -0,0 +1,10 @@
+"""Alcance de las cachés configuradas en `CACHES`."""
+from __future__ import annotations
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_process_local(alias: str) -> bool:
+    """LocMem: cada worker tiene la suya y no ve lo que escriben o invalidan los demás."""
+    return isinstance(caches[alias], LocMemCache)
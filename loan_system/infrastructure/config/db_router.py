@@ -0,0 +1,143 @@
+"""Réplica de lectura: listados, dashboard y exportaciones fuera de la primaria.
+
+Con una base `replica` configurada (`REPLICA_DATABASE_URL` o `MYSQL_REPLICA_HOST`),
+las lecturas dentro de `replica_reads()` van a la réplica. Así entran las vistas
+con `replica_methods` (dashboard, `GET` de clientes y préstamos) y las
+exportaciones de auditoría. Todo lo demás usa `default`:
+
+- Escrituras, siempre (`db_for_write`).
+- Lecturas dentro de una transacción abierta en la primaria (casos de uso en
+  `unit_of_work`, `transaction.atomic`): deben ver lo que la transacción escribió.
+- Lecturas de un usuario que escribió hace menos de `REPLICA_PIN_SECONDS`
+  (leer lo propio): la réplica puede no tener todavía esa escritura. La marca
+  vive en `CACHES[REPLICA_PIN_CACHE_ALIAS]`, que tiene que ser compartida por
+  los workers (Redis): con LocMem el siguiente request del usuario podría caer
+  en otro proceso y leer la réplica atrasada, así que el router no arranca.
+
+Sin réplica configurada el router devuelve siempre `default`.
+"""
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+from .caches import is_process_local
+
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "default"
+REPLICA = "replica"
+
+_read_alias: ContextVar[str] = ContextVar("read_alias", default=PRIMARY)
+
+
+def replica_available() -> bool:
+    return REPLICA in connections
+
+
+def read_alias() -> str:
+    """Base a la que iría una lectura ahora mismo."""
+    alias = _read_alias.get()
+    if alias != PRIMARY and connections[PRIMARY].in_atomic_block:
+        return PRIMARY
+    return alias
+
+
+@contextmanager
+def replica_reads():
+    """Las lecturas del bloque van a la réplica, si hay una; devuelve el alias elegido."""
+    alias = REPLICA if replica_available() else PRIMARY
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
+
+
+def bind_reads(rows: Iterable) -> Iterator:
+    """Itera `rows` con el alias actual: para querysets que se evalúan después (streaming)."""
+    alias = _read_alias.get()
+
+    def rows_from_alias() -> Iterator:
+        iterator = iter(rows)
+        while True:
+            token = _read_alias.set(alias)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _read_alias.reset(token)
+            yield item
+
+    return rows_from_alias()
+
+
+def _pin_key(user_id) -> str:
+    return f"db:pin:{user_id}"
+
+
+def pin_to_primary(user_id) -> None:
+    """Después de escribir, las lecturas de `user_id` van a la primaria por `REPLICA_PIN_SECONDS`."""
+    seconds = settings.REPLICA_PIN_SECONDS
+    if user_id is None or seconds <= 0 or not replica_available():
+        return
+    try:
+        caches[settings.REPLICA_PIN_CACHE_ALIAS].set(_pin_key(user_id), True, timeout=seconds)
+    except Exception:
+        logger.warning("Caché de fijación a la primaria no disponible", exc_info=True)
+
+
+def pinned_to_primary(user_id: Optional[object]) -> bool:
+    if user_id is None or not replica_available():
+        return False
+    try:
+        return bool(caches[settings.REPLICA_PIN_CACHE_ALIAS].get(_pin_key(user_id)))
+    except Exception:
+        # Sin caché no se puede saber si escribió: la primaria nunca devuelve datos viejos.
+        logger.warning("Caché de fijación a la primaria no disponible", exc_info=True)
+        return True
+
+
+def check_pin_cache() -> None:
+    """Con réplica, la fijación a la primaria necesita una caché que vean todos los workers."""
+    if not replica_available():
+        return
+    alias = settings.REPLICA_PIN_CACHE_ALIAS
+    if is_process_local(alias) or isinstance(caches[alias], DummyCache):
+        raise ImproperlyConfigured(
+            f"La réplica de lectura requiere una caché compartida en CACHES[{alias!r}] "
+            "(CACHE_URL=redis://...) para fijar a la primaria a quien acaba de escribir"
+        )
+
+
+class PrimaryReplicaRouter:
+    """`DATABASE_ROUTERS`: escrituras a `default`, lecturas según `replica_reads()`."""
+
+    def __init__(self) -> None:
+        check_pin_cache()
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Ambas bases tienen los mismos datos (con demora).
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por replicación.
+        if db == REPLICA:
+            return False
+        return None
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
 import environ
+from celery.schedules import crontab
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent  # loan_system/
@@ -16,6 +18,18 @@ env = environ.Env(
     JWT_ACCESS_MINUTES=(int, 5),
     JWT_REFRESH_DAYS=(int, 1),
     LOG_LEVEL=(str, "INFO"),
+    ANALYTICS_DASHBOARD_SNAPSHOT=(bool, True),
+    AUDIT_WRITE_MODE=(str, "sync"),
+    AUDIT_PARTITIONS=(bool, False),
+    AUDIT_HOT_MONTHS=(int, 12),
+    REPOSITORY_CACHE_TTL=(int, 0),
+    RATELIMIT_LEASE_DIVISOR=(int, 20),
+    RATELIMIT_FAIL_OPEN=(bool, True),
+    JWT_USER_CACHE_TTL=(int, 60),
+    REPLICA_PIN_SECONDS=(int, 5),
+    REQUEST_METRICS=(bool, True),
+    METRICS_FLUSH_SECONDS=(int, 5),
+    REQUEST_SLOW_MS=(int, 1000),
 )
 
 _env_file = BASE_DIR.parent / ".env"
@@ -39,6 +53,7 @@ INSTALLED_APPS = [
     "infrastructure.django_apps.accounts",
     "infrastructure.django_apps.loans",
     "infrastructure.django_apps.audit",
+    "infrastructure.django_apps.analytics",
 ]
 
 MIDDLEWARE = [
@@ -51,6 +66,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "infrastructure.security.request_id.RequestIdMiddleware",
+    "infrastructure.security.request_metrics.RequestMetricsMiddleware",
     "infrastructure.security.security_middleware.SecurityHeadersMiddleware",
     "infrastructure.security.security_middleware.RateLimitHeadersMiddleware",
 ]
@@ -100,6 +116,31 @@ if env("MYSQL_NAME", default=""):
         }
     }
 
+# Réplica de lectura opcional (ver infrastructure/config/db_router.py): dashboard,
+# listados y exportaciones leen de "replica"; escrituras y transacciones de
+# "default". Tras escribir, el usuario lee de la primaria REPLICA_PIN_SECONDS; la marca
+# va en CACHES[REPLICA_PIN_CACHE_ALIAS], que debe ser compartida (CACHE_URL).
+if env("MYSQL_NAME", default="") and env("MYSQL_REPLICA_HOST", default=""):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": env("MYSQL_REPLICA_HOST"),
+        "PORT": env("MYSQL_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+    }
+elif env("REPLICA_DATABASE_URL", default=""):
+    DATABASES["replica"] = env.db("REPLICA_DATABASE_URL")
+if "replica" in DATABASES:
+    # Nadie escribe en la réplica; en tests apunta a la base de prueba de default.
+    DATABASES["replica"]["ATOMIC_REQUESTS"] = False
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["infrastructure.config.db_router.PrimaryReplicaRouter"]
+REPLICA_PIN_SECONDS = env("REPLICA_PIN_SECONDS")
+REPLICA_PIN_CACHE_ALIAS = env("REPLICA_PIN_CACHE_ALIAS", default="default")
+
+# Transacción de los requests de solo lectura en las bases con ATOMIC_REQUESTS:
+# none (autocommit), read_only (SET TRANSACTION READ ONLY) o atomic (ver
+# interfaces/api/transactions.py). Las escrituras siempre son atómicas.
+READ_REQUEST_TRANSACTION = env("READ_REQUEST_TRANSACTION", default="none")
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -117,9 +158,56 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "accounts.User"
 
+# Dashboard servido desde contadores materializados (ver `rebuild_dashboard_snapshot`).
+ANALYTICS_DASHBOARD_SNAPSHOT = env("ANALYTICS_DASHBOARD_SNAPSHOT")
+
+# Escritura de auditoría: sync (INSERT en la transacción), buffered (bulk_create al
+# confirmar) o celery (lote encolado en `audit_write_task`). Ver docs/OPERACION.md.
+AUDIT_WRITE_MODE = env("AUDIT_WRITE_MODE")
+
+# Destino de `audit_export_task` / `export_audit_log` (partes .gz, checkpoint y manifiesto).
+AUDIT_EXPORT_DIR = env("AUDIT_EXPORT_DIR", default=str(BASE_DIR / "exports" / "audit"))
+
+# Particiones mensuales de auditoría (`audit_partitions`) y retención: los últimos
+# AUDIT_HOT_MONTHS meses quedan en la base; los anteriores se archivan en AUDIT_ARCHIVE_DIR.
+AUDIT_PARTITIONS = env("AUDIT_PARTITIONS")
+AUDIT_HOT_MONTHS = env("AUDIT_HOT_MONTHS")
+AUDIT_ARCHIVE_DIR = env("AUDIT_ARCHIVE_DIR", default=str(BASE_DIR / "archive" / "audit"))
+
+# Caché de Django. Sin CACHE_URL (p. ej. redis://redis-host:6379/3) es LocMem por proceso:
+# fuera de DEBUG la autenticación JWT no cachea usuarios (ver jwt_auth.py) y con réplica
+# de lectura el router no arranca (la fijación a la primaria debe verse en todos los workers).
+CACHES = {
+    "default": env.cache("CACHE_URL")
+    if env("CACHE_URL", default="")
+    else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+# Repositorios de clientes/préstamos: mapa de identidad por request siempre; con
+# REPOSITORY_CACHE_TTL > 0 (segundos) además caché compartida en CACHES[REPOSITORY_CACHE_ALIAS].
+REPOSITORY_CACHE_TTL = env("REPOSITORY_CACHE_TTL")
+REPOSITORY_CACHE_ALIAS = env("REPOSITORY_CACHE_ALIAS", default="default")
+
+# Rate limiting de las vistas (`infrastructure/security/rate_limit.py`): contadores
+# local (por proceso), sqlite (archivo compartido por los workers de la máquina) o
+# redis (compartido entre máquinas; RATELIMIT_LOCATION es la URL).
+RATELIMIT_BACKEND = env("RATELIMIT_BACKEND", default="local" if DEBUG else "sqlite")
+RATELIMIT_LOCATION = env(
+    "RATELIMIT_LOCATION",
+    default={
+        "sqlite": str(Path(tempfile.gettempdir()) / "loan_system_ratelimit.sqlite3"),
+        "redis": "redis://localhost:6379/2",
+    }.get(RATELIMIT_BACKEND, ""),
+)
+# Unidades que cada proceso reserva de una vez: límite // divisor (mínimo 1).
+RATELIMIT_LEASE_DIVISOR = env("RATELIMIT_LEASE_DIVISOR")
+# Si el almacén no responde (archivo bloqueado o sin permisos, Redis caído): dejar pasar
+# los requests sin límite y loguear el error (True), o rechazarlos con 429 (False).
+RATELIMIT_FAIL_OPEN = env("RATELIMIT_FAIL_OPEN")
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "infrastructure.security.jwt_auth.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -142,6 +230,18 @@ SIMPLE_JWT = {
     "TOKEN_TYPE_CLAIM": "token_type",
 }
 
+# Rol y activo de cada usuario cacheados para autenticar por claims del token sin
+# leer `accounts.User` (ver `infrastructure/security/jwt_auth.py`).
+JWT_USER_CACHE_TTL = env("JWT_USER_CACHE_TTL")
+JWT_USER_CACHE_ALIAS = env("JWT_USER_CACHE_ALIAS", default="default")
+
+# Métricas por request (`infrastructure/security/request_metrics.py`): histogramas por
+# proceso volcados en METRICS_DIR y sumados en /api/metrics/ (Prometheus, solo ADMIN).
+REQUEST_METRICS = env("REQUEST_METRICS")
+METRICS_DIR = env("METRICS_DIR", default=str(Path(tempfile.gettempdir()) / "loan_system_metrics"))
+METRICS_FLUSH_SECONDS = env("METRICS_FLUSH_SECONDS")
+REQUEST_SLOW_MS = env("REQUEST_SLOW_MS")
+
 CORS_ALLOWED_ORIGINS = env("DJANGO_CORS_ALLOWED_ORIGINS")
 CORS_ALLOW_CREDENTIALS = True
 
@@ -201,3 +301,16 @@ LOGGING = {
 CELERY_BROKER_URL = env("CELERY_BROKER_URL", default="redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = env("CELERY_RESULT_BACKEND", default="redis://localhost:6379/1")
 CELERY_TASK_ALWAYS_EAGER = False
+# `celery -A infrastructure.config beat`: tareas periódicas (horas en TIME_ZONE).
+CELERY_BEAT_SCHEDULE = {
+    "mark-overdue-installments": {
+        "task": "events.tasks.mark_overdue_installments_task",
+        "schedule": crontab(hour=1, minute=0),
+    },
+}
+if AUDIT_PARTITIONS:
+    # Día 1 a las 02:00: particiones del mes actual y los 2 siguientes, y archivo de los meses fríos.
+    CELERY_BEAT_SCHEDULE["audit-maintenance"] = {
+        "task": "events.tasks.audit_maintenance_task",
+        "schedule": crontab(day_of_month=1, hour=2, minute=0),
+    }
@@ -5,3 +5,6 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "infrastructure.django_apps.accounts"
     label = "accounts"
+
+    def ready(self):
+        from . import signals  # noqa: F401
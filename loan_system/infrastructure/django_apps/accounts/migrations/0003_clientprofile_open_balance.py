@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_clientprofile_phone_address'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientprofile',
+            name='open_balance',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='clientprofile',
+            name='open_installments',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -27,6 +27,9 @@ class ClientProfile(models.Model):
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.ACTIVE)
     is_delinquent = models.BooleanField(default=False)
     payment_capacity_monthly = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Suma de `Loan.open_installments` / `Loan.open_balance` del cliente (ver `loans.balances`).
+    open_installments = models.PositiveIntegerField(default=0)
+    open_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
 
     class Meta:
         indexes = [models.Index(fields=["status", "is_delinquent"])]
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from application.caching import CLIENTS
+from infrastructure.repositories.django_repositories import invalidate_cached
+from infrastructure.security.jwt_auth import AUTH_FIELDS, forget_users
+
+from .models import ClientProfile, User
+
+
+# Campos de `User` que forman parte de la entidad `Client` (nombre y email).
+CLIENT_FIELDS = frozenset({"username", "first_name", "last_name", "email"})
+
+
+@receiver(post_save, sender=User)
+def invalidate_saved_user(sender, instance, created, update_fields=None, **kwargs):
+    # El login guarda solo `last_login`: no invalida la entrada que acaba de cargar.
+    if created or update_fields is None or AUTH_FIELDS.intersection(update_fields):
+        forget_users([instance.pk])
+    if created or (update_fields is not None and not CLIENT_FIELDS.intersection(update_fields)):
+        return
+    if getattr(settings, "REPOSITORY_CACHE_TTL", 0) > 0:
+        invalidate_cached(CLIENTS, ClientProfile.objects.filter(user_id=instance.pk).values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    forget_users([instance.pk])
+
+
+# Cambios hechos fuera del repositorio (admin, comandos, shell): la caché compartida
+# de clientes no puede seguir sirviendo la versión anterior hasta que venza el TTL.
+@receiver(post_save, sender=ClientProfile)
+@receiver(post_delete, sender=ClientProfile)
+def invalidate_cached_client(sender, instance, created=False, **kwargs):
+    if not created:
+        invalidate_cached(CLIENTS, [instance.pk])
@@ -0,0 +1 @@
+"""Analytics Django app (snapshot materializado del dashboard)."""
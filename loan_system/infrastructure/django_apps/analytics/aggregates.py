@@ -0,0 +1,64 @@
+"""Agregados condicionales en una sola pasada por modelo.
+
+Cada reporte declara sus métricas como expresiones (`count_if`, `sum_if`,
+`Sum`, `Avg`...) y `totals` las resuelve con un único SELECT. `grouped` hace lo
+mismo por dimensiones y `rollup` pliega esas filas en Python, de modo que un
+mismo GROUP BY alimenta totales, distribuciones y series.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from decimal import Decimal
+from typing import Any
+
+from django.db.models import Aggregate, Avg, Count, Q, QuerySet, Sum
+
+
+ZERO = Decimal("0")
+
+
+def count_if(*args: Q, **lookups: Any) -> Count:
+    """COUNT(*) restringido a las filas que cumplen el filtro."""
+    return Count("pk", filter=Q(*args, **lookups))
+
+
+def sum_if(field: str, *args: Q, **lookups: Any) -> Sum:
+    """SUM(field) restringido a las filas que cumplen el filtro."""
+    return Sum(field, filter=Q(*args, **lookups))
+
+
+def totals(queryset: QuerySet, **metrics: Aggregate) -> dict[str, Any]:
+    """Resuelve todas las métricas en un único SELECT sobre `queryset`.
+
+    Los agregados que no encuentran filas (SUM/AVG -> NULL) se devuelven como 0.
+    """
+    row = queryset.order_by().aggregate(**metrics)
+    return {
+        name: ZERO if value is None and isinstance(metrics[name], (Sum, Avg)) else value
+        for name, value in row.items()
+    }
+
+
+def grouped(queryset: QuerySet, *dimensions: str, **metrics: Aggregate) -> list[dict[str, Any]]:
+    """Un único GROUP BY `dimensions` con las métricas indicadas por grupo."""
+    return list(queryset.order_by().values(*dimensions).annotate(**metrics))
+
+
+def rollup(
+    rows: Iterable[Mapping[str, Any]],
+    key: str | Callable[[Mapping[str, Any]], Any],
+    *fields: str,
+) -> dict[Any, dict[str, Any]]:
+    """Pliega filas agrupadas sumando `fields` por `key` (nombre de columna o función)."""
+    keyfunc = key if callable(key) else (lambda row: row[key])
+    folded: dict[Any, dict[str, Any]] = {}
+    for row in rows:
+        bucket = folded.setdefault(keyfunc(row), dict.fromkeys(fields, 0))
+        for field in fields:
+            bucket[field] += row[field] or 0
+    return folded
+
+
+def fold(rows: Iterable[Mapping[str, Any]], *fields: str) -> dict[str, Any]:
+    """Total general de `fields` sobre filas agrupadas."""
+    return rollup(rows, lambda row: None, *fields).get(None, dict.fromkeys(fields, 0))
@@ -0,0 +1,48 @@
+"""
+Verifica que el snapshot materializado del dashboard coincide con las tablas fuente.
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.django_apps.analytics.snapshot import (
+    compute_counters,
+    diff_counters,
+    is_built,
+    rebuild_snapshot,
+    stored_counters,
+)
+
+
+class Command(BaseCommand):
+    help = "Compara los contadores materializados con un recálculo completo y reporta diferencias"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Reconstruye el snapshot si se detectan diferencias",
+        )
+
+    def handle(self, *args, **options):
+        if not is_built():
+            raise CommandError("El snapshot no existe; ejecute rebuild_dashboard_snapshot")
+
+        drift = diff_counters(compute_counters(), stored_counters())
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Snapshot consistente"))
+            return
+
+        for (metric, bucket), expected, actual in drift:
+            label = f"{metric}[{bucket}]" if bucket else metric
+            self.stdout.write(
+                f"  {label}: esperado count={expected[0]} amount={expected[1]} | "
+                f"materializado count={actual[0]} amount={actual[1]}"
+            )
+
+        if options["fix"]:
+            rebuild_snapshot()
+            self.stdout.write(self.style.WARNING(f"{len(drift)} diferencias corregidas (snapshot reconstruido)"))
+            return
+
+        raise CommandError(f"Snapshot inconsistente: {len(drift)} diferencias")
@@ -0,0 +1,20 @@
+"""
+Reconstruye el snapshot materializado del dashboard desde las tablas fuente.
+"""
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from infrastructure.django_apps.analytics.snapshot import rebuild_snapshot
+
+
+class Command(BaseCommand):
+    help = "Recalcula todos los contadores del dashboard (recorrido completo de Loan/Installment/Payment)"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = rebuild_snapshot()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Snapshot reconstruido: {rows} contadores en {elapsed:.2f}s"))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50)),
+                ('bucket', models.CharField(blank=True, default='', max_length=64)),
+                ('count', models.BigIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['metric', 'amount'], name='analytics_d_metric_86fea4_idx')],
+                'constraints': [models.UniqueConstraint(fields=('metric', 'bucket'), name='uniq_dashboard_counter')],
+            },
+        ),
+    ]
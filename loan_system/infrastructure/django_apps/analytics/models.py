@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.db import models
+
+
+class DashboardCounter(models.Model):
+    """Contador materializado del dashboard (una fila por métrica y bucket).
+
+    `bucket` distingue dimensiones (estado, moneda, mes, cliente); las métricas
+    escalares usan el bucket vacío.
+    """
+
+    metric = models.CharField(max_length=50)
+    bucket = models.CharField(max_length=64, blank=True, default="")
+    count = models.BigIntegerField(default=0)
+    amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["metric", "bucket"], name="uniq_dashboard_counter")]
+        indexes = [models.Index(fields=["metric", "amount"])]
@@ -0,0 +1,514 @@
+"""Snapshot materializado del dashboard de analítica.
+
+Los contadores viven en `DashboardCounter` (una fila por métrica/bucket). Los
+casos de uso los actualizan de forma incremental a través de
+`DjangoDashboardProjection`, y `AnalyticsDashboardView` los lee sin recorrer
+las tablas de préstamos, cuotas y pagos.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, Mapping, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from infrastructure.django_apps.accounts.models import ClientProfile
+from infrastructure.django_apps.loans.models import Installment, Loan, Payment
+
+from .aggregates import count_if, fold, grouped, rollup, totals
+from .models import DashboardCounter
+
+
+CLIENTS = "clients"
+CLIENTS_ACTIVE = "clients.active"
+CLIENTS_DELINQUENT = "clients.delinquent"
+CLIENTS_MULTIPLE_LOANS = "clients.multiple_loans"
+LOANS = "loans"
+LOANS_BY_STATUS = "loans.status"
+LOANS_BY_CURRENCY = "loans.currency"
+LOANS_BY_MONTH = "loans.month"
+LOANS_APPROVED_BY_MONTH = "loans.month.approved"
+LOANS_REJECTED_BY_MONTH = "loans.month.rejected"
+PAYMENTS = "payments"
+PAYMENTS_BY_MONTH = "payments.month"
+INSTALLMENTS_BY_STATUS = "installments.status"
+CLIENT_LOANS = "client.loans"
+SNAPSHOT_BUILT = "snapshot.built"
+
+ZERO = Decimal("0")
+
+# (metric, bucket) -> (count, amount)
+Counters = dict[tuple[str, str], tuple[int, Decimal]]
+
+
+def month_bucket(value: datetime) -> str:
+    return timezone.localtime(value).date().replace(day=1).isoformat()
+
+
+def series_start(now: datetime) -> datetime:
+    """Inicio de la ventana de series (últimos 7 meses incluyendo el actual)."""
+    return (now - timedelta(days=31 * 6)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+# ---------------------------------------------------------------------------
+# Escritura incremental
+# ---------------------------------------------------------------------------
+
+
+def bump(metric: str, bucket: str = "", count: int = 0, amount: Decimal = ZERO) -> None:
+    """Suma `count`/`amount` al contador, creándolo si no existe."""
+    updated = DashboardCounter.objects.filter(metric=metric, bucket=bucket).update(
+        count=F("count") + count,
+        amount=F("amount") + amount,
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            DashboardCounter.objects.create(metric=metric, bucket=bucket, count=count, amount=amount)
+    except IntegrityError:
+        # Otro proceso creó la fila entre el UPDATE y el INSERT.
+        DashboardCounter.objects.filter(metric=metric, bucket=bucket).update(
+            count=F("count") + count,
+            amount=F("amount") + amount,
+        )
+
+
+def bump_many(deltas: Mapping[tuple[str, str], tuple[int, Decimal]]) -> None:
+    for (metric, bucket), (count, amount) in deltas.items():
+        if count or amount:
+            bump(metric, bucket, count, amount)
+
+
+def record_client_created(status: str, is_delinquent: bool) -> None:
+    bump(CLIENTS, count=1)
+    if status == ClientProfile.Status.ACTIVE:
+        bump(CLIENTS_ACTIVE, count=1)
+    if is_delinquent:
+        bump(CLIENTS_DELINQUENT, count=1)
+
+
+def record_loan_created(
+    client_id: str,
+    principal: Decimal,
+    currency: str,
+    status: str,
+    created_at: datetime,
+) -> None:
+    month = month_bucket(created_at)
+    bump(LOANS, count=1, amount=principal)
+    bump(LOANS_BY_STATUS, status, count=1)
+    bump(LOANS_BY_CURRENCY, currency, count=1)
+    bump(LOANS_BY_MONTH, month, count=1)
+    # El UPDATE del contador del cliente retiene el lock de la fila hasta el commit:
+    # la lectura que sigue ve exactamente el valor que dejó este incremento, así que
+    # un solo préstamo concurrente observa la transición 1 -> 2.
+    with transaction.atomic():
+        bump(CLIENT_LOANS, str(client_id), count=1, amount=principal)
+        loan_count = (
+            DashboardCounter.objects.filter(metric=CLIENT_LOANS, bucket=str(client_id))
+            .values_list("count", flat=True)
+            .first()
+        )
+        if loan_count == 2:
+            bump(CLIENTS_MULTIPLE_LOANS, count=1)
+
+
+def record_loan_decided(previous_status: str, status: str, created_at: datetime) -> None:
+    month = month_bucket(created_at)
+    bump(LOANS_BY_STATUS, previous_status, count=-1)
+    bump(LOANS_BY_STATUS, status, count=1)
+    if status == Loan.Status.APPROVED:
+        bump(LOANS_APPROVED_BY_MONTH, month, count=1)
+    elif status == Loan.Status.REJECTED:
+        bump(LOANS_REJECTED_BY_MONTH, month, count=1)
+
+
+def record_payment(amount: Decimal, paid_at: datetime, previous_installment_status: Optional[str]) -> None:
+    bump(PAYMENTS, count=1, amount=amount)
+    bump(PAYMENTS_BY_MONTH, month_bucket(paid_at), count=1, amount=amount)
+    if previous_installment_status:
+        bump(INSTALLMENTS_BY_STATUS, previous_installment_status, count=-1)
+        bump(INSTALLMENTS_BY_STATUS, Installment.Status.PAID, count=1)
+
+
+def record_payments(rows: Iterable[tuple[Decimal, datetime, Optional[str]]]) -> None:
+    """Como `record_payment` para un lote `(monto, pagado_en, estado_previo)`: un UPDATE por contador."""
+    deltas: dict[tuple[str, str], list] = {}
+
+    def add(metric: str, bucket: str, count: int, amount: Decimal = ZERO) -> None:
+        delta = deltas.setdefault((metric, bucket), [0, ZERO])
+        delta[0] += count
+        delta[1] += amount
+
+    for amount, paid_at, previous_installment_status in rows:
+        add(PAYMENTS, "", 1, amount)
+        add(PAYMENTS_BY_MONTH, month_bucket(paid_at), 1, amount)
+        if previous_installment_status:
+            add(INSTALLMENTS_BY_STATUS, previous_installment_status, -1)
+            add(INSTALLMENTS_BY_STATUS, Installment.Status.PAID, 1)
+    bump_many(deltas)
+
+
+# ---------------------------------------------------------------------------
+# Reconstrucción y verificación
+# ---------------------------------------------------------------------------
+
+
+def compute_counters() -> Counters:
+    """Calcula todos los contadores desde las tablas fuente (recorrido completo)."""
+    counters: Counters = {}
+
+    def put(metric: str, bucket: str, count: int, amount: Decimal = ZERO) -> None:
+        if count or amount:
+            counters[(metric, bucket)] = (count, amount or ZERO)
+
+    clients = totals(
+        ClientProfile.objects.all(),
+        count=Count("pk"),
+        active=count_if(status=ClientProfile.Status.ACTIVE),
+        delinquent=count_if(is_delinquent=True),
+    )
+    put(CLIENTS, "", clients["count"])
+    put(CLIENTS_ACTIVE, "", clients["active"])
+    put(CLIENTS_DELINQUENT, "", clients["delinquent"])
+
+    loans = Loan.objects.aggregate(count=Count("id"), amount=Sum("principal_amount"))
+    put(LOANS, "", loans["count"], loans["amount"])
+
+    for row in Loan.objects.values("status").annotate(count=Count("id")).order_by():
+        put(LOANS_BY_STATUS, row["status"], row["count"])
+    for row in Loan.objects.values("currency").annotate(count=Count("id")).order_by():
+        put(LOANS_BY_CURRENCY, row["currency"], row["count"])
+
+    monthly = (
+        Loan.objects.annotate(month=TruncMonth("created_at"))
+        .values("month")
+        .annotate(
+            count=Count("id"),
+            approved=Count("id", filter=Q(status=Loan.Status.APPROVED)),
+            rejected=Count("id", filter=Q(status=Loan.Status.REJECTED)),
+        )
+        .order_by()
+    )
+    for row in monthly:
+        month = row["month"].date().isoformat()
+        put(LOANS_BY_MONTH, month, row["count"])
+        put(LOANS_APPROVED_BY_MONTH, month, row["approved"])
+        put(LOANS_REJECTED_BY_MONTH, month, row["rejected"])
+
+    multiple = 0
+    per_client = Loan.objects.values("client_profile_id").annotate(
+        count=Count("id"), amount=Sum("principal_amount")
+    ).order_by()
+    for row in per_client:
+        put(CLIENT_LOANS, str(row["client_profile_id"]), row["count"], row["amount"])
+        if row["count"] > 1:
+            multiple += 1
+    put(CLIENTS_MULTIPLE_LOANS, "", multiple)
+
+    payments = Payment.objects.aggregate(count=Count("id"), amount=Sum("amount"))
+    put(PAYMENTS, "", payments["count"], payments["amount"])
+    payment_monthly = (
+        Payment.objects.annotate(month=TruncMonth("paid_at"))
+        .values("month")
+        .annotate(count=Count("id"), amount=Sum("amount"))
+        .order_by()
+    )
+    for row in payment_monthly:
+        put(PAYMENTS_BY_MONTH, row["month"].date().isoformat(), row["count"], row["amount"])
+
+    for row in Installment.objects.values("status").annotate(count=Count("id")).order_by():
+        put(INSTALLMENTS_BY_STATUS, row["status"], row["count"])
+
+    return counters
+
+
+def stored_counters() -> Counters:
+    rows = DashboardCounter.objects.exclude(metric=SNAPSHOT_BUILT).values_list("metric", "bucket", "count", "amount")
+    return {
+        (metric, bucket): (count, amount)
+        for metric, bucket, count, amount in rows
+        if count or amount
+    }
+
+
+def diff_counters(expected: Counters, actual: Counters) -> list[tuple[tuple[str, str], tuple, tuple]]:
+    """Devuelve las claves cuyo valor materializado difiere del recalculado."""
+    empty = (0, ZERO)
+    drift = []
+    for key in sorted(set(expected) | set(actual)):
+        want = expected.get(key, empty)
+        have = actual.get(key, empty)
+        if want[0] != have[0] or Decimal(want[1]) != Decimal(have[1]):
+            drift.append((key, want, have))
+    return drift
+
+
+@transaction.atomic
+def rebuild_snapshot() -> int:
+    """Recalcula el snapshot completo y reemplaza los contadores existentes."""
+    counters = compute_counters()
+    DashboardCounter.objects.all().delete()
+    DashboardCounter.objects.bulk_create(
+        [
+            DashboardCounter(metric=metric, bucket=bucket, count=count, amount=amount)
+            for (metric, bucket), (count, amount) in counters.items()
+        ],
+        batch_size=1000,
+    )
+    DashboardCounter.objects.create(metric=SNAPSHOT_BUILT, bucket="", count=1)
+    return len(counters)
+
+
+def is_built() -> bool:
+    return DashboardCounter.objects.filter(metric=SNAPSHOT_BUILT).exists()
+
+
+# ---------------------------------------------------------------------------
+# Lectura del dashboard
+# ---------------------------------------------------------------------------
+
+
+def _loan_count_per_client():
+    return (
+        Loan.objects.filter(client_profile=OuterRef("pk"))
+        .order_by()
+        .values("client_profile")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+
+
+def dashboard_from_snapshot(now: Optional[datetime] = None) -> Optional[dict]:
+    """Arma la respuesta del dashboard desde los contadores (None si no hay snapshot)."""
+    now = now or timezone.now()
+    scalars: dict[str, tuple[int, Decimal]] = {}
+    buckets: dict[str, dict[str, tuple[int, Decimal]]] = {}
+    for metric, bucket, count, amount in DashboardCounter.objects.exclude(metric=CLIENT_LOANS).values_list(
+        "metric", "bucket", "count", "amount"
+    ):
+        if bucket:
+            buckets.setdefault(metric, {})[bucket] = (count, amount)
+        else:
+            scalars[metric] = (count, amount)
+
+    if SNAPSHOT_BUILT not in scalars:
+        return None
+
+    def scalar(metric: str) -> tuple[int, Decimal]:
+        return scalars.get(metric, (0, ZERO))
+
+    def dimension(metric: str) -> dict[str, tuple[int, Decimal]]:
+        return {key: value for key, value in sorted(buckets.get(metric, {}).items()) if value[0] > 0}
+
+    total_clients = scalar(CLIENTS)[0]
+    delinquent_clients = scalar(CLIENTS_DELINQUENT)[0]
+    total_loans, principal_sum = scalar(LOANS)
+    total_payments, paid_amount = scalar(PAYMENTS)
+    installments = dimension(INSTALLMENTS_BY_STATUS)
+    avg_loan = (principal_sum / total_loans).quantize(Decimal("0.01")) if total_loans else 0
+
+    start = series_start(now).date().isoformat()
+    approved = buckets.get(LOANS_APPROVED_BY_MONTH, {})
+    rejected = buckets.get(LOANS_REJECTED_BY_MONTH, {})
+    monthly_series = [
+        {
+            "month": month,
+            "solicitudes": count,
+            "aprobados": approved.get(month, (0, ZERO))[0],
+            "rechazados": rejected.get(month, (0, ZERO))[0],
+        }
+        for month, (count, _) in dimension(LOANS_BY_MONTH).items()
+        if month >= start
+    ]
+    payment_series = [
+        {"month": month, "total": count, "amount": str(amount)}
+        for month, (count, amount) in dimension(PAYMENTS_BY_MONTH).items()
+        if month >= start
+    ]
+
+    top_rows = list(
+        DashboardCounter.objects.filter(metric=CLIENT_LOANS, count__gt=0).order_by("-amount")[:5]
+    )
+    usernames = dict(
+        ClientProfile.objects.filter(id__in=[row.bucket for row in top_rows]).values_list("id", "user__username")
+    )
+    top_clients = [
+        {
+            "client_id": row.bucket,
+            "username": usernames.get(UUID(row.bucket), ""),
+            "total_amount": str(row.amount),
+            "loan_count": row.count,
+        }
+        for row in top_rows
+    ]
+
+    return {
+        "totals": {
+            "clients": total_clients,
+            "active_clients": scalar(CLIENTS_ACTIVE)[0],
+            "loans": total_loans,
+            "principal_sum": str(principal_sum),
+            "delinquent_clients": delinquent_clients,
+            "delinquent_rate": (delinquent_clients / total_clients) if total_clients else 0.0,
+            "total_payments": total_payments,
+            "total_paid_amount": str(paid_amount),
+            "total_installments": sum(count for count, _ in installments.values()),
+            "pending_installments": installments.get(Installment.Status.PENDING, (0, ZERO))[0],
+            "paid_installments": installments.get(Installment.Status.PAID, (0, ZERO))[0],
+            "late_installments": installments.get(Installment.Status.LATE, (0, ZERO))[0],
+            # Las vencidas son las que el barrido nocturno pasó a `late` (`loans.overdue`).
+            "overdue_installments": installments.get(Installment.Status.LATE, (0, ZERO))[0],
+            "avg_loan_amount": str(avg_loan),
+            "clients_with_multiple_loans": scalar(CLIENTS_MULTIPLE_LOANS)[0],
+        },
+        "distributions": {
+            "loans_by_status": {key: count for key, (count, _) in dimension(LOANS_BY_STATUS).items()},
+            "loans_by_currency": {key: count for key, (count, _) in dimension(LOANS_BY_CURRENCY).items()},
+        },
+        "series": {
+            "loans_by_month": monthly_series,
+            "payments_by_month": payment_series,
+        },
+        "top_clients": top_clients,
+    }
+
+
+def dashboard_live(now: Optional[datetime] = None) -> dict:
+    """Calcula el dashboard directamente sobre las tablas fuente.
+
+    Una consulta por modelo (agregados condicionales) más el top de clientes:
+    los préstamos se agrupan una sola vez por mes/estado/moneda y de esas filas
+    salen totales, distribuciones y la serie mensual.
+    """
+    now = now or timezone.now()
+    start = series_start(now).date().isoformat()
+
+    clients = totals(
+        ClientProfile.objects.annotate(loan_count=Subquery(_loan_count_per_client())),
+        clients=Count("pk"),
+        active=count_if(status=ClientProfile.Status.ACTIVE),
+        delinquent=count_if(is_delinquent=True),
+        multiple_loans=count_if(loan_count__gt=1),
+    )
+
+    installments = totals(
+        Installment.objects.all(),
+        total=Count("pk"),
+        pending=count_if(status=Installment.Status.PENDING),
+        paid=count_if(status=Installment.Status.PAID),
+        late=count_if(status=Installment.Status.LATE),
+    )
+
+    loan_rows = grouped(
+        Loan.objects.annotate(month=TruncMonth("created_at")),
+        "month",
+        "status",
+        "currency",
+        count=Count("pk"),
+        amount=Sum("principal_amount"),
+    )
+    for row in loan_rows:
+        row["month"] = row["month"].date().isoformat()
+    loans = fold(loan_rows, "count", "amount")
+    loans_by_status = rollup(loan_rows, "status", "count")
+    loans_by_currency = rollup(loan_rows, "currency", "count")
+    loans_by_month = rollup((row for row in loan_rows if row["month"] >= start), "month", "count")
+    decided_by_month = rollup(
+        (row for row in loan_rows if row["month"] >= start),
+        lambda row: (row["month"], row["status"]),
+        "count",
+    )
+
+    payment_rows = grouped(
+        Payment.objects.annotate(month=TruncMonth("paid_at")),
+        "month",
+        count=Count("pk"),
+        amount=Sum("amount"),
+    )
+    for row in payment_rows:
+        row["month"] = row["month"].date().isoformat()
+    payments = fold(payment_rows, "count", "amount")
+
+    top_clients = (
+        ClientProfile.objects.annotate(
+            total_borrowed=Sum("loans__principal_amount"),
+            loan_count=Count("loans"),
+        )
+        .filter(total_borrowed__isnull=False)
+        .order_by("-total_borrowed")
+        .values("id", "user__username", "total_borrowed", "loan_count")[:5]
+    )
+
+    total_clients = clients["clients"]
+    total_loans = loans["count"]
+    avg_loan = (Decimal(loans["amount"]) / total_loans).quantize(Decimal("0.01")) if total_loans else 0
+
+    def month_count(month: str, status: str) -> int:
+        return decided_by_month.get((month, status), {"count": 0})["count"]
+
+    return {
+        "totals": {
+            "clients": total_clients,
+            "active_clients": clients["active"],
+            "loans": total_loans,
+            "principal_sum": str(loans["amount"]),
+            "delinquent_clients": clients["delinquent"],
+            "delinquent_rate": (clients["delinquent"] / total_clients) if total_clients else 0.0,
+            "total_payments": payments["count"],
+            "total_paid_amount": str(payments["amount"]),
+            "total_installments": installments["total"],
+            "pending_installments": installments["pending"],
+            "paid_installments": installments["paid"],
+            "late_installments": installments["late"],
+            # Misma definición que el snapshot: las cuotas que el barrido pasó a `late`.
+            "overdue_installments": installments["late"],
+            "avg_loan_amount": str(avg_loan),
+            "clients_with_multiple_loans": clients["multiple_loans"],
+        },
+        "distributions": {
+            "loans_by_status": {key: value["count"] for key, value in sorted(loans_by_status.items())},
+            "loans_by_currency": {key: value["count"] for key, value in sorted(loans_by_currency.items())},
+        },
+        "series": {
+            "loans_by_month": [
+                {
+                    "month": month,
+                    "solicitudes": value["count"],
+                    "aprobados": month_count(month, Loan.Status.APPROVED),
+                    "rechazados": month_count(month, Loan.Status.REJECTED),
+                }
+                for month, value in sorted(loans_by_month.items())
+            ],
+            "payments_by_month": [
+                {"month": row["month"], "total": row["count"], "amount": str(row["amount"] or 0)}
+                for row in sorted(payment_rows, key=lambda row: row["month"])
+                if row["month"] >= start
+            ],
+        },
+        "top_clients": [
+            {
+                "client_id": str(row["id"]),
+                "username": row["user__username"],
+                "total_amount": str(row["total_borrowed"]),
+                "loan_count": row["loan_count"],
+            }
+            for row in top_clients
+        ],
+    }
+
+
+def dashboard_payload(now: Optional[datetime] = None) -> dict:
+    """Sirve el snapshot si está habilitado y construido; si no, calcula en vivo."""
+    if getattr(settings, "ANALYTICS_DASHBOARD_SNAPSHOT", True):
+        payload = dashboard_from_snapshot(now)
+        if payload is not None:
+            return payload
+    return dashboard_live(now)
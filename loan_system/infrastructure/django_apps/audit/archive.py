@@ -0,0 +1,78 @@
+"""Retención caliente/fría de la auditoría.
+
+Los últimos `AUDIT_HOT_MONTHS` meses (incluido el actual) quedan en la base de
+datos. Los anteriores se exportan a NDJSON comprimido en
+`AUDIT_ARCHIVE_DIR/archive-AAAAMM/` (mismo formato y manifiesto que
+`export_audit_log`) y luego se eliminan: `DROP TABLE` de la partición del mes y
+DELETE de las filas del mes que hubieran quedado en la tabla base.
+"""
+from __future__ import annotations
+
+import shutil
+from datetime import date, timezone as dt_timezone
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+
+from domain.amortization import add_months
+
+from . import partitions
+from .export import ExportOptions, export_audit_log
+from .models import AuditLog
+
+
+ARCHIVE_PART_ROWS = 1_000_000
+
+
+def archive_root() -> Path:
+    return Path(settings.AUDIT_ARCHIVE_DIR)
+
+
+def cold_months(today: date, hot_months: int) -> list[date]:
+    """Meses fuera de la ventana caliente que todavía tienen datos en la base."""
+    cutoff = add_months(date(today.year, today.month, 1), -(hot_months - 1))
+    months = {month for month in partitions.existing_partitions(refresh=True) if month < cutoff}
+    months.update(
+        partitions.month_of(value)
+        for value in AuditLog.objects.filter(occurred_at__lt=partitions.month_bounds(cutoff)[0]).datetimes(
+            "occurred_at", "month", tzinfo=dt_timezone.utc
+        )
+    )
+    return sorted(months)
+
+
+def archive_month(month: date, root: Optional[Path] = None) -> dict:
+    """Exporta el mes a `archive-AAAAMM/` y lo elimina de la base de datos.
+
+    Solo se borra si el manifiesto cubre todas las filas del mes; si llegaron
+    eventos tardíos después de una exportación previa, se exporta de nuevo. La
+    exportación y el conteo leen de la primaria: con la réplica atrasada no
+    coincidirían.
+    Re-ejecutar tras una caída reanuda la exportación o completa el borrado.
+    """
+    since, until = partitions.month_bounds(month)
+    root = root or archive_root()
+    export_id = f"archive-{month:%Y%m}"
+    options = ExportOptions(since=since, until=until, part_rows=ARCHIVE_PART_ROWS)
+
+    manifest = export_audit_log(options, export_id=export_id, root=root, replica=False)
+    rows = _count(since, until)
+    if manifest["rows"] != rows:
+        shutil.rmtree(root / export_id)
+        manifest = export_audit_log(options, export_id=export_id, root=root, replica=False)
+        rows = _count(since, until)
+    if manifest["rows"] != rows:
+        raise DatabaseError(f"{export_id}: el archivo tiene {manifest['rows']} filas y la base {rows}")
+
+    if month in partitions.existing_partitions(refresh=True):
+        with connection.schema_editor() as editor:
+            editor.delete_model(partitions.partition_model(month))
+        partitions.existing_partitions(refresh=True)
+    AuditLog.objects.filter(occurred_at__gte=since, occurred_at__lt=until).delete()
+    return manifest
+
+
+def _count(since, until) -> int:
+    return sum(qs.count() for qs in partitions.querysets(since, until))
@@ -0,0 +1,292 @@
+"""Exportación de `AuditLog` en partes comprimidas, reanudable y en memoria constante.
+
+El recorrido avanza por keyset `(occurred_at, id)` en bloques de `chunk_size`
+filas (con particiones, un keyset por tabla y mezcla ordenada en memoria) y
+escribe partes `part-NNNNN.{ndjson,csv}.gz` de hasta `part_rows` filas.
+Cada parte se escribe en un `.tmp` y se renombra al cerrarse; recién entonces se
+actualiza `checkpoint.json` con la última clave exportada. Si el proceso cae,
+la siguiente ejecución con el mismo `export_id` descarta la parte incompleta y
+continúa desde el checkpoint. Al terminar se escribe `manifest.json`.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+from uuid import UUID
+
+from django.conf import settings
+from django.db.models import Q, TextField
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from infrastructure.config.db_router import replica_reads
+
+from . import partitions
+
+
+FORMATS = ("ndjson", "csv")
+COLUMNS = ("id", "actor_id", "action", "occurred_at", "before", "after", "meta")
+JSON_COLUMNS = ("before", "after", "meta")
+_SELECT = ("id", "actor_id", "action", "occurred_at", *(f"{name}_json" for name in JSON_COLUMNS))
+COMPRESS_LEVEL = 6
+CHECKPOINT = "checkpoint.json"
+MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class ExportOptions:
+    since: datetime
+    until: Optional[datetime] = None
+    fmt: str = "ndjson"
+    actions: Sequence[str] = ()
+    chunk_size: int = 5000
+    part_rows: int = 500_000
+
+
+def export_root() -> Path:
+    return Path(settings.AUDIT_EXPORT_DIR)
+
+
+class ExportMismatch(ValueError):
+    """El `export_id` ya pertenece a una exportación con otro rango, formato o acciones."""
+
+
+def default_export_id(options: ExportOptions) -> str:
+    export_id = f"audit-{options.since:%Y%m%dT%H%M%S}"
+    if options.until is not None:
+        export_id += f"-{options.until:%Y%m%dT%H%M%S}"
+    export_id += f"-{options.fmt}"
+    if options.actions:
+        export_id += "-" + hashlib.sha1(",".join(sorted(options.actions)).encode()).hexdigest()[:8]
+    return export_id
+
+
+def iter_chunks(options: ExportOptions, after: Optional[tuple[datetime, UUID]] = None) -> Iterator[list[tuple]]:
+    """Bloques de filas ordenadas por `(occurred_at, id)`, estrictamente posteriores a `after`.
+
+    Con particiones, cada tabla se recorre por separado con su propio keyset (el
+    índice `(occurred_at, id)` resuelve el ORDER BY/LIMIT) y los flujos ya
+    ordenados se mezclan en Python: ningún bloque ordena la unión de las tablas.
+    """
+    streams = []
+    for qs in partitions.querysets(options.since, options.until):
+        if options.actions:
+            qs = qs.filter(action__in=list(options.actions))
+        # Los JSONField se leen como texto y se copian tal cual: sin json.loads/dumps por fila.
+        qs = qs.annotate(**{f"{name}_json": Cast(name, TextField()) for name in JSON_COLUMNS})
+        streams.append(_keyset_rows(qs, after, options.chunk_size))
+    rows_iter = heapq.merge(*streams, key=_sort_key) if len(streams) > 1 else streams[0]
+    while True:
+        rows = list(islice(rows_iter, options.chunk_size))
+        if not rows:
+            return
+        yield rows
+
+
+def _keyset_rows(qs, after: Optional[tuple[datetime, UUID]], chunk_size: int) -> Iterator[tuple]:
+    """Filas de una tabla en orden `(occurred_at, id)`, leídas de a `chunk_size` por keyset."""
+    while True:
+        page = qs
+        if after is not None:
+            occurred_at, last_id = after
+            page = qs.filter(Q(occurred_at__gt=occurred_at) | Q(occurred_at=occurred_at, id__gt=last_id))
+        rows = list(page.order_by("occurred_at", "id").values_list(*_SELECT)[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        after = _sort_key(rows[-1])
+
+
+def _sort_key(row: tuple) -> tuple[datetime, UUID]:
+    return row[3], row[0]
+
+
+class _PartWriter:
+    def __init__(self, path: Path, fmt: str) -> None:
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        self.rows = 0
+        self.first_key: Optional[list[str]] = None
+        self.last_key: Optional[list[str]] = None
+        self._file = gzip.open(self.tmp, "wt", compresslevel=COMPRESS_LEVEL, encoding="utf-8", newline="")
+        self._csv = csv.writer(self._file) if fmt == "csv" else None
+        if self._csv is not None:
+            self._csv.writerow(COLUMNS)
+
+    def write(self, rows: list[tuple]) -> None:
+        if self._csv is not None:
+            self._csv.writerows(
+                (str(row_id), actor_id, action, occurred_at.isoformat(), before, after, meta)
+                for row_id, actor_id, action, occurred_at, before, after, meta in rows
+            )
+        else:
+            dumps = json.dumps
+            self._file.writelines(
+                f'{{"id":"{row_id}","actor_id":{dumps(actor_id)},"action":{dumps(action, ensure_ascii=False)},'
+                f'"occurred_at":"{occurred_at.isoformat()}","before":{before},"after":{after},"meta":{meta}}}\n'
+                for row_id, actor_id, action, occurred_at, before, after, meta in rows
+            )
+        self.rows += len(rows)
+        self.first_key = self.first_key or _key(rows[0])
+        self.last_key = _key(rows[-1])
+
+    def close(self) -> dict:
+        self._file.close()
+        os.replace(self.tmp, self.path)
+        return {
+            "file": self.path.name,
+            "rows": self.rows,
+            "bytes": self.path.stat().st_size,
+            "sha256": _sha256(self.path),
+            "first_key": self.first_key,
+            "last_key": self.last_key,
+        }
+
+
+def export_audit_log(
+    options: ExportOptions,
+    export_id: Optional[str] = None,
+    root: Optional[Path] = None,
+    replica: bool = True,
+) -> dict:
+    """Exporta (o reanuda) y devuelve el manifiesto.
+
+    Con `replica=False` lee de la primaria: el archivado compara el total exportado
+    con el de la base antes de borrar, y ambos tienen que salir de la misma base.
+    """
+    if options.fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {options.fmt}")
+    directory = (root or export_root()) / (export_id or default_export_id(options))
+    directory.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = directory / MANIFEST
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        _check_same_export(directory.name, manifest, options)
+        return manifest
+
+    state = _load_checkpoint(directory)
+    if state is not None:
+        _check_same_export(directory.name, state, options)
+    else:
+        until = options.until or timezone.now()
+        state = {
+            "since": options.since.isoformat(),
+            "until": until.isoformat(),
+            "format": options.fmt,
+            "actions": list(options.actions),
+            "parts": [],
+            "last_key": None,
+            "rows": 0,
+            "seconds": 0.0,
+        }
+        _save_checkpoint(directory, state)
+    # El rango y el formato quedan fijados por el checkpoint para que reanudar sea determinista.
+    options = ExportOptions(
+        since=parse_datetime(state["since"]),
+        until=parse_datetime(state["until"]),
+        fmt=state["format"],
+        actions=tuple(state["actions"]),
+        chunk_size=options.chunk_size,
+        part_rows=options.part_rows,
+    )
+    for stale in directory.glob("*.tmp"):
+        stale.unlink()
+
+    after = None
+    if state["last_key"]:
+        after = (parse_datetime(state["last_key"][0]), UUID(state["last_key"][1]))
+
+    started = time.perf_counter()
+    writer: Optional[_PartWriter] = None
+    # Se lee de la réplica: en un rango que termina "ahora" pueden faltar las filas
+    # de los últimos segundos (su demora); los rangos cerrados no cambian.
+    with replica_reads() if replica else nullcontext():
+        for rows in iter_chunks(options, after):
+            if writer is None:
+                number = len(state["parts"]) + 1
+                writer = _PartWriter(directory / f"part-{number:05d}.{options.fmt}.gz", options.fmt)
+            writer.write(rows)
+            if writer.rows >= options.part_rows:
+                _commit_part(directory, state, writer, started)
+                writer, started = None, time.perf_counter()
+    if writer is not None:
+        _commit_part(directory, state, writer, started)
+    else:
+        state["seconds"] += time.perf_counter() - started
+
+    manifest = {
+        "export_id": directory.name,
+        "since": state["since"],
+        "until": state["until"],
+        "format": state["format"],
+        "actions": state["actions"],
+        "columns": list(COLUMNS),
+        "rows": state["rows"],
+        "seconds": round(state["seconds"], 3),
+        "rows_per_second": round(state["rows"] / state["seconds"], 1) if state["seconds"] else None,
+        "parts": state["parts"],
+        "completed_at": timezone.now().isoformat(),
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    (directory / CHECKPOINT).unlink(missing_ok=True)
+    return manifest
+
+
+def _check_same_export(export_id: str, stored: dict, options: ExportOptions) -> None:
+    """Reanudar o repetir solo si el pedido coincide; sin `until` se acepta el ya fijado."""
+    differences = []
+    if parse_datetime(stored["since"]) != options.since:
+        differences.append(f"since={stored['since']}")
+    if options.until is not None and parse_datetime(stored["until"]) != options.until:
+        differences.append(f"until={stored['until']}")
+    if stored["format"] != options.fmt:
+        differences.append(f"format={stored['format']}")
+    if sorted(stored["actions"]) != sorted(options.actions):
+        differences.append(f"actions={','.join(stored['actions']) or '-'}")
+    if differences:
+        raise ExportMismatch(f"{export_id} ya existe con otros parámetros ({'; '.join(differences)})")
+
+
+def _key(row: tuple) -> list[str]:
+    return [row[3].isoformat(), str(row[0])]
+
+
+def _commit_part(directory: Path, state: dict, writer: _PartWriter, started: float) -> None:
+    part = writer.close()
+    state["parts"].append(part)
+    state["last_key"] = part["last_key"]
+    state["rows"] += part["rows"]
+    state["seconds"] += time.perf_counter() - started
+    _save_checkpoint(directory, state)
+
+
+def _load_checkpoint(directory: Path) -> Optional[dict]:
+    path = directory / CHECKPOINT
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def _save_checkpoint(directory: Path, state: dict) -> None:
+    tmp = directory / (CHECKPOINT + ".tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, directory / CHECKPOINT)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,39 @@
+"""
+Archiva los meses de auditoría fuera de la ventana caliente y los elimina de la base.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from infrastructure.django_apps.audit.archive import archive_month, cold_months
+
+
+class Command(BaseCommand):
+    help = "Exporta a .ndjson.gz los meses anteriores a AUDIT_HOT_MONTHS y los borra de la base"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hot-months",
+            type=int,
+            default=None,
+            help="Meses que se conservan, incluido el actual (default: AUDIT_HOT_MONTHS)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Solo lista los meses a archivar")
+
+    def handle(self, *args, **options):
+        hot_months = options["hot_months"] or settings.AUDIT_HOT_MONTHS
+        if hot_months < 1:
+            raise CommandError("--hot-months debe ser al menos 1")
+
+        months = cold_months(timezone.localdate(), hot_months)
+        if options["dry_run"]:
+            for month in months:
+                self.stdout.write(f"{month:%Y-%m}")
+            return
+
+        for month in months:
+            manifest = archive_month(month)
+            self.stdout.write(f"{month:%Y-%m}: {manifest['rows']} filas -> {manifest['export_id']}")
+        self.stdout.write(self.style.SUCCESS(f"Meses archivados: {len(months)}"))
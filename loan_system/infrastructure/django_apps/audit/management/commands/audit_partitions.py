@@ -0,0 +1,34 @@
+"""
+Crea por adelantado las particiones mensuales de la auditoría.
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from domain.amortization import add_months
+from infrastructure.django_apps.audit import partitions
+
+
+class Command(BaseCommand):
+    help = "Crea las tablas audit_auditlog_AAAAMM del mes actual y los siguientes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=2, help="Meses futuros a crear (default: 2)")
+
+    def handle(self, *args, **options):
+        if options["ahead"] < 0:
+            raise CommandError("--ahead no puede ser negativo")
+
+        current = partitions.month_of(timezone.now())
+        created = partitions.ensure_partitions(add_months(current, k) for k in range(options["ahead"] + 1))
+        for month in created:
+            self.stdout.write(f"Creada {partitions.partition_table(month)}")
+        existing = partitions.existing_partitions()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(existing)} particiones ({existing[0]:%Y-%m} .. {existing[-1]:%Y-%m})"
+                if existing
+                else "Sin particiones"
+            )
+        )
@@ -0,0 +1,54 @@
+"""
+Exporta la auditoría a partes NDJSON/CSV comprimidas (reanudable).
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from infrastructure.django_apps.audit.export import FORMATS, ExportMismatch, ExportOptions, export_audit_log
+
+
+def _datetime(value: str):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = "Exporta AuditLog por rango de fechas en partes .gz con manifiesto; re-ejecutar reanuda"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=_datetime, required=True, help="Inicio (ISO 8601, inclusive)")
+        parser.add_argument("--until", type=_datetime, default=None, help="Fin (ISO 8601, exclusivo; default: ahora)")
+        parser.add_argument("--format", choices=FORMATS, default="ndjson")
+        parser.add_argument("--action", action="append", default=[], help="Filtra por acción (repetible)")
+        parser.add_argument("--export-id", default=None, help="Directorio de la exportación (para reanudar)")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Filas por consulta (default: 5000)")
+        parser.add_argument("--part-rows", type=int, default=500_000, help="Filas por archivo (default: 500000)")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1 or options["part_rows"] < 1:
+            raise CommandError("--chunk-size y --part-rows deben ser positivos")
+
+        try:
+            manifest = export_audit_log(
+                ExportOptions(
+                    since=options["since"],
+                    until=options["until"],
+                    fmt=options["format"],
+                    actions=tuple(options["action"]),
+                    chunk_size=options["chunk_size"],
+                    part_rows=options["part_rows"],
+                ),
+                export_id=options["export_id"],
+            )
+        except ExportMismatch as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{manifest['export_id']}: {manifest['rows']} filas en {len(manifest['parts'])} partes "
+                f"({manifest['seconds']}s, {manifest['rows_per_second'] or 0} filas/s)"
+            )
+        )
@@ -15,4 +15,8 @@ class AuditLog(models.Model):
     meta = models.JSONField(default=dict)
 
     class Meta:
-        indexes = [models.Index(fields=["action", "occurred_at"])]
+        indexes = [
+            models.Index(fields=["action", "occurred_at"]),
+            # Recorridos por rango temporal (exportación por keyset `(occurred_at, id)`).
+            models.Index(fields=["occurred_at", "id"]),
+        ]
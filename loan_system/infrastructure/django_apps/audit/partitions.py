@@ -0,0 +1,166 @@
+"""Particionado mensual de `AuditLog` con retención caliente/fría.
+
+Cada mes vive en su propia tabla `audit_auditlog_AAAAMM` (mismo esquema que
+`audit_auditlog`, sin FK física hacia usuarios) creada por adelantado con
+`ensure_partitions`. La tabla base actúa como partición por defecto: recibe los
+eventos cuyo mes todavía no tiene tabla, de modo que escribir nunca ejecuta DDL
+dentro de una transacción de negocio. Las consultas por rango recorren la tabla
+base más las particiones que se solapan con el rango.
+
+Funciona igual en SQLite y MySQL; el particionado nativo de MySQL exigiría
+`occurred_at` en la clave primaria y no admite claves foráneas. El archivado de
+meses fríos está en `archive.py`.
+"""
+from __future__ import annotations
+
+import re
+import time
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Callable, Iterable, Optional, TypeVar
+
+from django.conf import settings
+from django.db import DatabaseError, connection, models
+from django.db.models import QuerySet
+
+from domain.amortization import add_months
+
+from .models import AuditLog
+
+
+T = TypeVar("T")
+
+TABLE_PREFIX = f"{AuditLog._meta.db_table}_"
+_TABLE_RE = re.compile(rf"^{re.escape(TABLE_PREFIX)}(\d{{4}})(\d{{2}})$")
+# Cada proceso revisa las tablas existentes como mucho cada 5 minutos.
+REFRESH_SECONDS = 300
+
+_models: dict[date, type[models.Model]] = {}
+_known: Optional[set[date]] = None
+_known_at = 0.0
+
+
+def enabled() -> bool:
+    return getattr(settings, "AUDIT_PARTITIONS", False)
+
+
+def month_of(value: datetime) -> date:
+    """Primer día del mes (UTC) al que pertenece `value`."""
+    value = value.astimezone(dt_timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    start = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    end = add_months(month, 1)
+    return start, datetime(end.year, end.month, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_table(month: date) -> str:
+    return f"{TABLE_PREFIX}{month:%Y%m}"
+
+
+def partition_model(month: date) -> type[models.Model]:
+    """Modelo (no gestionado por migraciones) de la tabla del mes."""
+    model = _models.get(month)
+    if model is not None:
+        return model
+
+    suffix = f"{month:%Y%m}"
+    attrs = {"__module__": __name__}
+    for field in AuditLog._meta.concrete_fields:
+        if field.name == "actor":
+            # Sin constraint ni relación inversa: borrar un usuario no recorre las particiones.
+            attrs["actor"] = models.ForeignKey(
+                settings.AUTH_USER_MODEL,
+                null=True,
+                blank=True,
+                on_delete=models.DO_NOTHING,
+                db_constraint=False,
+                related_name="+",
+            )
+        else:
+            attrs[field.name] = field.clone()
+    attrs["Meta"] = type(
+        "Meta",
+        (),
+        {
+            "app_label": AuditLog._meta.app_label,
+            "db_table": partition_table(month),
+            "managed": False,
+            "indexes": [
+                models.Index(fields=["action", "occurred_at"], name=f"auditp_{suffix}_action"),
+                models.Index(fields=["occurred_at", "id"], name=f"auditp_{suffix}_occurred"),
+            ],
+        },
+    )
+    model = _models[month] = type(f"AuditLog{suffix}", (models.Model,), attrs)
+    return model
+
+
+def existing_partitions(refresh: bool = False) -> list[date]:
+    """Meses con tabla propia, en orden."""
+    global _known, _known_at
+    if refresh or _known is None or time.monotonic() - _known_at > REFRESH_SECONDS:
+        found = set()
+        for table in connection.introspection.table_names():
+            match = _TABLE_RE.match(table)
+            if match:
+                found.add(date(int(match[1]), int(match[2]), 1))
+        _known, _known_at = found, time.monotonic()
+    return sorted(_known)
+
+
+def ensure_partitions(months: Iterable[date]) -> list[date]:
+    """Crea las tablas que falten y devuelve los meses creados.
+
+    Debe ejecutarse fuera de transacciones de negocio (en MySQL el DDL hace COMMIT
+    implícito): comando `audit_partitions` o `audit_maintenance_task`.
+    """
+    missing = sorted(set(months) - set(existing_partitions(refresh=True)))
+    created = []
+    for month in missing:
+        try:
+            with connection.schema_editor() as editor:
+                editor.create_model(partition_model(month))
+        except DatabaseError:
+            # Otro proceso pudo crearla entre la introspección y el CREATE.
+            if month not in existing_partitions(refresh=True):
+                raise
+        else:
+            created.append(month)
+    existing_partitions(refresh=True)
+    return created
+
+
+def model_for(occurred_at: datetime) -> type[models.Model]:
+    """Tabla destino de un evento: la partición de su mes o, si no existe, la base."""
+    if enabled():
+        month = month_of(occurred_at)
+        if month in existing_partitions():
+            return partition_model(month)
+    return AuditLog
+
+
+def route(items: Iterable[T], occurred_at: Callable[[T], datetime]) -> dict[type[models.Model], list[T]]:
+    """Agrupa `items` por tabla destino (un `bulk_create` por grupo)."""
+    groups: dict[type[models.Model], list[T]] = {}
+    for item in items:
+        groups.setdefault(model_for(occurred_at(item)), []).append(item)
+    return groups
+
+
+def querysets(since: datetime, until: datetime) -> list[QuerySet]:
+    """Un queryset por tabla que puede contener filas de `[since, until)`.
+
+    La tabla base siempre participa; de las particiones solo las de los meses del
+    rango (poda por fecha). Se leen aunque `AUDIT_PARTITIONS` esté desactivado,
+    para no ocultar filas escritas antes de desactivarlo.
+    """
+    first = month_of(since)
+    models_ = [AuditLog] + [
+        partition_model(month)
+        for month in existing_partitions()
+        if first <= month and month_bounds(month)[0] < until
+    ]
+    return [model.objects.filter(occurred_at__gte=since, occurred_at__lt=until) for model in models_]
+
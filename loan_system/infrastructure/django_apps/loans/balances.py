@@ -0,0 +1,123 @@
+"""Saldo abierto desnormalizado por préstamo y por cliente.
+
+`Loan.open_installments`/`open_balance` cuentan las cuotas pendientes o atrasadas
+del préstamo; `ClientProfile.open_installments`/`open_balance` son la suma sobre
+sus préstamos. Se mantienen con incrementos (`F(...) + delta`) en la misma
+transacción que crea o cancela cuotas, de modo que "¿tiene deuda activa?" es una
+lectura por clave primaria. `reconcile_open_balances` recalcula todo por SQL y
+reporta las diferencias.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable
+from uuid import UUID
+
+from django.db.models import Count, DecimalField, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from infrastructure.django_apps.accounts.models import ClientProfile
+
+from .models import Installment, Loan
+
+
+BATCH_SIZE = 500
+_ZERO = Value(Decimal("0.00"), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+@dataclass(frozen=True, slots=True)
+class OpenBalanceDelta:
+    loan_id: UUID
+    client_id: UUID
+    installments: int
+    amount: Decimal
+
+
+def apply_open_balance_deltas(deltas: Iterable[OpenBalanceDelta]) -> None:
+    """Suma los deltas a préstamos y clientes: un UPDATE por tabla (por lote)."""
+    per_loan: dict[UUID, list] = {}
+    per_client: dict[UUID, list] = {}
+    for delta in deltas:
+        for key, bucket in ((delta.loan_id, per_loan), (delta.client_id, per_client)):
+            totals = bucket.setdefault(key, [0, Decimal("0")])
+            totals[0] += delta.installments
+            totals[1] += delta.amount
+    _increment(Loan, per_loan)
+    _increment(ClientProfile, per_client)
+
+
+def settle_installment(loan_id: UUID, amount: Decimal) -> None:
+    """Una cuota abierta del préstamo dejó de estarlo (pago)."""
+    # Greatest: un contador desfasado no debe bloquear pagos; `reconcile_open_balances` lo corrige.
+    changes = {
+        "open_installments": Greatest(F("open_installments") - 1, Value(0)),
+        "open_balance": F("open_balance") - amount,
+    }
+    Loan.objects.filter(id=loan_id).update(**changes)
+    ClientProfile.objects.filter(loans__id=loan_id).update(**changes)
+
+
+def settle_installments(items: Iterable[tuple[UUID, Decimal]]) -> None:
+    """Lote de cuotas `(loan_id, monto)` que dejaron de estar abiertas."""
+    items = list(items)
+    clients = dict(Loan.objects.filter(id__in={loan_id for loan_id, _ in items}).values_list("id", "client_profile_id"))
+    apply_open_balance_deltas(
+        OpenBalanceDelta(loan_id=loan_id, client_id=clients[loan_id], installments=-1, amount=-amount)
+        for loan_id, amount in items
+    )
+
+
+def _increment(model, totals: dict[UUID, list]) -> None:
+    objs = [
+        model(
+            id=key,
+            open_installments=Greatest(F("open_installments") + count, Value(0)),
+            open_balance=F("open_balance") + amount,
+        )
+        for key, (count, amount) in sorted(totals.items())
+        if count or amount
+    ]
+    model.objects.bulk_update(objs, ["open_installments", "open_balance"], batch_size=BATCH_SIZE)
+
+
+def _open_totals(owner: str) -> dict:
+    """Cuotas abiertas y su saldo por fila, recalculados desde `Installment`."""
+    open_items = Installment.objects.filter(**{owner: OuterRef("pk")}, status__in=Installment.OPEN_STATUSES).values(
+        owner
+    )
+    return {
+        "expected_installments": Coalesce(
+            Subquery(open_items.annotate(n=Count("id")).values("n")), Value(0), output_field=IntegerField()
+        ),
+        "expected_balance": Coalesce(Subquery(open_items.annotate(total=Sum("amount")).values("total")), _ZERO),
+    }
+
+
+_OWNERS = ((Loan, "loan"), (ClientProfile, "loan__client_profile"))
+_DRIFT = ~Q(open_installments=F("expected_installments")) | ~Q(open_balance=F("expected_balance"))
+_REPORT_FIELDS = ("id", "open_installments", "expected_installments", "open_balance", "expected_balance")
+
+
+def recompute_open_balances() -> None:
+    """Recalcula todos los contadores desde `Installment` (un UPDATE set-based por tabla)."""
+    for model, owner in _OWNERS:
+        totals = _open_totals(owner)
+        model.objects.update(
+            open_installments=totals["expected_installments"], open_balance=totals["expected_balance"]
+        )
+
+
+def reconcile_open_balances(fix: bool = False, sample: int = 20) -> dict:
+    """Filas cuyo contador difiere del recálculo (`loans`, `clients` y una muestra de cada una).
+
+    Con `fix` recalcula todas las filas si hubo alguna diferencia.
+    """
+    report = {}
+    for (model, owner), name in zip(_OWNERS, ("loans", "clients")):
+        drifted = model.objects.annotate(**_open_totals(owner)).filter(_DRIFT)
+        report[name] = drifted.count()
+        report[f"{name}_sample"] = list(drifted.values(*_REPORT_FIELDS)[:sample])
+    if fix and (report["loans"] or report["clients"]):
+        recompute_open_balances()
+    return report
@@ -0,0 +1,88 @@
+"""Generación del plan de cuotas para préstamos aprobados."""
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from domain.amortization import ScheduleRequest, amortization_schedules
+from domain.value_objects import Money, Rate
+from infrastructure.django_apps.analytics import snapshot
+
+from . import balances
+from .models import Installment, Loan
+
+
+BATCH_SIZE = 1000
+
+
+def generate_installments(loan_ids: Iterable[str], start_date: Optional[date] = None) -> dict:
+    """Inserta el plan de cuotas de los préstamos indicados en una transacción.
+
+    Solo se consideran préstamos aprobados que aún no tienen cuotas; las filas
+    se bloquean mientras tanto y el INSERT ignora conflictos sobre
+    `uniq_installment_per_loan`, de modo que repetir la llamada (reintentos de
+    Celery, backfills) no duplica cuotas. La cuota `k` vence `k` meses después de
+    `start_date` (por defecto, hoy).
+    """
+    start_date = start_date or timezone.localdate()
+    with transaction.atomic():
+        loans = list(
+            Loan.objects.select_for_update()
+            .filter(id__in=list(loan_ids), status=Loan.Status.APPROVED)
+            .annotate(has_installments=Exists(Installment.objects.filter(loan=OuterRef("pk"))))
+            .order_by("id")
+        )
+        pending = [loan for loan in loans if not loan.has_installments]
+        schedules = amortization_schedules(
+            ScheduleRequest(
+                principal=Money(loan.principal_amount, loan.currency),
+                rate=Rate(loan.monthly_rate),
+                term_months=loan.term_months,
+                start_date=start_date,
+            )
+            for loan in pending
+        )
+        rows = [
+            Installment(
+                loan_id=loan.id,
+                number=row.number,
+                due_date=row.due_date,
+                amount=row.payment.amount,
+                currency=row.payment.currency,
+            )
+            for loan, schedule in zip(pending, schedules)
+            for row in schedule
+        ]
+        Installment.objects.bulk_create(rows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        # Los préstamos están bloqueados y no tenían cuotas: todas las filas se insertaron.
+        balances.apply_open_balance_deltas(
+            balances.OpenBalanceDelta(
+                loan_id=loan.id,
+                client_id=loan.client_profile_id,
+                installments=len(schedule),
+                amount=sum((row.payment.amount for row in schedule), Decimal("0")),
+            )
+            for loan, schedule in zip(pending, schedules)
+        )
+        if rows:
+            transaction.on_commit(
+                lambda: snapshot.bump(snapshot.INSTALLMENTS_BY_STATUS, Installment.Status.PENDING, count=len(rows)),
+                robust=True,
+            )
+
+    return {"loans": len(pending), "skipped": len(loans) - len(pending), "installments": len(rows)}
+
+
+def approved_loans_without_installments() -> list[str]:
+    """IDs de préstamos aprobados sin plan de cuotas (backfill tras caídas del broker)."""
+    return [
+        str(loan_id)
+        for loan_id in Loan.objects.filter(status=Loan.Status.APPROVED)
+        .exclude(Exists(Installment.objects.filter(loan=OuterRef("pk"))))
+        .values_list("id", flat=True)
+    ]
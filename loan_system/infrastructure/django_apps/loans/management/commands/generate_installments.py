@@ -0,0 +1,58 @@
+"""
+Genera el plan de cuotas de préstamos aprobados (por lotes, idempotente).
+"""
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.django_apps.loans.installments import (
+    approved_loans_without_installments,
+    generate_installments,
+)
+
+
+class Command(BaseCommand):
+    help = "Genera cuotas para los préstamos indicados o para todos los aprobados sin plan (--missing)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("loan_ids", nargs="*", help="IDs de préstamos aprobados")
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Procesa todos los préstamos aprobados que aún no tienen cuotas",
+        )
+        parser.add_argument(
+            "--start-date",
+            type=date.fromisoformat,
+            default=None,
+            help="Fecha base de vencimientos (YYYY-MM-DD, default: hoy)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Préstamos por transacción (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        loan_ids = list(options["loan_ids"])
+        if options["missing"]:
+            loan_ids += approved_loans_without_installments()
+        if not loan_ids:
+            raise CommandError("Indique IDs de préstamos o use --missing")
+
+        batch_size = options["batch_size"]
+        totals = {"loans": 0, "skipped": 0, "installments": 0}
+        for offset in range(0, len(loan_ids), batch_size):
+            result = generate_installments(loan_ids[offset : offset + batch_size], options["start_date"])
+            for key in totals:
+                totals[key] += result[key]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cuotas generadas: {totals['installments']} en {totals['loans']} préstamos "
+                f"({totals['skipped']} ya tenían plan)"
+            )
+        )
@@ -0,0 +1,58 @@
+"""
+Importa pagos desde un archivo bancario CSV/NDJSON con reporte por fila.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from application.ports import Actor
+from infrastructure.django_apps.accounts.models import User
+from infrastructure.django_apps.loans.payment_import import CHUNK_SIZE, FORMATS, ingest_payments, read_rows
+
+
+class Command(BaseCommand):
+    help = "Registra pagos desde CSV (installment_id,reference,amount,currency) o NDJSON en bloques transaccionales"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo de pagos")
+        parser.add_argument("--format", choices=FORMATS, default=None, help="Formato (default: por extensión)")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"Filas por transacción (default: {CHUNK_SIZE})")
+        parser.add_argument("--report", default=None, help="Escribe el reporte por fila (NDJSON) en esta ruta")
+        parser.add_argument("--user", default=None, help="Usuario ADMIN/ANALYST al que se atribuyen los pagos")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"No existe el archivo {path}")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser positivo")
+        fmt = options["format"] or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+
+        actor = Actor(user_id=None, role=User.Role.ADMIN)
+        if options["user"]:
+            user = User.objects.filter(username=options["user"]).first()
+            if user is None:
+                raise CommandError(f"No existe el usuario {options['user']}")
+            actor = Actor(user_id=user.id, role=user.role)
+
+        accepted = rejected = 0
+        report = open(options["report"], "w", encoding="utf-8") if options["report"] else None
+        try:
+            with path.open(encoding="utf-8", newline="") as fh:
+                for entry in ingest_payments(read_rows(fh, fmt), actor, chunk_size=options["chunk_size"]):
+                    if entry["status"] == "accepted":
+                        accepted += 1
+                    else:
+                        rejected += 1
+                        if report is None:
+                            self.stdout.write(f"  línea {entry['line']}: {entry['error']}")
+                    if report is not None:
+                        report.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        finally:
+            if report is not None:
+                report.close()
+
+        self.stdout.write(self.style.SUCCESS(f"{accepted} pagos registrados, {rejected} rechazados"))
@@ -0,0 +1,40 @@
+"""
+Marca como atrasadas las cuotas pendientes vencidas (por bloques, idempotente).
+"""
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.django_apps.loans.overdue import CHUNK_SIZE, sweep_overdue_installments
+
+
+class Command(BaseCommand):
+    help = "Pasa a 'late' las cuotas pendientes con vencimiento anterior a --date y marca morosos a sus clientes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            type=date.fromisoformat,
+            default=None,
+            help="Vencen antes de esta fecha (YYYY-MM-DD, default: hoy)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help=f"Cuotas por transacción (default: {CHUNK_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser positivo")
+
+        result = sweep_overdue_installments(options["date"], chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cuotas atrasadas: {result['installments']} en {result['batches']} bloques "
+                f"({result['clients']} clientes marcados como morosos)"
+            )
+        )
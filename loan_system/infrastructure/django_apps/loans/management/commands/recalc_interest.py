@@ -0,0 +1,69 @@
+"""
+Re-tasa la cartera: recalcula las cuotas abiertas con una nueva tasa mensual.
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.django_apps.loans.repricing import CHUNK_SIZE, SHARDS, RepriceOptions, reprice_loans
+
+
+class Command(BaseCommand):
+    help = "Lleva los préstamos aprobados a --rate y recalcula sus cuotas abiertas (--dry-run muestra el diff)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rate", type=Decimal, required=True, help="Nueva tasa mensual (ej: 0.015)")
+        parser.add_argument("--current-rate", type=Decimal, default=None, help="Solo préstamos con esta tasa")
+        parser.add_argument("--dry-run", action="store_true", help="Calcula y muestra el diff sin escribir")
+        parser.add_argument(
+            "--chunk-size", type=int, default=CHUNK_SIZE, help=f"Préstamos por transacción (default: {CHUNK_SIZE})"
+        )
+        parser.add_argument("--sample", type=int, default=20, help="Cuotas del diff a mostrar (default: 20)")
+        parser.add_argument(
+            "--async",
+            dest="run_async",
+            action="store_true",
+            help="Encola recalc_interest_portfolio_task (rangos de ID en paralelo, --shards)",
+        )
+        parser.add_argument("--shards", type=int, default=SHARDS, help=f"Rangos de ID con --async (default: {SHARDS})")
+
+    def handle(self, *args, **options):
+        if options["rate"] < 0:
+            raise CommandError("--rate no puede ser negativa")
+        if options["chunk_size"] < 1 or options["shards"] < 1:
+            raise CommandError("--chunk-size y --shards deben ser positivos")
+
+        if options["run_async"]:
+            from events.tasks import recalc_interest_portfolio_task
+
+            result = recalc_interest_portfolio_task.delay(
+                new_rate=str(options["rate"]),
+                current_rate=str(options["current_rate"]) if options["current_rate"] is not None else None,
+                dry_run=options["dry_run"],
+                shards=options["shards"],
+            )
+            self.stdout.write(self.style.SUCCESS(f"Re-tasación encolada ({options['shards']} rangos): {result.id}"))
+            return
+
+        result = reprice_loans(
+            RepriceOptions(
+                new_rate=options["rate"],
+                current_rate=options["current_rate"],
+                dry_run=options["dry_run"],
+                chunk_size=options["chunk_size"],
+                sample=options["sample"],
+            )
+        )
+        for change in result["changes"]:
+            self.stdout.write(f"  {change['loan_id']} cuota {change['number']}: {change['old']} -> {change['new']}")
+
+        summary = (
+            f"{result['loans']} préstamos, {result['installments']} cuotas, "
+            f"variación del saldo abierto {result['delta']}"
+        )
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{summary} (dry-run, sin cambios)"))
+            return
+        self.stdout.write(self.style.SUCCESS(summary))
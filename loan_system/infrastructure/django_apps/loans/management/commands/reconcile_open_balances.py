@@ -0,0 +1,36 @@
+"""
+Verifica los contadores de saldo abierto (préstamos y clientes) contra las cuotas.
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.django_apps.loans.balances import reconcile_open_balances
+
+
+class Command(BaseCommand):
+    help = "Recalcula open_installments/open_balance desde Installment y reporta diferencias"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Corrige los contadores si hay diferencias")
+        parser.add_argument("--sample", type=int, default=20, help="Filas de ejemplo por tabla (default: 20)")
+
+    def handle(self, *args, **options):
+        report = reconcile_open_balances(fix=options["fix"], sample=options["sample"])
+        drift = report["loans"] + report["clients"]
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Saldos abiertos consistentes"))
+            return
+
+        for name, label in (("loans", "préstamo"), ("clients", "cliente")):
+            for row in report[f"{name}_sample"]:
+                self.stdout.write(
+                    f"  {label} {row['id']}: esperado {row['expected_installments']} cuotas / {row['expected_balance']} | "
+                    f"guardado {row['open_installments']} cuotas / {row['open_balance']}"
+                )
+
+        summary = f"{report['loans']} préstamos y {report['clients']} clientes con diferencias"
+        if options["fix"]:
+            self.stdout.write(self.style.WARNING(f"{summary} (corregidos)"))
+            return
+        raise CommandError(summary)
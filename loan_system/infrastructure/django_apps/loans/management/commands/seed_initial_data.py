@@ -12,6 +12,7 @@ from django.db.models import Max
 from django.utils import timezone
 
 from infrastructure.django_apps.accounts.models import ClientProfile
+from infrastructure.django_apps.loans.balances import recompute_open_balances
 from infrastructure.django_apps.loans.models import Installment, Loan
 
 
@@ -152,6 +153,8 @@ class Command(BaseCommand):
             historical_loans = self.create_historical_loans(profile)
             self.stdout.write(self.style.SUCCESS(f"Creados {len(historical_loans)} préstamos históricos"))
 
+        # Las cuotas se insertan directo: recalcular los saldos abiertos desnormalizados.
+        recompute_open_balances()
         self.stdout.write(self.style.SUCCESS("Seed completado"))
         self.stdout.write(f"ADMIN username={admin.username} password={options['admin_password']}")
         self.stdout.write(f"CLIENT username={client_user.username} password={options['client_password']}")
@@ -0,0 +1,70 @@
+"""
+Genera datasets sintéticos grandes y reproducibles para benchmarks (bulk_create por bloques).
+"""
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.django_apps.analytics.snapshot import rebuild_snapshot
+from infrastructure.django_apps.loans.synthetic import BATCH_SIZE, SeedOptions, generate
+
+
+class Command(BaseCommand):
+    help = "Genera clientes, préstamos, cuotas y pagos sintéticos deterministas a partir de --seed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=100_000, help="Clientes a generar (default: 100000)")
+        parser.add_argument("--seed", type=int, default=42, help="Semilla; misma semilla, mismos datos (default: 42)")
+        parser.add_argument("--prefix", default="scale", help="Prefijo de los usernames (default: scale)")
+        parser.add_argument("--start", type=int, default=1, help="Índice del primer cliente (default: 1)")
+        parser.add_argument(
+            "--today",
+            type=date.fromisoformat,
+            default=None,
+            help="Fecha de referencia para vencimientos (YYYY-MM-DD, default: hoy)",
+        )
+        parser.add_argument("--months", type=int, default=36, help="Meses de historia de altas (default: 36)")
+        parser.add_argument("--password", default="cliente123", help="Contraseña común de los clientes")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Clientes por transacción (default: {BATCH_SIZE})",
+        )
+        parser.add_argument("--no-payments", action="store_true", help="No generar filas de pago")
+        parser.add_argument("--no-snapshot", action="store_true", help="No recalcular el snapshot del dashboard")
+
+    def handle(self, *args, **options):
+        for name in ("clients", "batch_size", "months", "start"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} debe ser positivo")
+
+        seed_options = SeedOptions(
+            clients=options["clients"],
+            seed=options["seed"],
+            prefix=options["prefix"],
+            start=options["start"],
+            today=options["today"],
+            months=options["months"],
+            password=options["password"],
+            batch_size=options["batch_size"],
+            payments=not options["no_payments"],
+        )
+        totals = None
+        for totals in generate(seed_options):
+            self.stdout.write(
+                f"  {totals.clients + totals.skipped}/{seed_options.clients} clientes "
+                f"({totals.rows / max(totals.seconds, 1e-9):,.0f} filas/s)"
+            )
+        if not options["no_snapshot"]:
+            rebuild_snapshot()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seed completado en {totals.seconds:.1f}s: {totals.clients} clientes "
+                f"({totals.skipped} ya existían), {totals.loans} préstamos, "
+                f"{totals.installments} cuotas, {totals.payments} pagos"
+            )
+        )
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:21
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_open_balances(apps, schema_editor):
+    # Misma lógica que `loans.balances.recompute_open_balances`, con los modelos históricos.
+    Installment = apps.get_model("loans", "Installment")
+    zero = Value(Decimal("0.00"), output_field=DecimalField(max_digits=14, decimal_places=2))
+    owners = (
+        (apps.get_model("loans", "Loan"), "loan"),
+        (apps.get_model("accounts", "ClientProfile"), "loan__client_profile"),
+    )
+    for model, owner in owners:
+        open_items = Installment.objects.filter(**{owner: OuterRef("pk")}, status__in=["pending", "late"]).values(owner)
+        model.objects.update(
+            open_installments=Coalesce(
+                Subquery(open_items.annotate(n=Count("id")).values("n")), Value(0), output_field=IntegerField()
+            ),
+            open_balance=Coalesce(Subquery(open_items.annotate(total=Sum("amount")).values("total")), zero),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_clientprofile_open_balance'),
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='open_balance',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='loan',
+            name='open_installments',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_open_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0002_loan_open_balance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='installment',
+            index=models.Index(fields=['status', 'due_date'], name='loans_insta_status_134d81_idx'),
+        ),
+    ]
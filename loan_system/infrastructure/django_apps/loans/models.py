@@ -24,6 +24,9 @@ class Loan(models.Model):
     term_months = models.PositiveIntegerField()
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Cuotas pendientes/atrasadas y su saldo (desnormalizado; ver `loans.balances`).
+    open_installments = models.PositiveIntegerField(default=0)
+    open_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
 
     class Meta:
         indexes = [
@@ -38,6 +41,8 @@ class Installment(models.Model):
         PAID = "paid", "Pagada"
         LATE = "late", "Atrasada"
 
+    OPEN_STATUSES = (Status.PENDING, Status.LATE)
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     loan = models.ForeignKey(Loan, on_delete=models.PROTECT, related_name="installments")
     number = models.PositiveIntegerField()
@@ -48,7 +53,11 @@ class Installment(models.Model):
 
     class Meta:
         constraints = [models.UniqueConstraint(fields=["loan", "number"], name="uniq_installment_per_loan")]
-        indexes = [models.Index(fields=["loan", "status"])]
+        indexes = [
+            models.Index(fields=["loan", "status"]),
+            # Barrido de vencidas (`loans.overdue`) y conteo de atrasadas del dashboard.
+            models.Index(fields=["status", "due_date"]),
+        ]
 
 
 class Payment(models.Model):
@@ -64,8 +73,9 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def save(self, *args, **kwargs):
-        # Historial inmutable: una vez creado, no se permite modificar el registro.
-        if self.pk and self.__class__.objects.filter(pk=self.pk).exists():
+        # Historial inmutable: una vez creado, no se permite modificar el registro. Una
+        # instancia nueva con `id` repetido falla en el INSERT (PK), sin consulta previa.
+        if not self._state.adding:
             raise ValueError("Payment es inmutable; use eventos de ajuste controlados")
         return super().save(*args, **kwargs)
 
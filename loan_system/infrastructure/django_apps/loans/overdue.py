@@ -0,0 +1,85 @@
+"""Barrido nocturno de cuotas vencidas: `pending` → `late`.
+
+Trabaja por bloques de `chunk_size` cuotas, cada uno en su transacción: toma las
+cuotas pendientes con vencimiento anterior a `today` recorriendo el índice
+`(status, due_date)`, las pasa a atrasadas con un UPDATE condicional (una cuota
+pagada entre la lectura y el UPDATE no se toca), marca morosos a sus clientes con
+otro UPDATE y registra un único evento de auditoría con el resumen del bloque.
+Los saldos abiertos no cambian: `late` sigue siendo una cuota abierta.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Optional
+from uuid import uuid4
+
+from django.db import transaction
+from django.utils import timezone
+
+from application.caching import CLIENTS
+from domain.entities import AuditEvent
+from infrastructure.django_apps.accounts.models import ClientProfile
+from infrastructure.django_apps.analytics import snapshot
+from infrastructure.repositories.django_repositories import invalidate_cached, write_audit_events
+
+from .models import Installment
+
+
+CHUNK_SIZE = 1000
+
+
+def sweep_overdue_installments(today: Optional[date] = None, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Marca como atrasadas las cuotas vencidas; repetirlo el mismo día no cambia nada."""
+    today = today or timezone.localdate()
+    summary = {"installments": 0, "clients": 0, "batches": 0}
+    while True:
+        marked, flagged = _sweep_chunk(today, chunk_size)
+        if not marked:
+            return summary
+        summary["installments"] += marked
+        summary["clients"] += flagged
+        summary["batches"] += 1
+
+
+def _sweep_chunk(today: date, chunk_size: int) -> tuple[int, int]:
+    with transaction.atomic():
+        rows = list(
+            Installment.objects.filter(status=Installment.Status.PENDING, due_date__lt=today)
+            .order_by("due_date", "id")
+            .values_list("id", "loan__client_profile_id")[:chunk_size]
+        )
+        if not rows:
+            return 0, 0
+
+        marked = Installment.objects.filter(
+            id__in=[installment_id for installment_id, _ in rows], status=Installment.Status.PENDING
+        ).update(status=Installment.Status.LATE)
+        candidates = ClientProfile.objects.filter(id__in={client_id for _, client_id in rows}, is_delinquent=False)
+        client_ids = sorted(str(client_id) for client_id in candidates.values_list("id", flat=True))
+        flagged = candidates.filter(id__in=client_ids).update(is_delinquent=True) if client_ids else 0
+        invalidate_cached(CLIENTS, client_ids)
+
+        write_audit_events(
+            [
+                AuditEvent(
+                    id=uuid4(),
+                    actor_user_id=None,
+                    action="installments.marked_late",
+                    occurred_at=timezone.now(),
+                    before={"status": Installment.Status.PENDING.value},
+                    after={"status": Installment.Status.LATE.value, "installments": marked, "clients_flagged": flagged},
+                    meta={"due_before": today.isoformat(), "client_ids": client_ids},
+                )
+            ]
+        )
+        transaction.on_commit(
+            lambda: snapshot.bump_many(
+                {
+                    (snapshot.INSTALLMENTS_BY_STATUS, Installment.Status.PENDING): (-marked, snapshot.ZERO),
+                    (snapshot.INSTALLMENTS_BY_STATUS, Installment.Status.LATE): (marked, snapshot.ZERO),
+                    (snapshot.CLIENTS_DELINQUENT, ""): (flagged, snapshot.ZERO),
+                }
+            ),
+            robust=True,
+        )
+    return marked, flagged
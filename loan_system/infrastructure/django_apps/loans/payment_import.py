@@ -0,0 +1,131 @@
+"""Ingesta masiva de pagos (archivos de conciliación bancaria y `POST /payments/bulk/`).
+
+Las filas se leen en streaming y se procesan en bloques de `chunk_size`: cada
+bloque es una transacción con `RegisterPaymentsBatchUseCase` (cuotas bloqueadas
+en una consulta, referencias ya registradas en un `IN`, UPDATE/INSERT en bloque).
+El resultado es un reporte por fila: aceptada con su `payment_id` o rechazada con
+el motivo. Un bloque que falla por una carrera con otra transacción se reintenta
+una vez; las filas afectadas se rechazan en el reintento como duplicadas.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import IO, Iterable, Iterator, Optional
+from uuid import UUID
+
+from django.db import transaction
+
+from application.exceptions import Conflict
+from application.ports import Actor
+from application.use_cases import RegisterPaymentCommand, RegisterPaymentsBatchCommand, RegisterPaymentsBatchUseCase
+from infrastructure.repositories.clock import SystemClock
+from infrastructure.repositories.django_repositories import (
+    DjangoDashboardProjection,
+    DjangoInstallmentRepository,
+    DjangoPaymentRepository,
+    audit_repository,
+)
+
+
+FORMATS = ("csv", "ndjson")
+CHUNK_SIZE = 1000
+_CENTS = Decimal("0.01")
+
+
+def read_rows(fh: IO[str], fmt: str) -> Iterator[dict]:
+    """Filas del archivo como dicts, sin cargarlo entero (CSV con encabezado o NDJSON)."""
+    if fmt == "csv":
+        yield from csv.DictReader(fh)
+        return
+    for line in fh:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else {"_error": "JSON inválido"}
+
+
+def parse_row(row: dict) -> RegisterPaymentCommand:
+    """Valida una fila; lanza ValueError con el motivo si no es un pago válido."""
+    if "_error" in row:
+        raise ValueError(row["_error"])
+    try:
+        installment_id = UUID(str(row.get("installment_id", "")))
+    except ValueError:
+        raise ValueError("installment_id inválido") from None
+    reference = str(row.get("reference") or "").strip()
+    if not reference or len(reference) > 100:
+        raise ValueError("reference inválida")
+    try:
+        amount = Decimal(str(row.get("amount", "")))
+    except InvalidOperation:
+        raise ValueError("amount inválido") from None
+    if not amount.is_finite() or amount <= 0 or amount != amount.quantize(_CENTS):
+        raise ValueError("amount inválido")
+    currency = str(row.get("currency") or "USD").strip().upper()
+    if len(currency) != 3:
+        raise ValueError("currency inválida")
+    return RegisterPaymentCommand(installment_id=installment_id, reference=reference, amount=amount, currency=currency)
+
+
+def ingest_payments(rows: Iterable[dict], actor: Actor, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """Registra los pagos por bloques y produce una entrada de reporte por fila (en orden)."""
+    use_case = RegisterPaymentsBatchUseCase(
+        installments=DjangoInstallmentRepository(),
+        payments=DjangoPaymentRepository(),
+        audit=audit_repository(),
+        clock=SystemClock(),
+        analytics=DjangoDashboardProjection(),
+    )
+    numbered = enumerate(rows, start=1)
+    while chunk := list(islice(numbered, chunk_size)):
+        yield from _ingest_chunk(use_case, actor, chunk)
+
+
+def _ingest_chunk(use_case: RegisterPaymentsBatchUseCase, actor: Actor, chunk: list[tuple[int, dict]]) -> list[dict]:
+    report: list[Optional[dict]] = [None] * len(chunk)
+    valid: list[tuple[int, RegisterPaymentCommand]] = []
+    for index, (line, row) in enumerate(chunk):
+        try:
+            valid.append((index, parse_row(row)))
+        except ValueError as exc:
+            report[index] = _entry(line, row.get("installment_id"), row.get("reference"), error=str(exc))
+
+    if valid:
+        command = RegisterPaymentsBatchCommand(payments=tuple(cmd for _, cmd in valid))
+        try:
+            outcomes = _execute(use_case, actor, command)
+        except Conflict:
+            # Una referencia se registró en otra transacción entre la lectura y el INSERT.
+            outcomes = _execute(use_case, actor, command)
+        for (index, _), outcome in zip(valid, outcomes):
+            report[index] = _entry(
+                chunk[index][0],
+                outcome.installment_id,
+                outcome.reference,
+                payment_id=outcome.payment_id,
+                error=outcome.error,
+            )
+    return report
+
+
+def _execute(use_case, actor, command):
+    with transaction.atomic():
+        return use_case.execute(actor, command)
+
+
+def _entry(line: int, installment_id, reference, payment_id=None, error: Optional[str] = None) -> dict:
+    return {
+        "line": line,
+        "installment_id": str(installment_id) if installment_id is not None else None,
+        "reference": reference,
+        "status": "rejected" if error else "accepted",
+        "payment_id": str(payment_id) if payment_id else None,
+        "error": error,
+    }
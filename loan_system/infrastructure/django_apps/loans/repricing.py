@@ -0,0 +1,166 @@
+"""Re-tasación de cartera: recalcula las cuotas abiertas con una nueva tasa.
+
+Recorre los préstamos aprobados con cuotas abiertas y otra tasa por keyset sobre
+`id`, en bloques de `chunk_size` préstamos. Cada bloque es una transacción:
+bloquea los préstamos y sus cuotas abiertas, recalcula los importes con
+`domain.amortization.repriced_payments` (el saldo pendiente se re-amortiza en las
+cuotas que quedan) y escribe las cuotas que cambian agrupadas por importe, junto
+con la tasa, los saldos abiertos y un evento de auditoría con el resumen. Un
+préstamo ya re-tasado queda fuera del alcance, así que repetir la operación o
+reintentar un rango no lo vuelve a tocar. En `dry_run` no se bloquea ni se
+escribe nada y el resultado incluye una muestra del diff.
+
+Para repartir la cartera entre workers, `id_ranges` divide el espacio de UUID en
+rangos contiguos que se procesan de forma independiente (`recalc_interest_range_task`).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional
+from uuid import UUID, uuid4
+
+from django.db import transaction
+from django.utils import timezone
+
+from application.caching import LOANS
+from domain.amortization import RepriceRequest, repriced_payments
+from domain.entities import AuditEvent
+from domain.value_objects import Money, Rate
+from infrastructure.repositories.django_repositories import invalidate_cached, write_audit_events
+
+from . import balances
+from .models import Installment, Loan
+
+
+CHUNK_SIZE = 500
+SHARDS = 16
+
+
+@dataclass(frozen=True)
+class RepriceOptions:
+    new_rate: Decimal
+    # Solo préstamos con esta tasa (cambio de política de una tasa a otra).
+    current_rate: Optional[Decimal] = None
+    dry_run: bool = False
+    chunk_size: int = CHUNK_SIZE
+    sample: int = 20
+
+
+def id_ranges(shards: int = SHARDS) -> list[tuple[Optional[UUID], Optional[UUID]]]:
+    """`shards` rangos `[desde, hasta)` que cubren todos los UUID (None = sin límite)."""
+    bounds = [UUID(int=(k << 128) // shards) for k in range(1, shards)]
+    return list(zip([None, *bounds], [*bounds, None]))
+
+
+def reprice_loans(
+    options: RepriceOptions,
+    lo: Optional[UUID] = None,
+    hi: Optional[UUID] = None,
+    loan_ids: Optional[Iterable[str]] = None,
+) -> dict:
+    """Re-tasa los préstamos del rango `[lo, hi)` (o los de `loan_ids`) y devuelve el resumen."""
+    scope = Loan.objects.filter(status=Loan.Status.APPROVED, open_installments__gt=0).exclude(
+        monthly_rate=options.new_rate
+    )
+    if options.current_rate is not None:
+        scope = scope.filter(monthly_rate=options.current_rate)
+    if lo is not None:
+        scope = scope.filter(id__gte=lo)
+    if hi is not None:
+        scope = scope.filter(id__lt=hi)
+    if loan_ids is not None:
+        scope = scope.filter(id__in=list(loan_ids))
+
+    summary = {"loans": 0, "installments": 0, "delta": Decimal("0"), "chunks": 0, "changes": []}
+    after = None
+    while True:
+        with transaction.atomic():
+            qs = scope if after is None else scope.filter(id__gt=after)
+            if not options.dry_run:
+                qs = qs.select_for_update()
+            loans = list(qs.order_by("id")[: options.chunk_size])
+            if not loans:
+                break
+            _reprice_chunk(loans, options, summary)
+        after = loans[-1].id
+        summary["chunks"] += 1
+
+    summary["delta"] = str(summary["delta"])
+    return summary
+
+
+def _reprice_chunk(loans: list[Loan], options: RepriceOptions, summary: dict) -> None:
+    installments = Installment.objects.filter(
+        loan_id__in=[loan.id for loan in loans], status__in=Installment.OPEN_STATUSES
+    )
+    if not options.dry_run:
+        installments = installments.select_for_update()
+    open_by_loan: dict[UUID, list[Installment]] = {}
+    for installment in installments.order_by("loan_id", "number"):
+        open_by_loan.setdefault(installment.loan_id, []).append(installment)
+
+    requests = [
+        RepriceRequest(
+            open_payments=tuple(Money(i.amount, i.currency) for i in open_by_loan.get(loan.id, ())),
+            rate=Rate(loan.monthly_rate),
+            new_rate=Rate(options.new_rate),
+        )
+        for loan in loans
+    ]
+
+    changed: list[Installment] = []
+    deltas: list[balances.OpenBalanceDelta] = []
+    for loan, payments in zip(loans, repriced_payments(requests)):
+        delta = Decimal("0")
+        for installment, payment in zip(open_by_loan.get(loan.id, ()), payments):
+            if installment.amount == payment.amount:
+                continue
+            if len(summary["changes"]) < options.sample:
+                summary["changes"].append(
+                    {
+                        "loan_id": str(loan.id),
+                        "number": installment.number,
+                        "old": str(installment.amount),
+                        "new": str(payment.amount),
+                    }
+                )
+            delta += payment.amount - installment.amount
+            installment.amount = payment.amount
+            changed.append(installment)
+        if delta:
+            deltas.append(balances.OpenBalanceDelta(loan.id, loan.client_profile_id, installments=0, amount=delta))
+        summary["delta"] += delta
+
+    repriced = [str(loan.id) for loan in loans]
+    summary["loans"] += len(repriced)
+    summary["installments"] += len(changed)
+    if options.dry_run:
+        return
+
+    # Un UPDATE por importe nuevo: en el método francés las cuotas de un préstamo
+    # repiten importe (salvo la última) y la cartera repite condiciones, así que hay
+    # pocos grupos; `bulk_update` arma un CASE por fila y su costo en Python supera
+    # al de las sentencias.
+    by_amount: dict[Decimal, list[UUID]] = {}
+    for installment in changed:
+        by_amount.setdefault(installment.amount, []).append(installment.id)
+    for amount, ids in by_amount.items():
+        for offset in range(0, len(ids), CHUNK_SIZE):
+            Installment.objects.filter(id__in=ids[offset : offset + CHUNK_SIZE]).update(amount=amount)
+    Loan.objects.filter(id__in=repriced).update(monthly_rate=options.new_rate)
+    invalidate_cached(LOANS, repriced)
+    balances.apply_open_balance_deltas(deltas)
+    write_audit_events(
+        [
+            AuditEvent(
+                id=uuid4(),
+                actor_user_id=None,
+                action="loans.repriced",
+                occurred_at=timezone.now(),
+                before={},
+                after={"loans": len(repriced), "installments": len(changed), "monthly_rate": str(options.new_rate)},
+                meta={"loan_ids": repriced},
+            )
+        ]
+    )
@@ -1,6 +1,17 @@
 from __future__ import annotations
 
-from application.exceptions import NotFound
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, IntegrityError, transaction
+
+from application.caching import CachedClientRepository, CachedLoanRepository, cache_key
+from application.exceptions import Conflict, NotFound
+from application.unit_of_work import UnitOfWork
 from domain.entities import (
     AuditEvent,
     Client,
@@ -13,19 +24,41 @@ from domain.entities import (
 )
 from domain.value_objects import Money, Rate
 from infrastructure.django_apps.accounts.models import ClientProfile
+from infrastructure.django_apps.analytics import snapshot
+from infrastructure.django_apps.audit import partitions
 from infrastructure.django_apps.audit.models import AuditLog
+from infrastructure.django_apps.loans import balances
 from infrastructure.django_apps.loans.models import Installment as InstallmentModel
 from infrastructure.django_apps.loans.models import Loan as LoanModel
 from infrastructure.django_apps.loans.models import Payment as PaymentModel
 
 
+audit_logger = logging.getLogger("audit.fallback")
+cache_logger = logging.getLogger("repositories.cache")
+
+
 class DjangoClientRepository:
     def get(self, client_id):
         try:
             cp = ClientProfile.objects.select_related("user").get(id=client_id)
         except ClientProfile.DoesNotExist as exc:
             raise NotFound("Cliente no encontrado") from exc
+        return self._to_domain(cp)
+
+    def get_many(self, client_ids):
+        qs = ClientProfile.objects.select_related("user").filter(id__in=list(client_ids))
+        return {cp.id: self._to_domain(cp) for cp in qs}
+
+    # Deuda activa = cuotas pendientes/atrasadas; se lee del contador desnormalizado (ver `loans.balances`).
+    def has_active_debt(self, client_id):
+        return ClientProfile.objects.filter(id=client_id, open_installments__gt=0).exists()
+
+    def with_active_debt(self, client_ids):
+        return set(
+            ClientProfile.objects.filter(id__in=list(client_ids), open_installments__gt=0).values_list("id", flat=True)
+        )
 
+    def _to_domain(self, cp: ClientProfile) -> Client:
         return Client(
             id=cp.id,
             name=cp.user.get_full_name() or cp.user.username,
@@ -35,13 +68,6 @@ class DjangoClientRepository:
             payment_capacity_monthly=Money(cp.payment_capacity_monthly, "USD"),
         )
 
-    def has_active_debt(self, client_id):
-        return LoanModel.objects.filter(
-            client_profile_id=client_id,
-            status=LoanModel.Status.APPROVED,
-            installments__status__in=[InstallmentModel.Status.PENDING, InstallmentModel.Status.LATE],
-        ).exists()
-
 
 class DjangoLoanRepository:
     def create(self, loan: Loan) -> Loan:
@@ -63,9 +89,32 @@ class DjangoLoanRepository:
             raise NotFound("Préstamo no encontrado") from exc
         return self._to_domain(obj)
 
+    def get_many(self, loan_ids) -> dict:
+        return {obj.id: self._to_domain(obj) for obj in LoanModel.objects.filter(id__in=list(loan_ids))}
+
     def save(self, loan: Loan) -> None:
         LoanModel.objects.filter(id=loan.id).update(status=loan.status.value)
 
+    def save_many(self, loans) -> None:
+        # Un UPDATE por estado destino en lugar de uno por préstamo.
+        by_status: dict[str, list] = {}
+        for loan in loans:
+            by_status.setdefault(loan.status.value, []).append(loan.id)
+        for status, ids in by_status.items():
+            LoanModel.objects.filter(id__in=ids).update(status=status)
+
+    def save_if_status(self, loan: Loan, expected: LoanStatus) -> bool:
+        return bool(LoanModel.objects.filter(id=loan.id, status=expected.value).update(status=loan.status.value))
+
+    def save_many_if_status(self, loans, expected: LoanStatus) -> int:
+        by_status: dict[str, list] = {}
+        for loan in loans:
+            by_status.setdefault(loan.status.value, []).append(loan.id)
+        return sum(
+            LoanModel.objects.filter(id__in=ids, status=expected.value).update(status=status)
+            for status, ids in by_status.items()
+        )
+
     def _to_domain(self, obj: LoanModel) -> Loan:
         return Loan(
             id=obj.id,
@@ -83,6 +132,13 @@ class DjangoInstallmentRepository:
         qs = InstallmentModel.objects.filter(loan_id=loan_id).order_by("number")
         return [self._to_domain(i) for i in qs]
 
+    def get(self, installment_id):
+        try:
+            obj = InstallmentModel.objects.get(id=installment_id)
+        except InstallmentModel.DoesNotExist as exc:
+            raise NotFound("Cuota no encontrada") from exc
+        return self._to_domain(obj)
+
     def get_for_update(self, installment_id):
         try:
             obj = InstallmentModel.objects.select_for_update().get(id=installment_id)
@@ -90,8 +146,45 @@ class DjangoInstallmentRepository:
             raise NotFound("Cuota no encontrada") from exc
         return self._to_domain(obj)
 
+    def get_many_for_update(self, installment_ids):
+        # Orden por id: dos lotes que comparten cuotas las bloquean en el mismo orden.
+        qs = InstallmentModel.objects.select_for_update().filter(id__in=list(installment_ids)).order_by("id")
+        return {obj.id: self._to_domain(obj) for obj in qs}
+
     def save(self, installment: Installment) -> None:
-        InstallmentModel.objects.filter(id=installment.id).update(status=installment.status.value)
+        qs = InstallmentModel.objects.filter(id=installment.id)
+        if installment.status.value in InstallmentModel.OPEN_STATUSES:
+            qs.update(status=installment.status.value)
+            return
+        # Solo si la cuota estaba abierta se descuenta del saldo del préstamo y del cliente.
+        self._close(qs.filter(status__in=InstallmentModel.OPEN_STATUSES), installment)
+
+    def save_if_status(self, installment: Installment, expected: InstallmentStatus) -> bool:
+        qs = InstallmentModel.objects.filter(id=installment.id, status=expected.value)
+        open_statuses = InstallmentModel.OPEN_STATUSES
+        if expected.value in open_statuses and installment.status.value not in open_statuses:
+            return self._close(qs, installment)
+        return bool(qs.update(status=installment.status.value))
+
+    def save_many(self, installments) -> None:
+        """Un UPDATE por estado destino; las cuotas deben venir de `get_many_for_update`."""
+        by_status: dict[str, list[Installment]] = {}
+        for installment in installments:
+            by_status.setdefault(installment.status.value, []).append(installment)
+        for status, group in by_status.items():
+            qs = InstallmentModel.objects.filter(id__in=[i.id for i in group])
+            if status in InstallmentModel.OPEN_STATUSES:
+                qs.update(status=status)
+                continue
+            # Bloqueadas y abiertas al leerlas: todas pasan a cerradas y se descuentan del saldo.
+            qs.filter(status__in=InstallmentModel.OPEN_STATUSES).update(status=status)
+            balances.settle_installments((i.loan_id, i.amount.amount) for i in group)
+
+    def _close(self, qs, installment: Installment) -> bool:
+        if not qs.update(status=installment.status.value):
+            return False
+        balances.settle_installment(installment.loan_id, installment.amount.amount)
+        return True
 
     def _to_domain(self, obj: InstallmentModel) -> Installment:
         return Installment(
@@ -108,16 +201,45 @@ class DjangoPaymentRepository:
     def exists_by_reference(self, reference: str) -> bool:
         return PaymentModel.objects.filter(reference=reference).exists()
 
+    def existing_references(self, references) -> set[str]:
+        return set(PaymentModel.objects.filter(reference__in=list(references)).values_list("reference", flat=True))
+
+    def create_many(self, payments) -> None:
+        rows = [
+            PaymentModel(
+                id=payment.id,
+                loan_id=payment.loan_id,
+                installment_id=payment.installment_id,
+                reference=payment.reference,
+                amount=payment.amount.amount,
+                currency=payment.amount.currency,
+                paid_at=payment.paid_at,
+            )
+            for payment in payments
+        ]
+        try:
+            with transaction.atomic(savepoint=False):
+                PaymentModel.objects.bulk_create(rows, batch_size=500)
+        except IntegrityError as exc:
+            # Otra transacción registró una de las referencias después de `existing_references`.
+            raise Conflict("Pago duplicado") from exc
+
     def create(self, payment: Payment) -> Payment:
-        obj = PaymentModel.objects.create(
-            id=payment.id,
-            loan_id=payment.loan_id,
-            installment_id=payment.installment_id,
-            reference=payment.reference,
-            amount=payment.amount.amount,
-            currency=payment.amount.currency,
-            paid_at=payment.paid_at,
-        )
+        try:
+            # savepoint=False: sin ida y vuelta extra; un duplicado marca la transacción
+            # externa para rollback, que es lo que corresponde ante el Conflict.
+            with transaction.atomic(savepoint=False):
+                obj = PaymentModel.objects.create(
+                    id=payment.id,
+                    loan_id=payment.loan_id,
+                    installment_id=payment.installment_id,
+                    reference=payment.reference,
+                    amount=payment.amount.amount,
+                    currency=payment.amount.currency,
+                    paid_at=payment.paid_at,
+                )
+        except IntegrityError as exc:
+            raise Conflict("Pago duplicado") from exc
         return Payment(
             id=obj.id,
             loan_id=obj.loan_id,
@@ -129,14 +251,269 @@ class DjangoPaymentRepository:
 
 
 class DjangoAuditRepository:
+    """Escribe cada evento en la partición mensual de su `occurred_at` (ver `audit.partitions`)."""
+
+    def append(self, event: AuditEvent) -> None:
+        _audit_model(event, partitions.model_for(event.occurred_at)).save(force_insert=True)
+
+    def append_many(self, events) -> None:
+        write_audit_events(events)
+
+
+class BufferedAuditRepository:
+    """Inserta los eventos de la transacción en curso después del COMMIT.
+
+    Cada `append_many` registra un callback `on_commit` con sus propios eventos,
+    que se escriben con un único `bulk_create` fuera de los locks del caso de uso.
+    La unidad de trabajo entrega todos los eventos de su transacción en una sola
+    llamada, así que es un INSERT por caso de uso. Si la transacción (o el
+    savepoint) se revierte, Django descarta el callback y sus eventos con él; no
+    queda estado entre transacciones. Sin transacción abierta se escribe de inmediato.
+
+    Con `use_celery=True` el lote se entrega a `audit_write_task`; si el broker
+    falla se escribe en línea. Si el INSERT falla, los eventos se registran en el
+    logger `audit.fallback` para poder reinsertarlos.
+    """
+
+    def __init__(self, use_celery: bool = False) -> None:
+        self._use_celery = use_celery
+
     def append(self, event: AuditEvent) -> None:
-        AuditLog.objects.create(
-            id=event.id,
-            actor_id=event.actor_user_id,
-            action=event.action,
-            occurred_at=event.occurred_at,
-            before=event.before,
-            after=event.after,
-            meta=event.meta,
+        self.append_many([event])
+
+    def append_many(self, events) -> None:
+        events = list(events)
+        if not transaction.get_connection().in_atomic_block:
+            self._deliver(events)
+            return
+        transaction.on_commit(lambda: self._deliver(events), robust=True)
+
+    def _deliver(self, events: list[AuditEvent]) -> None:
+        if not events:
+            return
+        if self._use_celery:
+            from events.tasks import audit_write_task
+
+            try:
+                audit_write_task.delay([serialize_audit_event(event) for event in events])
+                return
+            except Exception:
+                audit_logger.warning("Broker no disponible; auditoría escrita en línea", exc_info=True)
+        try:
+            write_audit_events(events)
+        except DatabaseError:
+            for event in events:
+                audit_logger.error("audit.write_failed", extra={"audit_event": serialize_audit_event(event)})
+            audit_logger.exception("No se pudo escribir la auditoría (%d eventos)", len(events))
+
+
+class DjangoSharedCache:
+    """`SharedCache` sobre `django.core.cache` (locmem por proceso, Redis entre procesos).
+
+    Un error del backend se registra y se trata como fallo de caché: el
+    repositorio sigue leyendo de la base. Las invalidaciones se repiten al
+    confirmar la transacción, para que una lectura concurrente no vuelva a
+    cachear la fila anterior mientras la transacción sigue abierta.
+    """
+
+    def __init__(self, alias: str = "default") -> None:
+        self._alias = alias
+
+    @property
+    def _cache(self):
+        return caches[self._alias]
+
+    def get_many(self, keys):
+        try:
+            return self._cache.get_many(list(keys))
+        except Exception:
+            cache_logger.warning("Caché de repositorios no disponible", exc_info=True)
+            return {}
+
+    def set_many(self, values, ttl: int) -> None:
+        try:
+            self._cache.set_many(values, timeout=ttl)
+        except Exception:
+            cache_logger.warning("Caché de repositorios no disponible", exc_info=True)
+
+    def delete_many(self, keys) -> None:
+        keys = list(keys)
+        self._delete(keys)
+        transaction.on_commit(lambda: self._delete(keys), robust=True)
+
+    def _delete(self, keys) -> None:
+        try:
+            self._cache.delete_many(keys)
+        except Exception:
+            cache_logger.warning("Caché de repositorios no disponible", exc_info=True)
+
+
+def _shared_cache():
+    ttl = getattr(settings, "REPOSITORY_CACHE_TTL", 0)
+    return (DjangoSharedCache(settings.REPOSITORY_CACHE_ALIAS), ttl) if ttl > 0 else (None, 0)
+
+
+def client_repository():
+    """`ClientRepository` con mapa de identidad y, si `REPOSITORY_CACHE_TTL` > 0, caché compartida."""
+    shared, ttl = _shared_cache()
+    return CachedClientRepository(DjangoClientRepository(), shared, ttl)
+
+
+def loan_repository():
+    """`LoanRepository` con mapa de identidad y, si `REPOSITORY_CACHE_TTL` > 0, caché compartida."""
+    shared, ttl = _shared_cache()
+    return CachedLoanRepository(DjangoLoanRepository(), shared, ttl)
+
+
+def invalidate_cached(name: str, ids) -> None:
+    """Invalida entidades modificadas sin pasar por el repositorio (UPDATE masivos)."""
+    shared, _ = _shared_cache()
+    if shared is not None:
+        shared.delete_many(cache_key(name, entity_id) for entity_id in ids)
+
+
+def audit_repository():
+    """Implementación de `AuditRepository` según `AUDIT_WRITE_MODE` (sync | buffered | celery)."""
+    mode = getattr(settings, "AUDIT_WRITE_MODE", "sync")
+    if mode == "buffered":
+        return BufferedAuditRepository()
+    if mode == "celery":
+        return BufferedAuditRepository(use_celery=True)
+    return DjangoAuditRepository()
+
+
+@contextmanager
+def unit_of_work():
+    """Transacción con escrituras diferidas: la unidad se vacía justo antes del COMMIT.
+
+    Dentro de la transacción del request no abre un savepoint: un error sale de
+    la vista y revierte el request entero de todos modos.
+    """
+    with transaction.atomic(savepoint=False):
+        uow = UnitOfWork(
+            loans=loan_repository(),
+            installments=DjangoInstallmentRepository(),
+            payments=DjangoPaymentRepository(),
+            audit=audit_repository(),
+        )
+        yield uow
+        uow.flush()
+
+
+def write_audit_events(events) -> None:
+    # ignore_conflicts: los IDs vienen del dominio, así que reintentar un lote es idempotente.
+    for model, group in partitions.route(events, lambda event: event.occurred_at).items():
+        model.objects.bulk_create(
+            [_audit_model(event, model) for event in group], batch_size=500, ignore_conflicts=True
+        )
+
+
+def serialize_audit_event(event: AuditEvent) -> dict:
+    return {
+        "id": str(event.id),
+        "actor_user_id": event.actor_user_id,
+        "action": event.action,
+        "occurred_at": event.occurred_at.isoformat(),
+        "before": event.before,
+        "after": event.after,
+        "meta": event.meta,
+    }
+
+
+def deserialize_audit_event(data: dict) -> AuditEvent:
+    return AuditEvent(
+        id=UUID(data["id"]),
+        actor_user_id=data["actor_user_id"],
+        action=data["action"],
+        occurred_at=datetime.fromisoformat(data["occurred_at"]),
+        before=data["before"],
+        after=data["after"],
+        meta=data["meta"],
+    )
+
+
+def _audit_model(event: AuditEvent, model=AuditLog) -> AuditLog:
+    return model(
+        id=event.id,
+        actor_id=event.actor_user_id,
+        action=event.action,
+        occurred_at=event.occurred_at,
+        before=event.before,
+        after=event.after,
+        meta=event.meta,
+    )
+
+
+class CeleryInstallmentScheduler:
+    """Encola `generate_installments_task` al confirmar la aprobación.
+
+    Si el broker no está disponible el préstamo queda aprobado sin cuotas;
+    `generate_installments --missing` las completa.
+    """
+
+    def loan_approved(self, loan: Loan, approved_at: datetime) -> None:
+        from events.tasks import generate_installments_task
+
+        transaction.on_commit(
+            lambda: generate_installments_task.delay(str(loan.id), approved_at.date().isoformat()),
+            robust=True,
+        )
+
+    def loans_approved(self, loans, approved_at: datetime) -> None:
+        from events.tasks import generate_installments_batch_task
+
+        loan_ids = [str(loan.id) for loan in loans]
+        transaction.on_commit(
+            lambda: generate_installments_batch_task.delay(loan_ids, approved_at.date().isoformat()),
+            robust=True,
+        )
+
+
+class DjangoDashboardProjection:
+    """Mantiene el snapshot del dashboard.
+
+    Los contadores se actualizan al confirmar la transacción en curso (o de
+    inmediato en autocommit) para no alargar los locks del caso de uso; si el
+    proceso cae entre el commit y la actualización, `check_dashboard_snapshot`
+    detecta la diferencia.
+    """
+
+    def loan_created(self, loan: Loan) -> None:
+        transaction.on_commit(
+            lambda: snapshot.record_loan_created(
+                client_id=str(loan.client_id),
+                principal=loan.principal.amount,
+                currency=loan.principal.currency,
+                status=loan.status.value,
+                created_at=loan.created_at,
+            ),
+            robust=True,
+        )
+
+    def loan_decided(self, loan: Loan) -> None:
+        transaction.on_commit(
+            lambda: snapshot.record_loan_decided(
+                previous_status=LoanStatus.PENDING.value,
+                status=loan.status.value,
+                created_at=loan.created_at,
+            ),
+            robust=True,
         )
 
+    def payment_registered(self, payment: Payment, previous_status: InstallmentStatus) -> None:
+        transaction.on_commit(
+            lambda: snapshot.record_payment(
+                amount=payment.amount.amount,
+                paid_at=payment.paid_at,
+                previous_installment_status=previous_status.value,
+            ),
+            robust=True,
+        )
+
+    def payments_registered(self, payments) -> None:
+        rows = [(p.amount.amount, p.paid_at, previous.value) for p, previous in payments]
+        if rows:
+            transaction.on_commit(lambda: snapshot.record_payments(rows), robust=True)
+
+    def client_created(self, status: str, is_delinquent: bool) -> None:
+        transaction.on_commit(lambda: snapshot.record_client_created(status, is_delinquent), robust=True)
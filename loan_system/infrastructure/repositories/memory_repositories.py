@@ -0,0 +1,279 @@
+"""Implementaciones en memoria de los puertos de `application/ports.py`.
+
+Indexadas por id en diccionarios de un `InMemoryStore` compartido, para tests y
+benchmarks sin base de datos. Reproducen el contrato de los repositorios Django:
+las lecturas devuelven copias (modificar una entidad no la persiste hasta
+`save`), los faltantes lanzan `NotFound`, una referencia de pago repetida lanza
+`Conflict` y cerrar una cuota abierta descuenta el contador de cuotas abiertas
+del cliente, que es lo que consulta `has_active_debt`. No hay transacciones: una
+operación que falla no deja cambios a medias, pero no se revierte lo escrito antes.
+"""
+from __future__ import annotations
+
+import copy
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from application.exceptions import Conflict, NotFound
+from domain.amortization import ScheduleRequest, amortization_schedules
+from domain.entities import (
+    AuditEvent,
+    Client,
+    Installment,
+    InstallmentStatus,
+    Loan,
+    LoanStatus,
+    Payment,
+)
+
+
+OPEN_STATUSES = frozenset({InstallmentStatus.PENDING, InstallmentStatus.LATE})
+
+
+@dataclass
+class InMemoryStore:
+    clients: dict[UUID, Client] = field(default_factory=dict)
+    loans: dict[UUID, Loan] = field(default_factory=dict)
+    installments: dict[UUID, Installment] = field(default_factory=dict)
+    installments_by_loan: dict[UUID, list[UUID]] = field(default_factory=dict)
+    payments: dict[UUID, Payment] = field(default_factory=dict)
+    references: set[str] = field(default_factory=set)
+    audit: list[AuditEvent] = field(default_factory=list)
+    # Cuotas pendientes/atrasadas por cliente (como `ClientProfile.open_installments`).
+    open_installments: Counter = field(default_factory=Counter)
+
+    def add_client(self, client: Client) -> Client:
+        self.clients[client.id] = copy.copy(client)
+        return client
+
+    def add_installments(self, installments) -> None:
+        for installment in installments:
+            self.installments[installment.id] = copy.copy(installment)
+            self.installments_by_loan.setdefault(installment.loan_id, []).append(installment.id)
+            if installment.status in OPEN_STATUSES:
+                self.open_installments[self.loans[installment.loan_id].client_id] += 1
+
+
+class InMemoryClientRepository:
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    def get(self, client_id):
+        try:
+            return copy.copy(self._store.clients[client_id])
+        except KeyError as exc:
+            raise NotFound("Cliente no encontrado") from exc
+
+    def get_many(self, client_ids):
+        clients = self._store.clients
+        return {i: copy.copy(clients[i]) for i in client_ids if i in clients}
+
+    def has_active_debt(self, client_id):
+        return self._store.open_installments[client_id] > 0
+
+    def with_active_debt(self, client_ids):
+        return {i for i in client_ids if self._store.open_installments[i] > 0}
+
+
+class InMemoryLoanRepository:
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    def create(self, loan: Loan) -> Loan:
+        self._store.loans[loan.id] = copy.copy(loan)
+        return copy.copy(loan)
+
+    def get(self, loan_id) -> Loan:
+        try:
+            return copy.copy(self._store.loans[loan_id])
+        except KeyError as exc:
+            raise NotFound("Préstamo no encontrado") from exc
+
+    def get_many(self, loan_ids) -> dict:
+        loans = self._store.loans
+        return {i: copy.copy(loans[i]) for i in loan_ids if i in loans}
+
+    def save(self, loan: Loan) -> None:
+        # Como el UPDATE de Django: solo cambia el estado y un id inexistente no hace nada.
+        stored = self._store.loans.get(loan.id)
+        if stored is not None:
+            stored.status = loan.status
+
+    def save_many(self, loans) -> None:
+        for loan in loans:
+            self.save(loan)
+
+    def save_if_status(self, loan: Loan, expected: LoanStatus) -> bool:
+        stored = self._store.loans.get(loan.id)
+        if stored is None or stored.status != expected:
+            return False
+        stored.status = loan.status
+        return True
+
+    def save_many_if_status(self, loans, expected: LoanStatus) -> int:
+        return sum(self.save_if_status(loan, expected) for loan in loans)
+
+
+class InMemoryInstallmentRepository:
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    def list_by_loan(self, loan_id):
+        rows = [self._store.installments[i] for i in self._store.installments_by_loan.get(loan_id, ())]
+        return [copy.copy(i) for i in sorted(rows, key=lambda i: i.number)]
+
+    def get(self, installment_id):
+        try:
+            return copy.copy(self._store.installments[installment_id])
+        except KeyError as exc:
+            raise NotFound("Cuota no encontrada") from exc
+
+    get_for_update = get
+
+    def get_many_for_update(self, installment_ids):
+        installments = self._store.installments
+        return {i: copy.copy(installments[i]) for i in sorted(set(installment_ids)) if i in installments}
+
+    def save(self, installment: Installment) -> None:
+        stored = self._store.installments.get(installment.id)
+        if stored is not None:
+            self._set_status(stored, installment.status)
+
+    def save_many(self, installments) -> None:
+        for installment in installments:
+            self.save(installment)
+
+    def save_if_status(self, installment: Installment, expected: InstallmentStatus) -> bool:
+        stored = self._store.installments.get(installment.id)
+        if stored is None or stored.status != expected:
+            return False
+        self._set_status(stored, installment.status)
+        return True
+
+    def _set_status(self, stored: Installment, status: InstallmentStatus) -> None:
+        was_open, is_open = stored.status in OPEN_STATUSES, status in OPEN_STATUSES
+        if was_open != is_open:
+            client_id = self._store.loans[stored.loan_id].client_id
+            self._store.open_installments[client_id] += 1 if is_open else -1
+        stored.status = status
+
+
+class InMemoryPaymentRepository:
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    def exists_by_reference(self, reference: str) -> bool:
+        return reference in self._store.references
+
+    def existing_references(self, references) -> set[str]:
+        return set(references) & self._store.references
+
+    def create(self, payment: Payment) -> Payment:
+        self.create_many([payment])
+        return copy.copy(payment)
+
+    def create_many(self, payments) -> None:
+        payments = list(payments)
+        references = [p.reference for p in payments]
+        if len(set(references)) != len(references) or self._store.references.intersection(references):
+            raise Conflict("Pago duplicado")
+        for payment in payments:
+            self._store.payments[payment.id] = copy.copy(payment)
+        self._store.references.update(references)
+
+
+class InMemoryAuditRepository:
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    def append(self, event: AuditEvent) -> None:
+        self._store.audit.append(event)
+
+    def append_many(self, events) -> None:
+        self._store.audit.extend(events)
+
+
+class InMemoryDashboardProjection:
+    """Contadores por estado, como el snapshot del dashboard pero sin buckets por mes."""
+
+    def __init__(self) -> None:
+        self.loans_by_status: Counter = Counter()
+        self.installments_by_status: Counter = Counter()
+        self.payments = 0
+
+    def loan_created(self, loan: Loan) -> None:
+        self.loans_by_status[loan.status] += 1
+
+    def loan_decided(self, loan: Loan) -> None:
+        self.loans_by_status[LoanStatus.PENDING] -= 1
+        self.loans_by_status[loan.status] += 1
+
+    def payment_registered(self, payment: Payment, previous_status: InstallmentStatus) -> None:
+        self.payments_registered([(payment, previous_status)])
+
+    def payments_registered(self, payments) -> None:
+        for _, previous_status in payments:
+            self.payments += 1
+            self.installments_by_status[previous_status] -= 1
+            self.installments_by_status[InstallmentStatus.PAID] += 1
+
+
+class InMemoryInstallmentScheduler:
+    """Genera el plan de cuotas en el acto (la versión Celery lo encola al confirmar)."""
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    def loan_approved(self, loan: Loan, approved_at: datetime) -> None:
+        self.loans_approved([loan], approved_at)
+
+    def loans_approved(self, loans, approved_at: datetime) -> None:
+        pending = [loan for loan in loans if loan.id not in self._store.installments_by_loan]
+        schedules = amortization_schedules(
+            ScheduleRequest(loan.principal, loan.rate, loan.term_months, approved_at.date()) for loan in pending
+        )
+        self._store.add_installments(
+            Installment(
+                id=uuid4(),
+                loan_id=loan.id,
+                number=row.number,
+                due_date=row.due_date,
+                amount=row.payment,
+                status=InstallmentStatus.PENDING,
+            )
+            for loan, schedule in zip(pending, schedules)
+            for row in schedule
+        )
+
+
+class InMemorySharedCache:
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[float, object]] = {}
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        found = {}
+        for key in keys:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                found[key] = entry[1]
+        return found
+
+    def set_many(self, values, ttl: int) -> None:
+        expires = time.monotonic() + ttl
+        self._data.update((key, (expires, value)) for key, value in values.items())
+
+    def delete_many(self, keys) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+
+class FixedClock:
+    def __init__(self, now: datetime | None = None) -> None:
+        self._now = now or datetime.now(tz=timezone.utc)
+
+    def now(self) -> datetime:
+        return self._now
@@ -0,0 +1,126 @@
+"""Autenticación JWT sin leer `accounts.User` en cada request.
+
+El token lleva `role` y `username` firmados junto a `user_id`.
+`CachedJWTAuthentication` arma el usuario con esos claims (`TokenUser`: `id`,
+`pk`, `role`, `username`) y solo los contrasta con el estado del usuario
+(`role`, `is_active`) cacheado `JWT_USER_CACHE_TTL` segundos en
+`CACHES[JWT_USER_CACHE_ALIAS]`. Con la caché caliente (el login la llena), un
+request autenticado no hace consultas.
+
+Se rechaza el token de un usuario desactivado o borrado, o cuyo rol ya no es el
+del claim (hay que volver a iniciar sesión). Guardar o borrar un `User` invalida
+su entrada (señales de `accounts`). Las señales solo limpian la caché del proceso
+que guardó, así que con una caché LocMem fuera de DEBUG no se cachea: cada
+request lee `(rol, activo)` de la base, como `JWTAuthentication`. Los UPDATE
+masivos no disparan señales: llamar a `forget_users`. Los tokens sin `role`
+(emitidos antes) se resuelven contra la base como con `JWTAuthentication`.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from infrastructure.config.caches import is_process_local
+from infrastructure.django_apps.accounts.models import User
+
+
+logger = logging.getLogger(__name__)
+
+ROLE_CLAIM = "role"
+# Campos cuyo cambio invalida los tokens emitidos.
+AUTH_FIELDS = frozenset({"role", "is_active"})
+
+
+def _key(user_id) -> str:
+    return f"jwt:user:{user_id}"
+
+
+def _cache():
+    return caches[settings.JWT_USER_CACHE_ALIAS]
+
+
+def _ttl() -> int:
+    # Una desactivación no llegaría a los demás workers: sin caché compartida se lee la base.
+    if not settings.DEBUG and is_process_local(settings.JWT_USER_CACHE_ALIAS):
+        return 0
+    return settings.JWT_USER_CACHE_TTL
+
+
+def _store(user_id, state: tuple[str, bool]) -> None:
+    ttl = _ttl()
+    if ttl <= 0:
+        return
+    try:
+        _cache().set(_key(user_id), state, timeout=ttl)
+    except Exception:
+        logger.warning("Caché de usuarios JWT no disponible", exc_info=True)
+
+
+def user_state(user_id) -> tuple[str, bool]:
+    """(rol, activo) del usuario; un usuario inexistente cuenta como inactivo."""
+    state = None
+    if _ttl() > 0:
+        try:
+            state = _cache().get(_key(user_id))
+        except Exception:
+            logger.warning("Caché de usuarios JWT no disponible", exc_info=True)
+    if state is None:
+        row = User.objects.filter(pk=user_id).values_list("role", "is_active").first()
+        state = tuple(row) if row else ("", False)
+        _store(user_id, state)
+    return state
+
+
+def remember_user(user: User) -> None:
+    _store(user.pk, (user.role, user.is_active))
+
+
+def forget_users(user_ids: Iterable) -> None:
+    """Invalida la entrada ahora y otra vez al confirmar (una lectura concurrente no la repone vieja)."""
+    keys = [_key(user_id) for user_id in user_ids]
+
+    def delete() -> None:
+        try:
+            _cache().delete_many(keys)
+        except Exception:
+            logger.warning("Caché de usuarios JWT no disponible", exc_info=True)
+
+    delete()
+    transaction.on_commit(delete, robust=True)
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Agrega `role` y `username` a los tokens y deja al usuario en la caché."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[ROLE_CLAIM] = user.role
+        token["username"] = user.get_username()
+        remember_user(user)
+        return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken("El token no identifica al usuario") from exc
+
+        role, is_active = user_state(user_id)
+        if not is_active:
+            raise AuthenticationFailed("Usuario inactivo o inexistente", code="user_inactive")
+        if role != validated_token[ROLE_CLAIM]:
+            raise AuthenticationFailed("El rol del usuario cambió; vuelva a iniciar sesión", code="role_changed")
+        return api_settings.TOKEN_USER_CLASS(validated_token)
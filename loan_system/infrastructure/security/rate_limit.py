@@ -0,0 +1,280 @@
+"""Rate limiting compartido entre procesos para las vistas de la API.
+
+`django_ratelimit` guarda sus contadores en la caché de Django; sin `CACHES` eso
+es LocMem por proceso y el límite efectivo se multiplica por la cantidad de
+workers. `ratelimit` (parámetros `group`, `key`, `rate` y `block` de
+django_ratelimit) cuenta en ventanas fijas de `period` segundos sobre un almacén
+compartido elegido con `RATELIMIT_BACKEND`:
+
+- `local`: diccionario del proceso (desarrollo y tests).
+- `sqlite`: archivo SQLite en modo WAL compartido por los workers de la máquina.
+- `redis`: `INCRBY` + `EXPIRE` en una sola ida y vuelta, compartido entre máquinas.
+
+Para no ir al almacén en cada request, cada proceso reserva bloques de
+`limit // RATELIMIT_LEASE_DIVISOR` unidades (mínimo 1) y los consume en memoria.
+Las unidades reservadas y no usadas cuentan como consumidas, así que el error va
+siempre hacia el lado estricto: a lo sumo (workers - 1) × (bloque - 1) requests
+menos por ventana. Con límites bajos el bloque es 1 y la cuenta es exacta. Una
+ventana agotada se recuerda en el proceso y no vuelve a consultar el almacén.
+
+La cuota queda en `request.ratelimit` (`Usage`) para que
+`RateLimitHeadersMiddleware` publique los headers `X-RateLimit-*`; al superarla
+se lanza `Throttled` (429 con `Retry-After`).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import Throttled
+
+
+logger = logging.getLogger(__name__)
+
+LEASE_DIVISOR = 20
+MAX_TRACKED_KEYS = 10_000
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_RATE_RE = re.compile(r"^(\d+)/(\d*)([smhd])$")
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """`"10/m"` → (10, 60); como django_ratelimit, acepta multiplicadores (`"100/5m"`)."""
+    match = _RATE_RE.match(rate or "")
+    if match is None:
+        raise ImproperlyConfigured(f"Rate inválido: {rate!r}")
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * _PERIODS[unit]
+
+
+@dataclass(frozen=True, slots=True)
+class Usage:
+    limit: int
+    remaining: int
+    reset: int  # epoch (s) en que empieza la próxima ventana
+    limited: bool
+
+    def retry_after(self, now: Optional[float] = None) -> int:
+        return max(1, self.reset - int(now if now is not None else time.time()))
+
+
+class LocalStore:
+    """Contadores del proceso: solo sirve con un único worker."""
+
+    def __init__(self) -> None:
+        self._counts: dict[str, tuple[int, int, float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, window: int, amount: int, ttl: int) -> int:
+        now = time.time()
+        with self._lock:
+            stored_window, count, _ = self._counts.get(key, (window, 0, 0.0))
+            count = count + amount if stored_window == window else amount
+            self._counts[key] = (window, count, now + ttl)
+            if len(self._counts) > MAX_TRACKED_KEYS:
+                self._counts = {k: v for k, v in self._counts.items() if v[2] > now}
+            return count
+
+
+class SQLiteStore:
+    """Contadores en un archivo SQLite (WAL) compartido por los procesos de la máquina.
+
+    Una conexión por hilo y por proceso (los workers forkeados no heredan la del
+    padre). Cada reserva es un UPSERT + SELECT en una transacción inmediata.
+    """
+
+    _PRUNE_EVERY = 1000
+
+    def __init__(self, path: str, timeout: float = 5.0) -> None:
+        self._path = path
+        self._timeout = timeout
+        self._local = threading.local()
+        self._reserves = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ratelimit_counter ("
+                "key TEXT PRIMARY KEY, window INTEGER NOT NULL, count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def reserve(self, key: str, window: int, amount: int, ttl: int) -> int:
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO ratelimit_counter (key, window, count, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "count = CASE WHEN window = excluded.window THEN count + excluded.count ELSE excluded.count END, "
+                "window = excluded.window, expires_at = excluded.expires_at",
+                (key, window, amount, now + ttl),
+            )
+            (count,) = conn.execute("SELECT count FROM ratelimit_counter WHERE key = ?", (key,)).fetchone()
+            self._reserves += 1
+            if self._reserves % self._PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM ratelimit_counter WHERE expires_at < ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+
+class RedisStore:
+    """Contadores en Redis: una clave por ventana que expira sola."""
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def reserve(self, key: str, window: int, amount: int, ttl: int) -> int:
+        pipe = self._client.pipeline(transaction=False)
+        pipe.incrby(f"{key}:{window}", amount)
+        pipe.expire(f"{key}:{window}", ttl)
+        count, _ = pipe.execute()
+        return count
+
+
+@dataclass(slots=True)
+class _Lease:
+    window: int
+    top: int  # total del almacén al reservar el último bloque
+    left: int  # unidades del bloque aún sin usar
+
+
+class RateLimiter:
+    """Ventanas fijas sobre un almacén compartido, con bloques reservados por proceso."""
+
+    def __init__(self, store, lease_divisor: int = LEASE_DIVISOR) -> None:
+        self._store = store
+        self._lease_divisor = max(1, lease_divisor)
+        self._leases: dict[str, _Lease] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, period: int, now: Optional[float] = None) -> Usage:
+        now = time.time() if now is None else now
+        window = int(now // period)
+        reset = (window + 1) * period
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease.window == window:
+                if lease.left:
+                    lease.left -= 1
+                    return self._usage(lease.top - lease.left, limit, reset)
+                if lease.top >= limit:
+                    # Ventana agotada: no hace falta volver al almacén hasta la próxima.
+                    return self._usage(lease.top + 1, limit, reset)
+                known = lease.top
+            else:
+                known = 0
+        block = max(1, min(limit // self._lease_divisor, limit - known))
+        top = self._store.reserve(key, window, block, period + 1)
+        with self._lock:
+            self._leases[key] = _Lease(window, top, block - 1)
+            if len(self._leases) > MAX_TRACKED_KEYS:
+                self._leases = {k: v for k, v in self._leases.items() if v.window >= window}
+        return self._usage(top - block + 1, limit, reset)
+
+    @staticmethod
+    def _usage(count: int, limit: int, reset: int) -> Usage:
+        return Usage(limit=limit, remaining=max(0, limit - count), reset=reset, limited=count > limit)
+
+
+_limiters: dict[tuple, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter() -> RateLimiter:
+    """Limitador del proceso para la configuración vigente (uno por combinación de settings)."""
+    config = (
+        getattr(settings, "RATELIMIT_BACKEND", "local"),
+        getattr(settings, "RATELIMIT_LOCATION", ""),
+        getattr(settings, "RATELIMIT_LEASE_DIVISOR", LEASE_DIVISOR),
+    )
+    limiter = _limiters.get(config)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(config)
+            if limiter is None:
+                limiter = _limiters[config] = RateLimiter(_build_store(*config[:2]), config[2])
+    return limiter
+
+
+def _build_store(backend: str, location: str):
+    if backend == "local":
+        return LocalStore()
+    if backend == "sqlite":
+        return SQLiteStore(location)
+    if backend == "redis":
+        return RedisStore(location)
+    raise ImproperlyConfigured(f"RATELIMIT_BACKEND desconocido: {backend!r}")
+
+
+def _key_value(key, group: str, request) -> str:
+    if callable(key):
+        return str(key(group, request))
+    user = getattr(request, "user", None)
+    if key == "ip" or (key == "user_or_ip" and not getattr(user, "is_authenticated", False)):
+        return request.META.get("REMOTE_ADDR", "")
+    if key in ("user", "user_or_ip"):
+        return f"user:{user.pk}" if getattr(user, "is_authenticated", False) else "user:anon"
+    raise ImproperlyConfigured(f"Ratelimit key no soportada: {key!r}")
+
+
+def _record(request, usage: Usage) -> None:
+    # Las vistas DRF reciben un `Request` que envuelve al `HttpRequest` que ve el
+    # middleware: se anota en ambos. Con varios límites queda el más restrictivo.
+    targets = [request]
+    if getattr(request, "_request", None) is not None:
+        targets.append(request._request)
+    for target in targets:
+        previous = getattr(target, "ratelimit", None)
+        if previous is None or usage.limited or (not previous.limited and usage.remaining < previous.remaining):
+            target.ratelimit = usage
+        target.limited = getattr(target, "limited", False) or usage.limited
+
+
+def ratelimit(group=None, key="ip", rate=None, block=True):
+    """Como `django_ratelimit.decorators.ratelimit`, con el almacén compartido de `RATELIMIT_BACKEND`."""
+    limit, period = parse_rate(rate)
+
+    def decorator(fn):
+        name = group or f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapped(request, *args, **kwargs):
+            if getattr(settings, "RATELIMIT_ENABLE", True):
+                bucket = f"rl:{name}:{limit}/{period}:{_key_value(key, name, request)}"
+                try:
+                    usage = get_limiter().hit(bucket, limit, period)
+                except Exception:
+                    # Por defecto sin límite: un archivo bloqueado o Redis caído no debe dejar
+                    # toda la API (login incluido) respondiendo 429.
+                    logger.error("Almacén de rate limit no disponible", exc_info=True)
+                    failed = Usage(limit, 0, int(time.time()) + period, True)
+                    usage = None if getattr(settings, "RATELIMIT_FAIL_OPEN", True) else failed
+                if usage is not None:
+                    _record(request, usage)
+                    if usage.limited and block:
+                        raise Throttled(wait=usage.retry_after())
+            return fn(request, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
@@ -31,5 +31,6 @@ class RequestIdMiddleware:
 
 class RequestIdLogFilter:
     def filter(self, record) -> bool:
-        record.request_id = get_request_id() or "-"
+        # Un `extra={"request_id": ...}` explícito gana (p. ej. logs emitidos al cerrar un streaming).
+        record.request_id = getattr(record, "request_id", None) or get_request_id() or "-"
         return True
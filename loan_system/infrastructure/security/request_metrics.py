@@ -0,0 +1,307 @@
+"""Métricas por request: latencia, consultas SQL, tiempo en la base y tamaño de respuesta.
+
+`RequestMetricsMiddleware` mide cada request y lo acumula en histogramas del
+proceso por (`route`, `method`, `status`); `route` es el nombre de la URL
+resuelta (`unmatched` si no resolvió). Las consultas se cuentan con un execute
+wrapper en cada conexión mientras dura el request; en las respuestas streaming
+la medición termina al cerrar la respuesta, así que incluye el cuerpo enviado.
+Cada request deja una línea de log `request` (JSON, con su `request_id`); las que
+superan `REQUEST_SLOW_MS` salen como warning.
+
+Agregación entre workers: cada proceso escribe su acumulado en
+`METRICS_DIR/worker-<pid>.json` cada `METRICS_FLUSH_SECONDS` y el endpoint
+(`render_prometheus`) suma los archivos de todos. Los archivos de procesos que
+ya terminaron se conservan para que los contadores no bajen; vaciar el
+directorio al desplegar (un PID reutilizado pisa su archivo).
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from application.caching import cache_stats
+
+from .request_id import get_request_id
+
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# nombre -> (ayuda, límites de los buckets)
+HISTOGRAMS = {
+    "http_request_duration_seconds": ("Latencia del request", DURATION_BUCKETS),
+    "http_request_db_queries": ("Consultas SQL por request", QUERY_BUCKETS),
+    "http_request_db_seconds": ("Tiempo en la base por request", DURATION_BUCKETS),
+    "http_response_size_bytes": ("Tamaño del cuerpo de la respuesta", SIZE_BUCKETS),
+}
+LABELS = ("route", "method", "status")
+
+
+@dataclass(frozen=True)
+class RequestSample:
+    duration: float
+    db_queries: int
+    db_seconds: float
+    size: Optional[int]  # None si no se conoce (streaming asíncrono)
+
+    def values(self) -> dict[str, float]:
+        values = {
+            "http_request_duration_seconds": self.duration,
+            "http_request_db_queries": self.db_queries,
+            "http_request_db_seconds": self.db_seconds,
+        }
+        if self.size is not None:
+            values["http_response_size_bytes"] = self.size
+        return values
+
+
+class MetricsRegistry:
+    """Histogramas del proceso: por serie, cuentas por bucket (no acumuladas) más suma y total."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._series: dict[tuple[str, tuple[str, ...]], list[float]] = {}
+        self._last_flush = time.monotonic()
+
+    def observe(self, labels: tuple[str, ...], sample: RequestSample) -> None:
+        with self._lock:
+            self._check_fork()
+            for name, value in sample.values().items():
+                buckets = HISTOGRAMS[name][1]
+                series = self._series.get((name, labels))
+                if series is None:
+                    series = self._series[(name, labels)] = [0] * (len(buckets) + 3)
+                series[_bucket_index(buckets, value)] += 1
+                series[-2] += value
+                series[-1] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._check_fork()
+            series = [[name, list(labels), list(values)] for (name, labels), values in self._series.items()]
+        return {"pid": self._pid, "series": series, "cache": cache_stats()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def flush(self, directory: Optional[Path] = None) -> None:
+        directory = Path(directory or settings.METRICS_DIR)
+        snapshot = self.snapshot()
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            target = directory / f"worker-{snapshot['pid']}.json"
+            tmp = target.with_suffix(".tmp")
+            tmp.write_text(json.dumps(snapshot))
+            os.replace(tmp, target)
+        except OSError:
+            logger.warning("No se pudieron escribir las métricas en %s", directory, exc_info=True)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= settings.METRICS_FLUSH_SECONDS:
+            self.flush()
+
+    def _check_fork(self) -> None:
+        # Un worker creado por fork no hereda las series del padre.
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._series.clear()
+
+
+def _bucket_index(buckets: tuple, value: float) -> int:
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            return index
+    return len(buckets)
+
+
+registry = MetricsRegistry()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    if registry.snapshot()["series"]:
+        registry.flush()
+
+
+def collect(directory: Optional[Path] = None) -> dict:
+    """Suma los acumulados de todos los workers (incluido este, que se escribe antes)."""
+    directory = Path(directory or settings.METRICS_DIR)
+    registry.flush(directory)
+    series: dict[tuple[str, tuple[str, ...]], list[float]] = {}
+    cache: dict[str, dict[str, int]] = {}
+    for path in sorted(directory.glob("worker-*.json")):
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue  # reemplazado o truncado mientras se leía
+        for name, labels, values in snapshot["series"]:
+            if name not in HISTOGRAMS:
+                continue
+            current = series.setdefault((name, tuple(labels)), [0] * len(values))
+            for index, value in enumerate(values):
+                current[index] += value
+        for repository, stats in snapshot.get("cache", {}).items():
+            totals = cache.setdefault(repository, {})
+            for outcome, count in stats.items():
+                totals[outcome] = totals.get(outcome, 0) + count
+    return {"series": series, "cache": cache}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus(directory: Optional[Path] = None) -> str:
+    """Formato de texto de Prometheus (0.0.4)."""
+    data = collect(directory)
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (series_name, labels), values in sorted(data["series"].items()):
+            if series_name != name:
+                continue
+            pairs = list(zip(LABELS, labels))
+            cumulative = 0
+            for bound, count in zip((*buckets, "+Inf"), values[:-2]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f"{name}_bucket{_labels([*pairs, ('le', le)])} {_number(cumulative)}")
+            lines.append(f"{name}_sum{_labels(pairs)} {_number(values[-2])}")
+            lines.append(f"{name}_count{_labels(pairs)} {_number(values[-1])}")
+    lines += [
+        "# HELP repository_cache_lookups_total Lecturas de los repositorios con caché por resultado",
+        "# TYPE repository_cache_lookups_total counter",
+    ]
+    for repository, stats in sorted(data["cache"].items()):
+        for outcome, count in sorted(stats.items()):
+            lines.append(
+                f"repository_cache_lookups_total{_labels([('repository', repository), ('outcome', outcome)])} {count}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+class _QueryTimer:
+    """Execute wrapper: cuenta las sentencias y el tiempo que tardan."""
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.queries += 1
+
+
+class _CountingStream:
+    """Cuenta los bytes de una respuesta streaming y avisa al cerrarse."""
+
+    def __init__(self, content, on_close: Callable[[int], None]) -> None:
+        self._content = content
+        self._on_close = on_close
+        self._closed = False
+        self.size = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._content:
+            self.size += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._on_close(self.size)
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not settings.REQUEST_METRICS:
+            return self.get_response(request)
+
+        timer = _QueryTimer()
+        wrapped = connections.all()
+        for connection in wrapped:
+            connection.execute_wrappers.append(timer)
+        started = time.perf_counter()
+        request_id = get_request_id()
+
+        def finish(response: HttpResponse, size: Optional[int]) -> None:
+            for connection in wrapped:
+                if timer in connection.execute_wrappers:
+                    connection.execute_wrappers.remove(timer)
+            match = getattr(request, "resolver_match", None)
+            labels = (match.view_name if match else "unmatched", request.method, str(response.status_code))
+            sample = RequestSample(time.perf_counter() - started, timer.queries, timer.seconds, size)
+            registry.observe(labels, sample)
+            registry.maybe_flush()
+            _log(labels, sample, request_id)
+
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            for connection in wrapped:
+                connection.execute_wrappers.remove(timer)
+            raise
+
+        if not response.streaming:
+            finish(response, len(response.content))
+        elif response.is_async:
+            finish(response, None)
+        else:
+            response.streaming_content = _CountingStream(
+                response.streaming_content, lambda size: finish(response, size)
+            )
+        return response
+
+
+def _log(labels: tuple[str, ...], sample: RequestSample, request_id: Optional[str]) -> None:
+    duration_ms = sample.duration * 1000
+    level = logging.WARNING if duration_ms >= settings.REQUEST_SLOW_MS else logging.INFO
+    if not logger.isEnabledFor(level):
+        return
+    route, method, status = labels
+    logger.log(
+        level,
+        "request",
+        extra={
+            "request_id": request_id,
+            "route": route,
+            "method": method,
+            "status": int(status),
+            "duration_ms": round(duration_ms, 2),
+            "db_queries": sample.db_queries,
+            "db_ms": round(sample.db_seconds * 1000, 2),
+            "response_bytes": sample.size,
+        },
+    )
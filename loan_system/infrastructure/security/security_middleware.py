@@ -60,7 +60,8 @@ class SecurityHeadersMiddleware:
 
 class RateLimitHeadersMiddleware:
     """
-    Agrega información de rate limiting en los headers de respuesta
+    Publica la cuota de rate limiting (`request.ratelimit`, ver `rate_limit.ratelimit`)
+    en los headers de respuesta
     """
 
     def __init__(self, get_response):
@@ -69,10 +70,12 @@ class RateLimitHeadersMiddleware:
     def __call__(self, request):
         response = self.get_response(request)
 
-        # Agregar headers informativos de rate limiting
-        if hasattr(request, 'limited') and request.limited:
-            response['X-RateLimit-Limit'] = getattr(request, 'limit', 'N/A')
-            response['X-RateLimit-Remaining'] = '0'
-            response['Retry-After'] = '60'
+        usage = getattr(request, "ratelimit", None)
+        if usage is not None:
+            response["X-RateLimit-Limit"] = str(usage.limit)
+            response["X-RateLimit-Remaining"] = str(usage.remaining)
+            response["X-RateLimit-Reset"] = str(usage.reset)
+            if usage.limited:
+                response["Retry-After"] = str(usage.retry_after())
 
         return response
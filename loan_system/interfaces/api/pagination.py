@@ -0,0 +1,116 @@
+"""Paginación por cursor (keyset) y exportación NDJSON para listados grandes.
+
+El cursor codifica la última clave entregada (`campo`, `id`); la página
+siguiente filtra `(campo, id) > cursor` y se apoya en el índice del campo en
+lugar de recorrer un OFFSET creciente.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional
+from uuid import UUID
+
+from django.db.models import F, Q, QuerySet
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from infrastructure.config.db_router import bind_reads
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+STREAM_CHUNK_SIZE = 2000
+
+
+def _parse_datetime(value: str) -> datetime:
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+@dataclass(frozen=True)
+class KeysetPaginator:
+    """Pagina un queryset ordenado por `(field, id)`.
+
+    `parse` reconstruye el valor de `field` desde su representación en el cursor.
+    """
+
+    field: str
+    descending: bool = False
+    parse: Callable[[str], Any] = str
+
+    def ordered(self, queryset: QuerySet) -> QuerySet:
+        prefix = "-" if self.descending else ""
+        return queryset.order_by(f"{prefix}{self.field}", f"{prefix}id")
+
+    def paginate(self, queryset: QuerySet, request) -> tuple[list, Optional[str]]:
+        limit = self._limit(request.query_params.get("limit"))
+        qs = self.ordered(queryset).annotate(keyset_value=F(self.field))
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            value, last_id = self._decode(cursor)
+            op = "lt" if self.descending else "gt"
+            qs = qs.filter(
+                Q(**{f"{self.field}__{op}": value}) | Q(**{self.field: value, f"id__{op}": last_id})
+            )
+
+        page = list(qs[: limit + 1])
+        if len(page) <= limit:
+            return page, None
+        page = page[:limit]
+        return page, self._encode(page[-1])
+
+    def _limit(self, raw: Optional[str]) -> int:
+        if raw in (None, ""):
+            return DEFAULT_LIMIT
+        try:
+            limit = int(raw)
+        except ValueError as exc:
+            raise ValidationError({"limit": "Debe ser un entero positivo"}) from exc
+        if limit < 1:
+            raise ValidationError({"limit": "Debe ser un entero positivo"})
+        return min(limit, MAX_LIMIT)
+
+    def _encode(self, obj) -> str:
+        value = obj.keyset_value
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        raw = json.dumps([value, str(obj.id)], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def _decode(self, cursor: str) -> tuple[Any, UUID]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            value, last_id = json.loads(raw)
+            return self.parse(value), UUID(last_id)
+        except (binascii.Error, ValueError, TypeError) as exc:
+            raise ValidationError({"cursor": "Cursor inválido"}) from exc
+
+
+CLIENTS_BY_USERNAME = KeysetPaginator(field="user__username")
+LOANS_BY_NEWEST = KeysetPaginator(field="created_at", descending=True, parse=_parse_datetime)
+
+
+def wants_stream(request) -> bool:
+    return request.query_params.get("stream") == "ndjson"
+
+
+def ndjson_response(rows: Iterable[dict]) -> StreamingHttpResponse:
+    """Respuesta NDJSON (un objeto por línea) generada de forma perezosa.
+
+    Las filas se leen de la misma base que el resto del request aunque la
+    consulta corra después de que la vista devolvió la respuesta.
+    """
+    response = StreamingHttpResponse(
+        (json.dumps(row, ensure_ascii=False) + "\n" for row in bind_reads(rows)),
+        content_type="application/x-ndjson",
+    )
+    response["Cache-Control"] = "no-store"
+    return response
@@ -12,6 +12,10 @@ class HasRole(BasePermission):
         return role in self.allowed_roles
 
 
+class AdminOnly(HasRole):
+    allowed_roles = {"ADMIN"}
+
+
 class AdminOrAnalyst(HasRole):
     allowed_roles = {"ADMIN", "ANALYST"}
 
@@ -16,6 +16,14 @@ class DecideLoanSerializer(serializers.Serializer):
     reason = serializers.CharField(required=False, allow_blank=True, max_length=250)
 
 
+class LoanDecisionItemSerializer(DecideLoanSerializer):
+    loan_id = serializers.UUIDField()
+
+
+class DecideLoansBatchSerializer(serializers.Serializer):
+    decisions = LoanDecisionItemSerializer(many=True, allow_empty=False, max_length=500)
+
+
 class RegisterPaymentSerializer(serializers.Serializer):
     installment_id = serializers.UUIDField()
     reference = serializers.CharField(max_length=100)
@@ -23,6 +31,11 @@ class RegisterPaymentSerializer(serializers.Serializer):
     currency = serializers.CharField(max_length=3)
 
 
+class RegisterPaymentsBulkSerializer(serializers.Serializer):
+    # Cada fila se valida en la ingesta para rechazarla sola, sin invalidar el lote.
+    payments = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=5000)
+
+
 class QuoteLoanSerializer(serializers.Serializer):
     principal_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
     currency = serializers.CharField(max_length=3)
@@ -30,6 +43,21 @@ class QuoteLoanSerializer(serializers.Serializer):
     term_months = serializers.IntegerField(min_value=1, max_value=600)
 
 
+class QuoteLoanGridSerializer(serializers.Serializer):
+    principal_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    currency = serializers.CharField(max_length=3)
+    monthly_rates = serializers.ListField(
+        child=serializers.DecimalField(max_digits=7, decimal_places=6),
+        min_length=1,
+        max_length=20,
+    )
+    term_months = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=600),
+        min_length=1,
+        max_length=60,
+    )
+
+
 class CreateClientSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=150)
     email = serializers.EmailField(max_length=254)
@@ -0,0 +1,111 @@
+"""Transacción por request según el método: lecturas fuera de ATOMIC_REQUESTS.
+
+Con `ATOMIC_REQUESTS` (la configuración MySQL) Django envuelve cada vista en una
+transacción, también los GET: `SET autocommit=0`, `COMMIT` y `SET autocommit=1`
+alrededor de cada listado o dashboard, con la transacción abierta mientras se
+serializa la respuesta. Las vistas que heredan de `TransactionRoutedAPIView`
+quedan fuera de ese envoltorio y lo deciden en `dispatch`, por cada base con
+`ATOMIC_REQUESTS`:
+
+- Métodos de escritura: `transaction.atomic`, igual que antes (el `set_rollback`
+  del handler de DRF sigue revirtiendo los errores manejados).
+- `read_only_methods` (GET/HEAD/OPTIONS, más POST en las cotizaciones), según
+  `READ_REQUEST_TRANSACTION`:
+    - `none`: autocommit; cada consulta ve lo último confirmado.
+    - `read_only`: transacción `READ ONLY` (MySQL/PostgreSQL): lecturas
+      consistentes entre sí, sin id de transacción ni escrituras posibles.
+    - `atomic`: como ATOMIC_REQUESTS.
+- `non_atomic_methods`: sin transacción del request (autocommit); la vista
+  abre las suyas. Para escrituras por bloques que deben confirmarse por separado
+  (ingesta masiva de pagos): un error manejado no revierte lo ya confirmado.
+
+Sin ATOMIC_REQUESTS (SQLite por defecto) las lecturas corren en autocommit de
+todos modos y las escrituras usan sus propios `atomic`.
+
+Los métodos en `replica_methods` leen de la réplica (`infrastructure/config/db_router.py`)
+salvo que el usuario haya escrito hace poco; su transacción de lectura, si la hay,
+se abre en la réplica. Un request de escritura exitoso fija al usuario a la
+primaria. Por eso la transacción empieza en `initial`, después de autenticar.
+"""
+from __future__ import annotations
+
+from contextlib import ExitStack, contextmanager, nullcontext
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from rest_framework.views import APIView
+
+from infrastructure.config.db_router import PRIMARY, pin_to_primary, pinned_to_primary, replica_reads
+
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+READ_MODES = ("none", "read_only", "atomic")
+
+
+@contextmanager
+def read_only_transaction(using: str):
+    connection = connections[using]
+    outermost = not connection.in_atomic_block
+    with transaction.atomic(using=using):
+        if outermost and connection.vendor in ("mysql", "postgresql"):
+            # MySQL: aplica a la transacción que abre la próxima sentencia.
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION READ ONLY")
+        yield
+
+
+def request_transaction(method: str, using: str, read_only_methods=SAFE_METHODS, non_atomic_methods=frozenset()):
+    """Contexto transaccional de un request `method` sobre la base `using`."""
+    if method.upper() in non_atomic_methods:
+        return nullcontext()
+    if method.upper() not in read_only_methods:
+        return transaction.atomic(using=using)
+    mode = getattr(settings, "READ_REQUEST_TRANSACTION", "none")
+    if mode == "atomic":
+        return transaction.atomic(using=using)
+    if mode == "read_only":
+        return read_only_transaction(using)
+    if mode != "none":
+        raise ImproperlyConfigured(f"READ_REQUEST_TRANSACTION debe ser uno de {READ_MODES}: {mode!r}")
+    return nullcontext()
+
+
+def _user_id(request):
+    user = getattr(request, "user", None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+class TransactionRoutedAPIView(APIView):
+    read_only_methods = SAFE_METHODS
+    non_atomic_methods = frozenset()
+    replica_methods = frozenset()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        for alias in connections:
+            view = transaction.non_atomic_requests(using=alias)(view)
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        with ExitStack() as stack:
+            self._request_contexts = stack
+            response = super().dispatch(request, *args, **kwargs)
+        if request.method.upper() not in self.read_only_methods and response.status_code < 400:
+            pin_to_primary(_user_id(self.request))
+        return response
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        method = request.method.upper()
+        reads = PRIMARY
+        if method in self.replica_methods and not pinned_to_primary(_user_id(request)):
+            reads = self._request_contexts.enter_context(replica_reads())
+        for connection in connections.all():
+            if connection.settings_dict.get("ATOMIC_REQUESTS"):
+                # La transacción de lectura va a la base de la que se lee.
+                using = reads if connection.alias == PRIMARY else connection.alias
+                self._request_contexts.enter_context(
+                    request_transaction(method, using, self.read_only_methods, self.non_atomic_methods)
+                )
@@ -6,9 +6,13 @@ from .views import (
     AuthTokenObtainPairView,
     ClientsListView,
     LoanCreateView,
+    LoanDecisionBatchView,
     LoanDecisionView,
+    LoanQuoteGridView,
     LoanQuoteView,
+    MetricsView,
     RegisterPaymentView,
+    RegisterPaymentsBulkView,
 )
 
 
@@ -18,7 +22,11 @@ urlpatterns = [
     path("analytics/dashboard/", AnalyticsDashboardView.as_view(), name="analytics_dashboard"),
     path("clients/", ClientsListView.as_view(), name="clients_list"),
     path("loans/quote/", LoanQuoteView.as_view(), name="loan_quote"),
+    path("loans/quote/batch/", LoanQuoteGridView.as_view(), name="loan_quote_batch"),
     path("loans/", LoanCreateView.as_view(), name="loan_create"),
     path("loans/<uuid:loan_id>/decision/", LoanDecisionView.as_view(), name="loan_decision"),
+    path("loans/decisions/", LoanDecisionBatchView.as_view(), name="loan_decision_batch"),
     path("payments/", RegisterPaymentView.as_view(), name="payment_register"),
+    path("payments/bulk/", RegisterPaymentsBulkView.as_view(), name="payment_register_bulk"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 ]
@@ -1,15 +1,9 @@
 from __future__ import annotations
 
-from datetime import timedelta
-
-from django.db import models, transaction
-from django.db.models import Count, Q, Sum
-from django.db.models.functions import TruncMonth
-from django.utils import timezone
+from django.db import transaction
+from django.http import HttpResponse
 from django.utils.decorators import method_decorator
-from django_ratelimit.decorators import ratelimit
 from rest_framework.response import Response
-from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.views import TokenObtainPairView
 
@@ -19,31 +13,54 @@ from application.use_cases import (
     CreateLoanUseCase,
     DecideLoanCommand,
     DecideLoanUseCase,
+    DecideLoansBatchCommand,
+    DecideLoansBatchUseCase,
     QuoteLoanCommand,
+    QuoteLoanGridCommand,
+    QuoteLoanGridUseCase,
     QuoteLoanUseCase,
     RegisterPaymentCommand,
     RegisterPaymentUseCase,
 )
 from infrastructure.repositories.clock import SystemClock
 from infrastructure.repositories.django_repositories import (
-    DjangoAuditRepository,
-    DjangoClientRepository,
-    DjangoInstallmentRepository,
-    DjangoLoanRepository,
-    DjangoPaymentRepository,
+    CeleryInstallmentScheduler,
+    DjangoDashboardProjection,
+    client_repository,
+    unit_of_work,
 )
 from infrastructure.django_apps.accounts.models import ClientProfile
 from infrastructure.django_apps.accounts.models import User
-from infrastructure.django_apps.loans.models import Loan as LoanModel, Payment, Installment
-
-from .permissions import AdminOrAnalyst, AnyAuthenticated
+from infrastructure.django_apps.analytics.snapshot import dashboard_payload
+from infrastructure.django_apps.loans.payment_import import ingest_payments
+from infrastructure.django_apps.loans.models import Loan as LoanModel
+from infrastructure.security.jwt_auth import RoleTokenObtainPairSerializer
+from infrastructure.security.rate_limit import ratelimit
+from infrastructure.security.request_metrics import render_prometheus
+
+from .pagination import (
+    CLIENTS_BY_USERNAME,
+    LOANS_BY_NEWEST,
+    STREAM_CHUNK_SIZE,
+    ndjson_response,
+    wants_stream,
+)
+from .permissions import AdminOnly, AdminOrAnalyst, AnyAuthenticated
 from .serializers import (
     CreateClientSerializer,
     CreateLoanSerializer,
     DecideLoanSerializer,
+    DecideLoansBatchSerializer,
+    QuoteLoanGridSerializer,
     QuoteLoanSerializer,
     RegisterPaymentSerializer,
+    RegisterPaymentsBulkSerializer,
 )
+from .transactions import SAFE_METHODS, TransactionRoutedAPIView
+
+
+# Listados y dashboard: leen de la réplica si hay una (ver infrastructure/config/db_router.py).
+REPLICA_METHODS = frozenset({"GET"})
 
 
 def _unique_username_from_email(email: str) -> str:
@@ -56,6 +73,31 @@ def _unique_username_from_email(email: str) -> str:
     return candidate
 
 
+def _client_row(cp: ClientProfile) -> dict:
+    return {
+        "client_id": str(cp.id),
+        "name": cp.user.get_full_name() or cp.user.username,
+        "email": cp.user.email,
+        "phone": cp.phone,
+        "address": cp.address,
+        "status": cp.status,
+        "is_delinquent": cp.is_delinquent,
+    }
+
+
+def _loan_row(loan: LoanModel) -> dict:
+    return {
+        "loan_id": str(loan.id),
+        "client_id": str(loan.client_profile_id),
+        "principal_amount": str(loan.principal_amount),
+        "currency": loan.currency,
+        "monthly_rate": str(loan.monthly_rate),
+        "term_months": loan.term_months,
+        "status": loan.status,
+        "created_at": loan.created_at.isoformat(),
+    }
+
+
 def _actor_from_request(request) -> Actor:
     user = request.user
     return Actor(user_id=getattr(user, "id", None), role=getattr(user, "role", ""))
@@ -63,14 +105,17 @@ def _actor_from_request(request) -> Actor:
 
 class AuthTokenObtainPairView(TokenObtainPairView):
     permission_classes = [AllowAny]
+    serializer_class = RoleTokenObtainPairSerializer
 
     @method_decorator(ratelimit(key="ip", rate="10/m", block=True))
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
 
-class LoanQuoteView(APIView):
+class LoanQuoteView(TransactionRoutedAPIView):
     permission_classes = [AdminOrAnalyst]
+    # Cotizar no escribe: el POST va por el camino de lectura.
+    read_only_methods = SAFE_METHODS | {"POST"}
 
     @method_decorator(ratelimit(key="ip", rate="60/m", block=True))
     def post(self, request):
@@ -88,27 +133,56 @@ class LoanQuoteView(APIView):
         )
 
 
-class ClientsListView(APIView):
+class LoanQuoteGridView(TransactionRoutedAPIView):
+    """Cotiza una grilla tasa × plazo en una sola petición (máx. 20 × 60)."""
+
     permission_classes = [AdminOrAnalyst]
+    read_only_methods = SAFE_METHODS | {"POST"}
 
-    @method_decorator(ratelimit(key="ip", rate="120/m", block=True))
-    def get(self, request):
-        qs = ClientProfile.objects.select_related("user").order_by("user__username")
+    @method_decorator(ratelimit(key="ip", rate="60/m", block=True))
+    def post(self, request):
+        serializer = QuoteLoanGridSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        items = QuoteLoanGridUseCase().execute(
+            QuoteLoanGridCommand(
+                principal_amount=data["principal_amount"],
+                currency=data["currency"],
+                monthly_rates=tuple(data["monthly_rates"]),
+                term_months=tuple(data["term_months"]),
+            )
+        )
         return Response(
-            [
-                {
-                    "client_id": str(cp.id),
-                    "name": cp.user.get_full_name() or cp.user.username,
-                    "email": cp.user.email,
-                    "phone": cp.phone,
-                    "address": cp.address,
-                    "status": cp.status,
-                    "is_delinquent": cp.is_delinquent,
-                }
-                for cp in qs
-            ]
+            {
+                "quotes": [
+                    {
+                        "monthly_rate": str(item.monthly_rate),
+                        "term_months": item.term_months,
+                        "monthly_payment": str(item.quote.monthly_payment),
+                        "total_payment": str(item.quote.total_payment),
+                        "total_interest": str(item.quote.total_interest),
+                    }
+                    for item in items
+                ]
+            }
         )
 
+
+class ClientsListView(TransactionRoutedAPIView):
+    permission_classes = [AdminOrAnalyst]
+    replica_methods = REPLICA_METHODS
+
+    @method_decorator(ratelimit(key="ip", rate="120/m", block=True))
+    def get(self, request):
+        qs = ClientProfile.objects.select_related("user")
+        if wants_stream(request):
+            rows = CLIENTS_BY_USERNAME.ordered(qs).iterator(chunk_size=STREAM_CHUNK_SIZE)
+            return ndjson_response(_client_row(cp) for cp in rows)
+
+        page, next_cursor = CLIENTS_BY_USERNAME.paginate(qs, request)
+        return Response({"results": [_client_row(cp) for cp in page], "next_cursor": next_cursor})
+
     @method_decorator(ratelimit(key="ip", rate="20/m", block=True))
     def post(self, request):
         serializer = CreateClientSerializer(data=request.data)
@@ -141,59 +215,44 @@ class ClientsListView(APIView):
                 phone=phone,
                 address=address,
             )
+            DjangoDashboardProjection().client_created(cp.status, cp.is_delinquent)
 
-        return Response(
-            {
-                "client_id": str(cp.id),
-                "name": user.get_full_name() or user.username,
-                "email": user.email,
-                "phone": cp.phone,
-                "address": cp.address,
-                "status": cp.status,
-                "is_delinquent": cp.is_delinquent,
-            },
-            status=201,
-        )
+        return Response(_client_row(cp), status=201)
 
 
-class LoanCreateView(APIView):
+class LoanCreateView(TransactionRoutedAPIView):
     permission_classes = [AdminOrAnalyst]
+    replica_methods = REPLICA_METHODS
 
     @method_decorator(ratelimit(key="ip", rate="120/m", block=True))
     def get(self, request):
-        qs = LoanModel.objects.select_related("client_profile__user").order_by("-created_at")
-        return Response(
-            [
-                {
-                    "loan_id": str(loan.id),
-                    "client_id": str(loan.client_profile_id),
-                    "principal_amount": str(loan.principal_amount),
-                    "currency": loan.currency,
-                    "monthly_rate": str(loan.monthly_rate),
-                    "term_months": loan.term_months,
-                    "status": loan.status,
-                    "created_at": loan.created_at.isoformat(),
-                }
-                for loan in qs
-            ]
-        )
+        qs = LoanModel.objects.all()
+        if wants_stream(request):
+            rows = LOANS_BY_NEWEST.ordered(qs).iterator(chunk_size=STREAM_CHUNK_SIZE)
+            return ndjson_response(_loan_row(loan) for loan in rows)
+
+        page, next_cursor = LOANS_BY_NEWEST.paginate(qs, request)
+        return Response({"results": [_loan_row(loan) for loan in page], "next_cursor": next_cursor})
 
     @method_decorator(ratelimit(key="ip", rate="20/m", block=True))
     def post(self, request):
         serializer = CreateLoanSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        uc = CreateLoanUseCase(
-            loans=DjangoLoanRepository(),
-            clients=DjangoClientRepository(),
-            audit=DjangoAuditRepository(),
-            clock=SystemClock(),
-        )
-        result = uc.execute(_actor_from_request(request), CreateLoanCommand(**serializer.validated_data))
+        with unit_of_work() as uow:
+            uc = CreateLoanUseCase(
+                loans=uow.loans,
+                clients=client_repository(),
+                audit=uow.audit,
+                clock=SystemClock(),
+                analytics=DjangoDashboardProjection(),
+                uow=uow,
+            )
+            result = uc.execute(_actor_from_request(request), CreateLoanCommand(**serializer.validated_data))
         return Response({"loan_id": str(result.loan_id), "monthly_payment": str(result.monthly_payment)})
 
 
-class LoanDecisionView(APIView):
+class LoanDecisionView(TransactionRoutedAPIView):
     permission_classes = [AdminOrAnalyst]
 
     @method_decorator(ratelimit(key="ip", rate="20/m", block=True))
@@ -201,20 +260,58 @@ class LoanDecisionView(APIView):
         serializer = DecideLoanSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        uc = DecideLoanUseCase(
-            loans=DjangoLoanRepository(),
-            clients=DjangoClientRepository(),
-            audit=DjangoAuditRepository(),
-            clock=SystemClock(),
+        with unit_of_work() as uow:
+            uc = DecideLoanUseCase(
+                loans=uow.loans,
+                clients=client_repository(),
+                audit=uow.audit,
+                clock=SystemClock(),
+                analytics=DjangoDashboardProjection(),
+                installments=CeleryInstallmentScheduler(),
+                uow=uow,
+            )
+            uc.execute(
+                _actor_from_request(request),
+                DecideLoanCommand(loan_id=loan_id, **serializer.validated_data),
+            )
+        return Response({"status": "ok"})
+
+
+class LoanDecisionBatchView(TransactionRoutedAPIView):
+    """Decide hasta 500 préstamos en una transacción; el resultado se informa por préstamo."""
+
+    permission_classes = [AdminOrAnalyst]
+
+    @method_decorator(ratelimit(key="ip", rate="20/m", block=True))
+    def post(self, request):
+        serializer = DecideLoansBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        command = DecideLoansBatchCommand(
+            decisions=tuple(DecideLoanCommand(**item) for item in serializer.validated_data["decisions"])
         )
-        uc.execute(
-            _actor_from_request(request),
-            DecideLoanCommand(loan_id=loan_id, **serializer.validated_data),
+        with unit_of_work() as uow:
+            uc = DecideLoansBatchUseCase(
+                loans=uow.loans,
+                clients=client_repository(),
+                audit=uow.audit,
+                clock=SystemClock(),
+                analytics=DjangoDashboardProjection(),
+                installments=CeleryInstallmentScheduler(),
+                uow=uow,
+            )
+            outcomes = uc.execute(_actor_from_request(request), command)
+        return Response(
+            {
+                "results": [
+                    {"loan_id": str(o.loan_id), "status": o.status, "error": o.error}
+                    for o in outcomes
+                ]
+            }
         )
-        return Response({"status": "ok"})
 
 
-class RegisterPaymentView(APIView):
+class RegisterPaymentView(TransactionRoutedAPIView):
     permission_classes = [AnyAuthenticated]
 
     @method_decorator(ratelimit(key="ip", rate="30/m", block=True))
@@ -222,14 +319,15 @@ class RegisterPaymentView(APIView):
         serializer = RegisterPaymentSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        uc = RegisterPaymentUseCase(
-            installments=DjangoInstallmentRepository(),
-            payments=DjangoPaymentRepository(),
-            audit=DjangoAuditRepository(),
-            clock=SystemClock(),
-        )
-
-        with transaction.atomic():
+        with unit_of_work() as uow:
+            uc = RegisterPaymentUseCase(
+                installments=uow.installments,
+                payments=uow.payments,
+                audit=uow.audit,
+                clock=SystemClock(),
+                analytics=DjangoDashboardProjection(),
+                uow=uow,
+            )
             payment_id = uc.execute(
                 _actor_from_request(request),
                 RegisterPaymentCommand(**serializer.validated_data),
@@ -237,162 +335,44 @@ class RegisterPaymentView(APIView):
         return Response({"payment_id": str(payment_id)})
 
 
-class AnalyticsDashboardView(APIView):
+class RegisterPaymentsBulkView(TransactionRoutedAPIView):
+    """Registra hasta 5000 pagos en bloques; el resultado se informa por fila."""
+
+    permission_classes = [AdminOrAnalyst]
+    # Cada bloque de `ingest_payments` es su propia transacción: sin una del request
+    # que las convierta en savepoints y retenga los locks de las cuotas hasta responder.
+    non_atomic_methods = frozenset({"POST"})
+
+    @method_decorator(ratelimit(key="ip", rate="20/m", block=True))
+    def post(self, request):
+        serializer = RegisterPaymentsBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = list(ingest_payments(serializer.validated_data["payments"], _actor_from_request(request)))
+        accepted = sum(1 for r in results if r["status"] == "accepted")
+        return Response({"accepted": accepted, "rejected": len(results) - accepted, "results": results})
+
+
+class AnalyticsDashboardView(TransactionRoutedAPIView):
     """Endpoint data-driven para alimentar el Dashboard.
 
     Responde con métricas agregadas y series temporales simples para gráficos.
+    Se sirve desde el snapshot materializado (`DashboardCounter`) cuando está
+    construido; en caso contrario se calcula sobre las tablas fuente.
     """
 
     permission_classes = [AdminOrAnalyst]
+    replica_methods = REPLICA_METHODS
 
     @method_decorator(ratelimit(key="ip", rate="120/m", block=True))
     def get(self, request):
-        now = timezone.now()
-        today = now.date()
-
-        # Totales (estado actual)
-        total_clients = ClientProfile.objects.count()
-        active_clients = ClientProfile.objects.filter(status=ClientProfile.Status.ACTIVE).count()
-        loans_qs = LoanModel.objects.all()
-        total_loans = loans_qs.count()
-
-        total_principal = loans_qs.aggregate(total=Sum("principal_amount"))["total"]
-        total_principal_str = str(total_principal or 0)
-
-        delinquent_clients = ClientProfile.objects.filter(is_delinquent=True).count()
-        delinquent_rate = (delinquent_clients / total_clients) if total_clients else 0.0
-
-        # Métricas de pagos
-        total_payments = Payment.objects.count()
-        total_paid_amount = Payment.objects.aggregate(total=Sum("amount"))["total"]
-        total_paid_str = str(total_paid_amount or 0)
-
-        # Cuotas pendientes y pagadas
-        total_installments = Installment.objects.count()
-        pending_installments = Installment.objects.filter(status=Installment.Status.PENDING).count()
-        paid_installments = Installment.objects.filter(status=Installment.Status.PAID).count()
-        late_installments = Installment.objects.filter(status=Installment.Status.LATE).count()
-
-        # Cuotas vencidas (pending + due_date < today)
-        overdue_installments = Installment.objects.filter(
-            status=Installment.Status.PENDING,
-            due_date__lt=today
-        ).count()
-
-        # Préstamos por moneda
-        loans_by_currency = dict(
-            loans_qs.values("currency").annotate(count=Count("id")).values_list("currency", "count")
-        )
+        return Response(dashboard_payload())
 
-        # Promedio de monto de préstamo
-        avg_loan_amount = loans_qs.aggregate(avg=models.Avg("principal_amount"))["avg"]
-        avg_loan_str = str(avg_loan_amount or 0)
 
-        # Clientes con más de un préstamo
-        from django.db.models import Count as CountFunc
-        clients_with_multiple_loans = ClientProfile.objects.annotate(
-            loan_count=CountFunc("loans")
-        ).filter(loan_count__gt=1).count()
+class MetricsView(TransactionRoutedAPIView):
+    """Métricas de requests de todos los workers en formato de texto de Prometheus."""
 
-        # Distribución por estado
-        loans_by_status_rows = (
-            loans_qs.values("status").annotate(count=Count("id")).order_by("status")
-        )
-        loans_by_status = {row["status"]: row["count"] for row in loans_by_status_rows}
-
-        # Serie por mes (últimos 7 meses incluyendo el actual):
-        # solicitudes = total creados en el mes
-        # aprobados = aprobados creados en el mes
-        start = (now - timedelta(days=31 * 6)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        monthly_rows = (
-            loans_qs.filter(created_at__gte=start)
-            .annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(
-                solicitudes=Count("id"),
-                aprobados=Count("id", filter=Q(status=LoanModel.Status.APPROVED)),
-                rechazados=Count("id", filter=Q(status=LoanModel.Status.REJECTED)),
-            )
-            .order_by("month")
-        )
-
-        monthly_series = [
-            {
-                "month": row["month"].date().isoformat() if row["month"] else None,
-                "solicitudes": row["solicitudes"],
-                "aprobados": row["aprobados"],
-                "rechazados": row["rechazados"],
-            }
-            for row in monthly_rows
-        ]
-
-        # Serie de pagos por mes
-        payment_monthly = (
-            Payment.objects.filter(paid_at__gte=start)
-            .annotate(month=TruncMonth("paid_at"))
-            .values("month")
-            .annotate(
-                total=Count("id"),
-                amount=Sum("amount")
-            )
-            .order_by("month")
-        )
-
-        payment_series = [
-            {
-                "month": row["month"].date().isoformat() if row["month"] else None,
-                "total": row["total"],
-                "amount": str(row["amount"] or 0),
-            }
-            for row in payment_monthly
-        ]
+    permission_classes = [AdminOnly]
 
-        # Top 5 clientes por monto total prestado
-        top_clients = (
-            ClientProfile.objects.annotate(
-                total_borrowed=Sum("loans__principal_amount")
-            )
-            .filter(total_borrowed__isnull=False)
-            .order_by("-total_borrowed")[:5]
-        )
-
-        top_clients_data = [
-            {
-                "client_id": str(c.id),
-                "username": c.user.username,
-                "total_amount": str(c.total_borrowed or 0),
-                "loan_count": c.loans.count(),
-            }
-            for c in top_clients
-        ]
-
-        return Response(
-            {
-                "totals": {
-                    "clients": total_clients,
-                    "active_clients": active_clients,
-                    "loans": total_loans,
-                    "principal_sum": total_principal_str,
-                    "delinquent_clients": delinquent_clients,
-                    "delinquent_rate": delinquent_rate,
-                    "total_payments": total_payments,
-                    "total_paid_amount": total_paid_str,
-                    "total_installments": total_installments,
-                    "pending_installments": pending_installments,
-                    "paid_installments": paid_installments,
-                    "late_installments": late_installments,
-                    "overdue_installments": overdue_installments,
-                    "avg_loan_amount": avg_loan_str,
-                    "clients_with_multiple_loans": clients_with_multiple_loans,
-                },
-                "distributions": {
-                    "loans_by_status": loans_by_status,
-                    "loans_by_currency": loans_by_currency,
-                },
-                "series": {
-                    "loans_by_month": monthly_series,
-                    "payments_by_month": payment_series,
-                },
-                "top_clients": top_clients_data,
-            }
-        )
+    def get(self, request):
+        return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
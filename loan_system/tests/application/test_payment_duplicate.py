@@ -14,12 +14,16 @@ from domain.value_objects import Money
 class FakeInstallments:
     def __init__(self, inst: Installment):
         self._inst = inst
+        self._stored_status = inst.status
 
-    def get_for_update(self, installment_id):
+    def get(self, installment_id):
         return self._inst
 
-    def save(self, installment):
-        self._inst = installment
+    def save_if_status(self, installment, expected):
+        if self._stored_status != expected:
+            return False
+        self._stored_status = installment.status
+        return True
 
 
 class FakePayments:
@@ -30,6 +34,9 @@ class FakePayments:
         return self._exists
 
     def create(self, payment):
+        # Como la restricción UNIQUE de `reference` en la base.
+        if self._exists:
+            raise Conflict("Pago duplicado")
         return payment
 
 
@@ -60,7 +67,7 @@ def test_rejects_duplicate_payment_reference():
         clock=FakeClock(),
     )
 
-    with pytest.raises(Conflict):
+    with pytest.raises(Conflict, match="Pago duplicado"):
         uc.execute(
             Actor(user_id=uuid4(), role="CLIENT"),
             RegisterPaymentCommand(
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from application.use_cases import (
+    QuoteLoanCommand,
+    QuoteLoanGridCommand,
+    QuoteLoanGridUseCase,
+    QuoteLoanUseCase,
+    _price_quote,
+)
+
+
+def test_equivalent_commands_share_cache_entry():
+    _price_quote.cache_clear()
+    uc = QuoteLoanUseCase()
+
+    first = uc.execute(QuoteLoanCommand(Decimal("1000.00"), "USD", Decimal("0.02"), 12))
+    second = uc.execute(QuoteLoanCommand(Decimal("1000"), "USD", Decimal("0.020000"), 12))
+
+    assert first == second
+    assert first.monthly_payment == Decimal("94.56")
+    assert _price_quote.cache_info().hits == 1
+
+
+def test_grid_prices_every_rate_term_pair_like_single_quotes():
+    rates = (Decimal("0.01"), Decimal("0.02"))
+    terms = (6, 12, 24)
+
+    items = QuoteLoanGridUseCase().execute(QuoteLoanGridCommand(Decimal("2500.00"), "USD", rates, terms))
+
+    assert [(item.monthly_rate, item.term_months) for item in items] == [(r, t) for r in rates for t in terms]
+    for item in items:
+        expected = _price_quote.__wrapped__(Decimal("2500.00"), "USD", item.monthly_rate, item.term_months)
+        assert item.quote == expected
@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from application.caching import CachedClientRepository, CachedLoanRepository, cache_stats, reset_cache_stats
+from application.exceptions import NotFound
+from domain.entities import Client, ClientStatus, Loan, LoanStatus
+from domain.value_objects import Money, Rate
+
+
+class FakeClients:
+    def __init__(self, clients):
+        self._clients = {c.id: c for c in clients}
+        self.reads = 0
+
+    def get(self, client_id):
+        self.reads += 1
+        if client_id not in self._clients:
+            raise NotFound("Cliente no encontrado")
+        return self._clients[client_id]
+
+    def get_many(self, client_ids):
+        self.reads += 1
+        return {i: self._clients[i] for i in client_ids if i in self._clients}
+
+
+class FakeLoans:
+    def __init__(self, loans):
+        self._loans = {loan.id: loan for loan in loans}
+        self.reads = 0
+
+    def get(self, loan_id):
+        self.reads += 1
+        return self._loans[loan_id]
+
+    def save(self, loan):
+        self._loans[loan.id] = loan
+
+
+class DictCache:
+    def __init__(self):
+        self.data = {}
+
+    def get_many(self, keys):
+        return {k: self.data[k] for k in keys if k in self.data}
+
+    def set_many(self, values, ttl):
+        self.data.update(values)
+
+    def delete_many(self, keys):
+        for k in keys:
+            self.data.pop(k, None)
+
+
+def _client():
+    return Client(
+        id=uuid4(),
+        name="ana",
+        email="ana@example.com",
+        status=ClientStatus.ACTIVE,
+        is_delinquent=False,
+        payment_capacity_monthly=Money(Decimal("500.00")),
+    )
+
+
+def _loan():
+    return Loan(
+        id=uuid4(),
+        client_id=uuid4(),
+        principal=Money(Decimal("1000.00")),
+        rate=Rate(Decimal("0.02")),
+        term_months=12,
+        status=LoanStatus.PENDING,
+        created_at=datetime.now(tz=timezone.utc),
+    )
+
+
+def test_identity_map_reads_each_client_once():
+    reset_cache_stats()
+    a, b = _client(), _client()
+    inner = FakeClients([a, b])
+    repo = CachedClientRepository(inner)
+
+    assert repo.get(a.id) is repo.get(a.id)
+    assert repo.get_many([a.id, b.id]) == {a.id: a, b.id: b}
+
+    assert inner.reads == 2
+    assert (repo.stats.hits, repo.stats.misses) == (2, 2)
+    assert cache_stats()["client"] == {"hits": 2, "shared_hits": 0, "misses": 2}
+
+
+def test_missing_client_is_not_cached():
+    repo = CachedClientRepository(FakeClients([]))
+
+    for _ in range(2):
+        with pytest.raises(NotFound):
+            repo.get(uuid4())
+
+
+def test_shared_tier_is_used_across_instances_and_invalidated_on_save():
+    loan = _loan()
+    inner, shared = FakeLoans([loan]), DictCache()
+
+    CachedLoanRepository(inner, shared, ttl=60).get(loan.id)
+    second = CachedLoanRepository(inner, shared, ttl=60)
+    cached = second.get(loan.id)
+    assert inner.reads == 1
+    assert second.stats.shared_hits == 1
+
+    cached.approve()
+    second.save(cached)
+    assert shared.data == {}
+    assert second.get(loan.id).status == LoanStatus.APPROVED
+    assert CachedLoanRepository(inner, shared, ttl=60).get(loan.id).status == LoanStatus.APPROVED
+
+
+def test_shared_tier_disabled_without_ttl():
+    loan = _loan()
+    inner, shared = FakeLoans([loan]), DictCache()
+
+    CachedLoanRepository(inner, shared).get(loan.id)
+    CachedLoanRepository(inner, shared).get(loan.id)
+
+    assert inner.reads == 2
+    assert shared.data == {}
@@ -0,0 +1,233 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from application.exceptions import Conflict
+from application.ports import Actor
+from application.unit_of_work import UnitOfWork
+from application.use_cases import (
+    DecideLoanCommand,
+    DecideLoansBatchCommand,
+    DecideLoansBatchUseCase,
+    DecideLoanUseCase,
+)
+from domain.entities import (
+    AuditEvent,
+    Client,
+    ClientStatus,
+    Installment,
+    InstallmentStatus,
+    Loan,
+    LoanStatus,
+)
+from domain.value_objects import Money, Rate
+
+
+ACTOR = Actor(user_id=uuid4(), role="ANALYST")
+
+
+class FakeLoans:
+    def __init__(self, loans=()):
+        self._loans = {loan.id: loan for loan in loans}
+        self.stored = {}  # estado en la base si difiere de PENDING
+        self.writes = []
+
+    def get(self, loan_id):
+        return self._loans[loan_id]
+
+    def get_many(self, loan_ids):
+        return {i: self._loans[i] for i in loan_ids if i in self._loans}
+
+    def save_if_status(self, loan, expected):
+        self.writes.append(("save_if_status", [loan.id]))
+        return self._stored_status(loan) == expected
+
+    def save_many_if_status(self, loans, expected):
+        self.writes.append(("save_many_if_status", [loan.id for loan in loans]))
+        return sum(self._stored_status(loan) == expected for loan in loans)
+
+    def _stored_status(self, loan):
+        stored = self.stored.get(loan.id)
+        return LoanStatus.PENDING if stored is None else stored
+
+
+class FakeInstallments:
+    def __init__(self, stored_status):
+        self.stored_status = stored_status
+
+    def save_if_status(self, installment, expected):
+        if self.stored_status != expected:
+            return False
+        self.stored_status = installment.status
+        return True
+
+
+class FakeClients:
+    def __init__(self, client):
+        self._client = client
+
+    def get(self, client_id):
+        return self._client
+
+    def get_many(self, client_ids):
+        return {self._client.id: self._client}
+
+    def has_active_debt(self, client_id):
+        return False
+
+    def with_active_debt(self, client_ids):
+        return set()
+
+
+class FakeAudit:
+    def __init__(self):
+        self.calls = []
+
+    def append(self, event):
+        self.calls.append(("append", 1))
+
+    def append_many(self, events):
+        self.calls.append(("append_many", len(list(events))))
+
+
+class FakeClock:
+    def now(self):
+        return datetime.now(tz=timezone.utc)
+
+
+def _client():
+    return Client(
+        id=uuid4(),
+        name="ana",
+        email="ana@example.com",
+        status=ClientStatus.ACTIVE,
+        is_delinquent=False,
+        payment_capacity_monthly=Money(Decimal("5000.00"), "USD"),
+    )
+
+
+def _loan(client_id, status=LoanStatus.PENDING):
+    return Loan(
+        id=uuid4(),
+        client_id=client_id,
+        principal=Money(Decimal("1200.00"), "USD"),
+        rate=Rate(Decimal("0.01")),
+        term_months=12,
+        status=status,
+        created_at=datetime.now(tz=timezone.utc),
+    )
+
+
+def _event():
+    return AuditEvent(
+        id=uuid4(),
+        actor_user_id=None,
+        action="test",
+        occurred_at=datetime.now(tz=timezone.utc),
+        before={},
+        after={},
+        meta={},
+    )
+
+
+def test_unchanged_entities_are_not_written():
+    loans = FakeLoans()
+    uow = UnitOfWork(loans=loans)
+    uow.track(_loan(uuid4()))
+
+    uow.flush()
+
+    assert loans.writes == []
+
+
+def test_changes_are_coalesced_and_flushed_in_bulk():
+    loans, audit = FakeLoans(), FakeAudit()
+    uow = UnitOfWork(loans=loans, audit=audit)
+    first, second = _loan(uuid4()), _loan(uuid4())
+    for loan in (first, second, first):
+        uow.track(loan)
+    first.approve()
+    second.reject()
+    uow.track(first)  # registrarla otra vez conserva el estado leído originalmente
+    uow.record(_event())
+    uow.record(_event())
+
+    uow.flush()
+
+    assert loans.writes == [("save_many_if_status", [first.id, second.id])]
+    assert audit.calls == [("append_many", 2)]
+
+    # Vaciada la unidad, otro flush no repite escrituras.
+    uow.flush()
+    assert len(loans.writes) == 1
+
+
+def test_unlocked_installment_is_saved_against_the_status_read():
+    installment = Installment(
+        id=uuid4(),
+        loan_id=uuid4(),
+        number=1,
+        due_date=date(2026, 1, 1),
+        amount=Money(Decimal("100.00"), "USD"),
+        status=InstallmentStatus.PENDING,
+    )
+    installments = FakeInstallments(stored_status=InstallmentStatus.PENDING)
+    uow = UnitOfWork(installments=installments)
+    uow.track(installment)
+    installment.mark_paid()
+    installments.stored_status = InstallmentStatus.LATE  # otra operación la cambió
+
+    with pytest.raises(Conflict):
+        uow.flush()
+
+
+def test_loan_decided_from_a_stale_read_is_a_conflict():
+    client = _client()
+    loan = _loan(client.id)
+    loans = FakeLoans([loan])
+    loans.stored[loan.id] = LoanStatus.APPROVED  # otra decisión ya se confirmó
+
+    with pytest.raises(Conflict):
+        DecideLoanUseCase(loans=loans, clients=FakeClients(client), audit=FakeAudit(), clock=FakeClock()).execute(
+            ACTOR, DecideLoanCommand(loan_id=loan.id, approve=False)
+        )
+
+
+def test_use_case_writes_through_request_unit():
+    client = _client()
+    loan = _loan(client.id)
+    loans, audit = FakeLoans([loan]), FakeAudit()
+    uow = UnitOfWork(loans=loans, audit=audit)
+
+    DecideLoanUseCase(loans=loans, clients=FakeClients(client), audit=audit, clock=FakeClock(), uow=uow).execute(
+        ACTOR, DecideLoanCommand(loan_id=loan.id, approve=True)
+    )
+
+    assert loans.writes == [] and audit.calls == []
+    uow.flush()
+    assert loans.writes == [("save_if_status", [loan.id])]
+    assert audit.calls == [("append", 1)]
+
+
+def test_batch_only_writes_decided_loans():
+    client = _client()
+    pending, rejected = _loan(client.id), _loan(client.id, status=LoanStatus.REJECTED)
+    loans, audit = FakeLoans([pending, rejected]), FakeAudit()
+
+    outcomes = DecideLoansBatchUseCase(
+        loans=loans, clients=FakeClients(client), audit=audit, clock=FakeClock()
+    ).execute(
+        ACTOR,
+        DecideLoansBatchCommand(
+            decisions=(
+                DecideLoanCommand(loan_id=pending.id, approve=False),
+                DecideLoanCommand(loan_id=rejected.id, approve=False),
+            )
+        ),
+    )
+
+    assert [o.error for o in outcomes] == [None, "El préstamo no está en estado pendiente"]
+    assert loans.writes == [("save_if_status", [pending.id])]
+    assert audit.calls == [("append", 1)]
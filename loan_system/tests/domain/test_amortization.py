@@ -0,0 +1,93 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from domain.amortization import (
+    RepriceRequest,
+    ScheduleRequest,
+    add_months,
+    outstanding_balance,
+    amortization_schedule,
+    amortization_schedules,
+    repriced_payments,
+)
+from domain.exceptions import ValidationError
+from domain.value_objects import Money, Rate
+
+
+def test_schedule_reconciles_to_the_cent():
+    rows = amortization_schedule(Money(Decimal("1000.00"), "USD"), Rate(Decimal("0.02")), 12, date(2026, 1, 31))
+
+    assert len(rows) == 12
+    assert all(row.payment.amount == Decimal("94.56") for row in rows[:-1])
+    assert sum(row.principal.amount for row in rows) == Decimal("1000.00")
+    assert rows[-1].balance.amount == Decimal("0.00")
+    assert rows[0].interest.amount == Decimal("20.00")
+    assert [row.due_date for row in rows[:2]] == [date(2026, 2, 28), date(2026, 3, 31)]
+
+
+def test_zero_rate_schedule_splits_principal():
+    rows = amortization_schedule(Money(Decimal("100.00"), "USD"), Rate(Decimal("0")), 3, date(2026, 1, 1))
+
+    assert [row.payment.amount for row in rows] == [Decimal("33.33"), Decimal("33.33"), Decimal("33.34")]
+    assert all(row.interest.amount == 0 for row in rows)
+
+
+def test_batch_matches_single_schedule():
+    requests = [
+        ScheduleRequest(Money(Decimal(amount), "USD"), Rate(Decimal(rate)), term, date(2026, month, 15))
+        for amount, rate, term, month in [
+            ("1000.00", "0.02", 12, 1),
+            ("1000.00", "0.02", 12, 3),
+            ("2500.50", "0.015", 36, 1),
+            ("1000.00", "0.02", 12, 1),
+        ]
+    ]
+
+    batch = amortization_schedules(requests)
+
+    assert batch == [
+        amortization_schedule(req.principal, req.rate, req.term_months, req.start_date) for req in requests
+    ]
+
+
+def test_add_months_clamps_to_month_end():
+    assert add_months(date(2024, 1, 31), 1) == date(2024, 2, 29)
+    assert add_months(date(2026, 11, 30), 3) == date(2027, 2, 28)
+
+
+def test_invalid_term_rejected():
+    with pytest.raises(ValidationError):
+        amortization_schedule(Money(Decimal("100.00"), "USD"), Rate(Decimal("0.01")), 0, date(2026, 1, 1))
+
+
+def test_outstanding_balance_is_present_value_of_remaining_payments():
+    rows = amortization_schedule(Money(Decimal("1000.00"), "USD"), Rate(Decimal("0.02")), 12, date(2026, 1, 1))
+
+    full = outstanding_balance([row.payment for row in rows], Rate(Decimal("0.02")))
+    # La última cuota absorbe el redondeo: el valor presente difiere del saldo del plan en centavos.
+    assert abs(full.amount - Decimal("1000.00")) <= Decimal("0.02")
+    remaining = outstanding_balance([row.payment for row in rows[3:]], Rate(Decimal("0.02")))
+    assert abs(remaining.amount - rows[2].balance.amount) <= Decimal("0.02")
+
+
+def test_reprice_amortizes_outstanding_balance_at_new_rate():
+    rate = Rate(Decimal("0.02"))
+    rows = amortization_schedule(Money(Decimal("1000.00"), "USD"), rate, 12, date(2026, 1, 1))
+    open_payments = tuple(row.payment for row in rows[3:])
+
+    [payments, unchanged, empty] = repriced_payments(
+        [
+            RepriceRequest(open_payments, rate, new_rate=Rate(Decimal("0.01"))),
+            RepriceRequest(open_payments, rate, new_rate=rate),
+            RepriceRequest((), rate, new_rate=Rate(Decimal("0.01"))),
+        ]
+    )
+
+    balance = outstanding_balance(open_payments, rate)
+    expected = amortization_schedule(balance, Rate(Decimal("0.01")), 9, date(2026, 1, 1))
+    assert payments == [row.payment for row in expected]
+    assert payments[0].amount < rows[3].payment.amount
+    assert unchanged == list(open_payments)
+    assert empty == []
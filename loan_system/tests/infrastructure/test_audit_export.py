@@ -0,0 +1,102 @@
+import csv
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from infrastructure.django_apps.audit import export
+from infrastructure.django_apps.audit.models import AuditLog
+
+
+pytestmark = pytest.mark.django_db
+
+SINCE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+UNTIL = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def audit_rows():
+    # Varias filas comparten occurred_at para ejercitar el desempate por id.
+    AuditLog.objects.bulk_create(
+        [
+            AuditLog(id=uuid4(), action="payment.registered", occurred_at=SINCE + timedelta(minutes=i // 3), after={"n": i})
+            for i in range(25)
+        ]
+        + [AuditLog(id=uuid4(), action="loan.created", occurred_at=UNTIL)]
+    )
+    return list(
+        AuditLog.objects.filter(occurred_at__lt=UNTIL).order_by("occurred_at", "id").values_list("id", flat=True)
+    )
+
+
+def _read_ids(directory, manifest):
+    ids = []
+    for part in manifest["parts"]:
+        with gzip.open(directory / part["file"], "rt", encoding="utf-8") as fh:
+            if manifest["format"] == "csv":
+                ids += [row["id"] for row in csv.DictReader(fh)]
+            else:
+                ids += [json.loads(line)["id"] for line in fh]
+    return ids
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_writes_ordered_parts_and_manifest(tmp_path, audit_rows, fmt):
+    options = export.ExportOptions(since=SINCE, until=UNTIL, fmt=fmt, chunk_size=4, part_rows=10)
+
+    manifest = export.export_audit_log(options, export_id="e1", root=tmp_path)
+
+    assert manifest["rows"] == 25
+    assert [part["rows"] for part in manifest["parts"]] == [12, 12, 1]
+    assert _read_ids(tmp_path / "e1", manifest) == [str(row_id) for row_id in audit_rows]
+    assert not (tmp_path / "e1" / export.CHECKPOINT).exists()
+
+
+def test_interrupted_export_resumes_from_checkpoint(tmp_path, audit_rows, monkeypatch):
+    original = export.iter_chunks
+
+    def crash_after_three_chunks(*args, **kwargs):
+        for number, chunk in enumerate(original(*args, **kwargs), start=1):
+            if number > 3:
+                raise ConnectionError("worker perdido")
+            yield chunk
+
+    options = export.ExportOptions(since=SINCE, until=UNTIL, chunk_size=4, part_rows=8)
+    monkeypatch.setattr(export, "iter_chunks", crash_after_three_chunks)
+    with pytest.raises(ConnectionError):
+        export.export_audit_log(options, export_id="e2", root=tmp_path)
+    checkpoint = json.loads((tmp_path / "e2" / export.CHECKPOINT).read_text())
+    assert checkpoint["rows"] == 8
+
+    monkeypatch.setattr(export, "iter_chunks", original)
+    manifest = export.export_audit_log(options, export_id="e2", root=tmp_path)
+
+    assert manifest["rows"] == 25
+    assert _read_ids(tmp_path / "e2", manifest) == [str(row_id) for row_id in audit_rows]
+    assert not list((tmp_path / "e2").glob("*.tmp"))
+
+
+def test_same_since_with_another_until_is_a_new_export(tmp_path, audit_rows):
+    first = export.export_audit_log(
+        export.ExportOptions(since=SINCE, until=SINCE + timedelta(minutes=3), chunk_size=4), root=tmp_path
+    )
+    second = export.export_audit_log(export.ExportOptions(since=SINCE, until=UNTIL, chunk_size=4), root=tmp_path)
+
+    assert first["export_id"] != second["export_id"]
+    assert (first["rows"], second["rows"]) == (9, 25)
+
+
+def test_reused_export_id_with_other_parameters_is_rejected(tmp_path, audit_rows):
+    options = export.ExportOptions(since=SINCE, until=SINCE + timedelta(minutes=3), chunk_size=4)
+    export.export_audit_log(options, export_id="e3", root=tmp_path)
+
+    with pytest.raises(export.ExportMismatch, match="until="):
+        export.export_audit_log(export.ExportOptions(since=SINCE, until=UNTIL), export_id="e3", root=tmp_path)
+    with pytest.raises(export.ExportMismatch, match="format="):
+        export.export_audit_log(
+            export.ExportOptions(since=SINCE, until=options.until, fmt="csv"), export_id="e3", root=tmp_path
+        )
+    # Sin until (reintento de la tarea) se acepta el rango ya fijado.
+    assert export.export_audit_log(export.ExportOptions(since=SINCE), export_id="e3", root=tmp_path)["rows"] == 9
@@ -0,0 +1,126 @@
+import gzip
+import json
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from domain.entities import AuditEvent
+from infrastructure.config import db_router
+from infrastructure.django_apps.audit import archive, export, partitions
+from infrastructure.django_apps.audit.models import AuditLog
+from infrastructure.repositories.django_repositories import DjangoAuditRepository, write_audit_events
+
+
+# El DDL de SQLite no puede ejecutarse dentro del atomic de cada test.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+JAN = date(2026, 1, 1)
+FEB = date(2026, 2, 1)
+MAR = date(2026, 3, 1)
+
+
+@pytest.fixture
+def monthly(settings):
+    settings.AUDIT_PARTITIONS = True
+    partitions.ensure_partitions([JAN, FEB])
+    yield
+    with connection.schema_editor() as editor:
+        for month in partitions.existing_partitions(refresh=True):
+            editor.delete_model(partitions.partition_model(month))
+    partitions.existing_partitions(refresh=True)
+
+
+def _event(occurred_at: datetime, action: str = "payment.registered") -> AuditEvent:
+    return AuditEvent(
+        id=uuid4(),
+        actor_user_id=None,
+        action=action,
+        occurred_at=occurred_at,
+        before={},
+        after={"at": occurred_at.isoformat()},
+        meta={},
+    )
+
+
+def _at(month: date, days: int = 0) -> datetime:
+    return partitions.month_bounds(month)[0] + timedelta(days=days, hours=1)
+
+
+def test_events_are_routed_to_their_month_partition(monthly):
+    write_audit_events([_event(_at(JAN)), _event(_at(FEB, 3)), _event(_at(FEB, 9))])
+    DjangoAuditRepository().append(_event(_at(MAR)))
+
+    assert partitions.partition_model(JAN).objects.count() == 1
+    assert partitions.partition_model(FEB).objects.count() == 2
+    # Marzo no tiene partición: cae en la tabla base.
+    assert list(AuditLog.objects.values_list("occurred_at", flat=True)) == [_at(MAR)]
+
+
+def test_range_queries_prune_partitions(monthly):
+    since, until = _at(FEB, 1), partitions.month_bounds(FEB)[1]
+
+    tables = [qs.model._meta.db_table for qs in partitions.querysets(since, until)]
+
+    assert tables == ["audit_auditlog", "audit_auditlog_202602"]
+
+
+def test_export_merges_base_table_and_partitions(monthly, tmp_path, settings):
+    events = [_event(_at(JAN, day)) for day in range(5)] + [_event(_at(FEB, day)) for day in range(5)]
+    write_audit_events(events[::2])
+    settings.AUDIT_PARTITIONS = False
+    write_audit_events(events[1::2])
+    assert AuditLog.objects.count() == 5
+
+    manifest = export.export_audit_log(
+        export.ExportOptions(since=_at(JAN), until=_at(MAR), chunk_size=3), export_id="e", root=tmp_path
+    )
+
+    with gzip.open(tmp_path / "e" / manifest["parts"][0]["file"], "rt") as fh:
+        exported = [json.loads(line)["id"] for line in fh]
+    assert exported == [str(event.id) for event in events]
+
+
+def test_export_reads_each_table_by_keyset_without_sorting_the_union(monthly, tmp_path, settings):
+    events = [_event(_at(JAN, day)) for day in range(9)] + [_event(_at(FEB, day)) for day in range(7)]
+    write_audit_events(events)
+    settings.AUDIT_PARTITIONS = False
+    write_audit_events([_event(_at(FEB, 20))])
+
+    with CaptureQueriesContext(connection) as queries:
+        manifest = export.export_audit_log(
+            export.ExportOptions(since=_at(JAN), until=_at(MAR), chunk_size=3), export_id="e", root=tmp_path
+        )
+
+    selects = [query["sql"] for query in queries.captured_queries if "audit_auditlog" in query["sql"]]
+    assert manifest["rows"] == 17
+    assert not [sql for sql in selects if "UNION" in sql]
+    # Un SELECT por bloque de cada tabla (enero 9 -> 4, febrero 7 -> 3, base 1 -> 1), cada uno con LIMIT.
+    assert len(selects) == 8
+    assert all("LIMIT 3" in sql for sql in selects)
+
+
+def test_archive_month_exports_then_drops_partition(monthly, tmp_path, settings):
+    write_audit_events([_event(_at(JAN, day)) for day in range(4)] + [_event(_at(FEB))])
+    settings.AUDIT_PARTITIONS = False
+    write_audit_events([_event(_at(JAN, 10))])
+
+    assert archive.cold_months(date(2026, 2, 15), hot_months=1) == [JAN]
+    manifest = archive.archive_month(JAN, root=tmp_path)
+
+    assert manifest["rows"] == 5
+    assert (tmp_path / "archive-202601" / manifest["parts"][0]["file"]).exists()
+    assert partitions.existing_partitions() == [FEB]
+    assert not AuditLog.objects.exists()
+    assert archive.cold_months(date(2026, 2, 15), hot_months=1) == []
+
+
+def test_archive_reads_export_and_count_from_the_primary(monthly, tmp_path, monkeypatch):
+    write_audit_events([_event(_at(JAN, day)) for day in range(3)])
+    # Con réplica configurada, cualquier lectura enviada a ella fallaría (no hay alias "replica").
+    monkeypatch.setattr(db_router, "replica_available", lambda: True)
+
+    assert archive.archive_month(JAN, root=tmp_path)["rows"] == 3
+    assert partitions.existing_partitions() == [FEB]
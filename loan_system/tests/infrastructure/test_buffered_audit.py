@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from django.db import transaction
+
+from domain.entities import AuditEvent
+from events import tasks
+from infrastructure.django_apps.audit.models import AuditLog
+from infrastructure.repositories.django_repositories import BufferedAuditRepository
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _event(action: str) -> AuditEvent:
+    return AuditEvent(
+        id=uuid4(),
+        actor_user_id=None,
+        action=action,
+        occurred_at=datetime.now(tz=timezone.utc),
+        before={},
+        after={"ok": True},
+        meta={},
+    )
+
+
+def test_events_are_flushed_in_one_insert_on_commit(django_capture_on_commit_callbacks, django_assert_num_queries):
+    audit = BufferedAuditRepository()
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        audit.append_many([_event(action) for action in ["a", "b", "c"]])
+        assert not AuditLog.objects.exists()
+
+    assert len(callbacks) == 1
+    with django_assert_num_queries(1):
+        callbacks[0]()
+    assert sorted(AuditLog.objects.values_list("action", flat=True)) == ["a", "b", "c"]
+
+
+def test_rolled_back_events_are_discarded(django_capture_on_commit_callbacks):
+    audit = BufferedAuditRepository()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                audit.append(_event("revertido"))
+                raise RuntimeError
+        audit.append(_event("confirmado"))
+
+    assert list(AuditLog.objects.values_list("action", flat=True)) == ["confirmado"]
+
+
+def test_repository_keeps_no_state_between_transactions(django_capture_on_commit_callbacks):
+    audit = BufferedAuditRepository()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                audit.append(_event("revertido"))
+                raise RuntimeError
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with transaction.atomic():
+            audit.append(_event("siguiente"))
+
+    assert len(callbacks) == 1
+    assert list(AuditLog.objects.values_list("action", flat=True)) == ["siguiente"]
+
+
+def test_celery_mode_falls_back_to_inline_write_when_broker_fails(monkeypatch, django_capture_on_commit_callbacks):
+    def broker_down(*args, **kwargs):
+        raise ConnectionError("redis")
+
+    monkeypatch.setattr(tasks.audit_write_task, "delay", broker_down)
+    audit = BufferedAuditRepository(use_celery=True)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        audit.append(_event("payment.registered"))
+
+    assert AuditLog.objects.filter(action="payment.registered").exists()
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.analytics import aggregates, snapshot
+from infrastructure.django_apps.loans.models import Installment, Loan, Payment
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _client(username: str, **extra) -> ClientProfile:
+    user = User.objects.create(username=username, role=User.Role.CLIENT)
+    return ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("5000.00"), **extra)
+
+
+def _loan(profile: ClientProfile, amount: str, status=Loan.Status.PENDING, currency="USD") -> Loan:
+    return Loan.objects.create(
+        client_profile=profile,
+        principal_amount=Decimal(amount),
+        currency=currency,
+        monthly_rate=Decimal("0.020000"),
+        term_months=12,
+        status=status,
+    )
+
+
+@pytest.fixture
+def portfolio():
+    ana = _client("ana")
+    luis = _client("luis", is_delinquent=True)
+    _client("eva", status=ClientProfile.Status.SUSPENDED)
+
+    approved = _loan(ana, "1000.00", Loan.Status.APPROVED)
+    _loan(ana, "500.00", Loan.Status.REJECTED, currency="EUR")
+    _loan(luis, "300.00")
+
+    today = date.today()
+    amount = Decimal("94.56")
+    Installment.objects.create(
+        loan=approved,
+        number=1,
+        due_date=today - timedelta(days=5),
+        amount=amount,
+        status=Installment.Status.LATE,
+    )
+    Installment.objects.create(loan=approved, number=2, due_date=today + timedelta(days=25), amount=amount)
+    paid = Installment.objects.create(
+        loan=approved,
+        number=3,
+        due_date=today + timedelta(days=55),
+        amount=amount,
+        status=Installment.Status.PAID,
+    )
+    Payment.objects.create(loan=approved, installment=paid, reference="REF-1", amount=amount, paid_at=timezone.now())
+
+
+def test_live_dashboard_runs_one_query_per_model(portfolio, django_assert_num_queries):
+    with django_assert_num_queries(5):
+        payload = snapshot.dashboard_live()
+
+    totals = payload["totals"]
+    assert totals["clients"] == 3
+    assert totals["active_clients"] == 2
+    assert totals["delinquent_clients"] == 1
+    assert totals["clients_with_multiple_loans"] == 1
+    assert totals["loans"] == 3
+    assert Decimal(totals["principal_sum"]) == Decimal("1800.00")
+    assert totals["avg_loan_amount"] == "600.00"
+    assert (totals["total_installments"], totals["pending_installments"], totals["paid_installments"]) == (3, 1, 1)
+    assert totals["late_installments"] == totals["overdue_installments"] == 1
+    assert totals["total_payments"] == 1
+    assert payload["distributions"]["loans_by_status"] == {"approved": 1, "pending": 1, "rejected": 1}
+    assert payload["distributions"]["loans_by_currency"] == {"EUR": 1, "USD": 2}
+    assert payload["series"]["loans_by_month"][-1]["aprobados"] == 1
+    top = payload["top_clients"][0]
+    assert (top["username"], top["loan_count"], Decimal(top["total_amount"])) == ("ana", 2, Decimal("1500.00"))
+
+
+def test_totals_resolves_conditional_metrics_in_a_single_query(portfolio, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        result = aggregates.totals(
+            Installment.objects.all(),
+            pending=aggregates.count_if(status=Installment.Status.PENDING),
+            pending_amount=aggregates.sum_if("amount", status=Installment.Status.PENDING),
+            late_amount=aggregates.sum_if("amount", status=Installment.Status.LATE),
+            no_rows_amount=aggregates.sum_if("amount", number=99),
+        )
+
+    assert result["pending"] == 1
+    assert Decimal(result["pending_amount"]) == Decimal("94.56")
+    assert Decimal(result["late_amount"]) == Decimal("94.56")
+    assert result["no_rows_amount"] == Decimal("0")
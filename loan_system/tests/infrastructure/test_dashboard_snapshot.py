@@ -0,0 +1,157 @@
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from application.ports import Actor
+from application.use_cases import (
+    CreateLoanCommand,
+    CreateLoanUseCase,
+    DecideLoanCommand,
+    DecideLoanUseCase,
+    RegisterPaymentCommand,
+    RegisterPaymentUseCase,
+)
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.analytics import snapshot
+from infrastructure.django_apps.loans.models import Installment, Loan
+from infrastructure.repositories.clock import SystemClock
+from infrastructure.repositories.django_repositories import (
+    DjangoAuditRepository,
+    DjangoClientRepository,
+    DjangoDashboardProjection,
+    DjangoInstallmentRepository,
+    DjangoLoanRepository,
+    DjangoPaymentRepository,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _client(username: str) -> ClientProfile:
+    user = User.objects.create(username=username, role=User.Role.CLIENT)
+    return ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("5000.00"))
+
+
+def _seed_installment(profile: ClientProfile) -> Installment:
+    loan = Loan.objects.create(
+        client_profile=profile,
+        principal_amount=Decimal("1000.00"),
+        monthly_rate=Decimal("0.020000"),
+        term_months=12,
+        status=Loan.Status.APPROVED,
+    )
+    return Installment.objects.create(
+        loan=loan,
+        number=1,
+        due_date=date.today() + timedelta(days=30),
+        amount=Decimal("94.56"),
+    )
+
+
+def _amounts_as_decimal(value):
+    # SQLite devuelve SUM/AVG con representación variable ("94.5600000000000").
+    if isinstance(value, dict):
+        return {key: _amounts_as_decimal(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_amounts_as_decimal(item) for item in value]
+    if isinstance(value, str):
+        try:
+            return Decimal(value).quantize(Decimal("0.01"))
+        except InvalidOperation:
+            return value
+    return value
+
+
+def test_incremental_snapshot_matches_live_dashboard(django_capture_on_commit_callbacks):
+    actor = Actor(user_id=None, role="ANALYST")
+    first = _client("ana")
+    second = _client("luis")
+    installment = _seed_installment(first)
+    snapshot.rebuild_snapshot()
+
+    projection = DjangoDashboardProjection()
+    create = CreateLoanUseCase(
+        loans=DjangoLoanRepository(),
+        clients=DjangoClientRepository(),
+        audit=DjangoAuditRepository(),
+        clock=SystemClock(),
+        analytics=projection,
+    )
+    decide = DecideLoanUseCase(
+        loans=DjangoLoanRepository(),
+        clients=DjangoClientRepository(),
+        audit=DjangoAuditRepository(),
+        clock=SystemClock(),
+        analytics=projection,
+    )
+    pay = RegisterPaymentUseCase(
+        installments=DjangoInstallmentRepository(),
+        payments=DjangoPaymentRepository(),
+        audit=DjangoAuditRepository(),
+        clock=SystemClock(),
+        analytics=projection,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        loan_ids = [
+            create.execute(
+                actor,
+                CreateLoanCommand(
+                    client_id=profile.id,
+                    principal_amount=Decimal(amount),
+                    currency="USD",
+                    monthly_rate=Decimal("0.020000"),
+                    term_months=12,
+                ),
+            ).loan_id
+            for profile, amount in [(first, "500.00"), (second, "800.00"), (second, "300.00")]
+        ]
+        decide.execute(actor, DecideLoanCommand(loan_id=loan_ids[1], approve=True))
+        decide.execute(actor, DecideLoanCommand(loan_id=loan_ids[2], approve=False))
+        pay.execute(
+            actor,
+            RegisterPaymentCommand(
+                installment_id=installment.id,
+                reference="REF-1",
+                amount=Decimal("94.56"),
+                currency="USD",
+            ),
+        )
+
+    assert snapshot.diff_counters(snapshot.compute_counters(), snapshot.stored_counters()) == []
+
+    materialized = snapshot.dashboard_from_snapshot()
+    assert _amounts_as_decimal(materialized) == _amounts_as_decimal(snapshot.dashboard_live())
+    assert materialized["totals"]["clients_with_multiple_loans"] == 2
+
+
+def test_dashboard_falls_back_to_live_until_snapshot_is_built():
+    _client("ana")
+
+    assert snapshot.dashboard_from_snapshot() is None
+    assert snapshot.dashboard_payload()["totals"]["clients"] == 1
+
+
+def test_multiple_loans_transition_is_read_under_the_client_counter_lock():
+    profile = _client("ana")
+    snapshot.rebuild_snapshot()
+
+    def record():
+        snapshot.record_loan_created(profile.id, Decimal("100.00"), "USD", Loan.Status.PENDING, timezone.now())
+
+    record()
+    with CaptureQueriesContext(connection) as queries:
+        record()
+    record()
+
+    statements = [query["sql"] for query in queries.captured_queries]
+    start = next(i for i, sql in enumerate(statements) if "client.loans" in sql and sql.startswith("UPDATE"))
+    read = next(i for i, sql in enumerate(statements) if "client.loans" in sql and sql.startswith("SELECT"))
+    release = next(i for i, sql in enumerate(statements) if sql.startswith("RELEASE SAVEPOINT") and i > read)
+    assert statements[start - 1].startswith("SAVEPOINT") and start < read < release
+    assert snapshot.stored_counters()[(snapshot.CLIENTS_MULTIPLE_LOANS, "")][0] == 1
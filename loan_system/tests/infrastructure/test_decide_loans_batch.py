@@ -0,0 +1,95 @@
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from application.exceptions import Forbidden
+from application.ports import Actor
+from application.use_cases import DecideLoanCommand, DecideLoansBatchCommand, DecideLoansBatchUseCase
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.audit.models import AuditLog
+from infrastructure.django_apps.loans import balances
+from infrastructure.django_apps.loans.models import Installment, Loan
+from infrastructure.repositories.clock import SystemClock
+from infrastructure.repositories.django_repositories import (
+    DjangoAuditRepository,
+    DjangoClientRepository,
+    DjangoLoanRepository,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+class RecordingScheduler:
+    def __init__(self):
+        self.approved = []
+
+    def loan_approved(self, loan, approved_at):
+        self.approved.append([loan.id])
+
+    def loans_approved(self, loans, approved_at):
+        self.approved.append([loan.id for loan in loans])
+
+
+def _client(username: str, **extra) -> ClientProfile:
+    user = User.objects.create(username=username, role=User.Role.CLIENT)
+    return ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("5000.00"), **extra)
+
+
+def _loan(profile, status=Loan.Status.PENDING) -> Loan:
+    return Loan.objects.create(
+        client_profile=profile,
+        principal_amount=Decimal("1000.00"),
+        monthly_rate=Decimal("0.020000"),
+        term_months=12,
+        status=status,
+    )
+
+
+def _use_case(scheduler=None) -> DecideLoansBatchUseCase:
+    return DecideLoansBatchUseCase(
+        loans=DjangoLoanRepository(),
+        clients=DjangoClientRepository(),
+        audit=DjangoAuditRepository(),
+        clock=SystemClock(),
+        installments=scheduler,
+    )
+
+
+def test_batch_decides_with_grouped_queries(django_assert_num_queries):
+    ana, luis, eva = _client("ana"), _client("luis"), _client("eva", is_delinquent=True)
+    indebted = _loan(luis, status=Loan.Status.APPROVED)
+    Installment.objects.create(loan=indebted, number=1, due_date=date(2026, 1, 1), amount=Decimal("94.56"))
+    balances.recompute_open_balances()
+    first, second, blocked, delinquent, rejected = _loan(ana), _loan(ana), _loan(luis), _loan(eva), _loan(eva)
+    missing = uuid4()
+    scheduler = RecordingScheduler()
+
+    decisions = [(first, True), (second, True), (blocked, True), (delinquent, True), (rejected, False)]
+    command = DecideLoansBatchCommand(
+        decisions=tuple(DecideLoanCommand(loan_id=loan.id, approve=approve) for loan, approve in decisions)
+        + (DecideLoanCommand(loan_id=missing, approve=True),)
+    )
+    with django_assert_num_queries(6):
+        outcomes = _use_case(scheduler).execute(Actor(user_id=None, role="ANALYST"), command)
+
+    assert [(o.status, o.error) for o in outcomes] == [
+        ("approved", None),
+        (None, "Cliente con deuda activa"),
+        (None, "Cliente con deuda activa"),
+        (None, "Cliente moroso"),
+        ("rejected", None),
+        (None, "Préstamo no encontrado"),
+    ]
+    assert Loan.objects.get(id=first.id).status == Loan.Status.APPROVED
+    assert Loan.objects.get(id=rejected.id).status == Loan.Status.REJECTED
+    assert Loan.objects.get(id=second.id).status == Loan.Status.PENDING
+    assert AuditLog.objects.filter(action__in=["loan.approved", "loan.rejected"]).count() == 2
+    assert scheduler.approved == [[first.id]]
+
+
+def test_batch_requires_staff_role():
+    with pytest.raises(Forbidden):
+        _use_case().execute(Actor(user_id=None, role="CLIENT"), DecideLoansBatchCommand(decisions=()))
@@ -0,0 +1,58 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.analytics import snapshot
+from infrastructure.django_apps.loans.installments import (
+    approved_loans_without_installments,
+    generate_installments,
+)
+from infrastructure.django_apps.loans.models import Installment, Loan
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profile():
+    user = User.objects.create(username="ana", role=User.Role.CLIENT)
+    return ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("5000.00"))
+
+
+def _loan(profile, status=Loan.Status.APPROVED, term=12) -> Loan:
+    return Loan.objects.create(
+        client_profile=profile,
+        principal_amount=Decimal("1000.00"),
+        monthly_rate=Decimal("0.020000"),
+        term_months=term,
+        status=status,
+    )
+
+
+def test_generates_full_schedule_once(profile, django_capture_on_commit_callbacks):
+    loan = _loan(profile)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first = generate_installments([str(loan.id)], date(2026, 1, 15))
+        retry = generate_installments([str(loan.id)], date(2026, 1, 15))
+
+    installments = list(loan.installments.order_by("number"))
+    assert first == {"loans": 1, "skipped": 0, "installments": 12}
+    assert retry == {"loans": 0, "skipped": 1, "installments": 0}
+    assert [i.due_date for i in installments[:2]] == [date(2026, 2, 15), date(2026, 3, 15)]
+    assert sum(i.amount for i in installments) == Decimal("94.56") * 11 + installments[-1].amount
+    assert snapshot.stored_counters()[(snapshot.INSTALLMENTS_BY_STATUS, Installment.Status.PENDING)][0] == 12
+
+
+def test_batch_inserts_only_approved_loans(profile, django_assert_max_num_queries):
+    approved = [_loan(profile, term=term) for term in (6, 12, 24)]
+    pending = _loan(profile, status=Loan.Status.PENDING)
+
+    with django_assert_max_num_queries(6):
+        result = generate_installments([str(loan.id) for loan in approved + [pending]])
+
+    assert result == {"loans": 3, "skipped": 0, "installments": 42}
+    assert not pending.installments.exists()
+    assert approved_loans_without_installments() == []
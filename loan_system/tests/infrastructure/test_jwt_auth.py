@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from infrastructure.django_apps.accounts.models import User
+from infrastructure.security import jwt_auth
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def no_ratelimit(settings):
+    settings.RATELIMIT_ENABLE = False
+
+
+@pytest.fixture
+def shared_cache(monkeypatch, settings):
+    # LocMem hace de caché compartida (un solo proceso en los tests).
+    settings.DEBUG = False
+    monkeypatch.setattr(jwt_auth, "is_process_local", lambda alias: False)
+
+
+@pytest.fixture
+def analyst():
+    user = User.objects.create(username="ana", role=User.Role.ANALYST)
+    user.set_password("secreta123")
+    user.save()
+    return user
+
+
+def _login(analyst) -> APIClient:
+    response = APIClient().post("/api/auth/token/", {"username": "ana", "password": "secreta123"})
+    assert response.status_code == 200
+    assert AccessToken(response.data["access"])["role"] == "ANALYST"
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    return client
+
+
+def _user_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post(url, {"principal_amount": "1200.00", "currency": "USD", "monthly_rate": "0.015", "term_months": 12})
+    return response, [q["sql"] for q in ctx.captured_queries if "accounts_user" in q["sql"]]
+
+
+def test_authenticated_request_does_not_read_the_user(analyst, shared_cache):
+    client = _login(analyst)
+
+    response, queries = _user_queries(client, "/api/loans/quote/")
+
+    assert response.status_code == 200
+    assert queries == []
+
+
+def test_role_change_and_deactivation_invalidate_the_token(analyst, shared_cache):
+    client = _login(analyst)
+
+    analyst.role = User.Role.CLIENT
+    analyst.save(update_fields=["role"])
+    response, _ = _user_queries(client, "/api/loans/quote/")
+    assert response.status_code == 401
+
+    analyst.role = User.Role.ANALYST
+    analyst.is_active = False
+    analyst.save()
+    response, _ = _user_queries(client, "/api/loans/quote/")
+    assert response.status_code == 401
+
+
+def test_token_without_role_claim_falls_back_to_the_database(analyst):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(analyst).access_token}")
+
+    response, queries = _user_queries(client, "/api/loans/quote/")
+
+    assert response.status_code == 200
+    assert len(queries) == 1
+
+
+def test_process_local_cache_checks_the_user_on_every_request(analyst, settings):
+    settings.DEBUG = False
+    client = _login(analyst)
+    # Otro worker desactiva al usuario: la señal no limpia la caché de este proceso.
+    jwt_auth._cache().set(jwt_auth._key(analyst.pk), ("ANALYST", True))
+    User.objects.filter(pk=analyst.pk).update(is_active=False)
+
+    response, queries = _user_queries(client, "/api/loans/quote/")
+
+    assert response.status_code == 401
+    assert len(queries) == 1
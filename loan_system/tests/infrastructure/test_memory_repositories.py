@@ -0,0 +1,121 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from application.exceptions import Conflict, NotFound
+from application.ports import Actor
+from application.use_cases import (
+    CreateLoanCommand,
+    CreateLoanUseCase,
+    DecideLoanCommand,
+    DecideLoanUseCase,
+    RegisterPaymentCommand,
+    RegisterPaymentUseCase,
+)
+from domain.entities import Client, ClientStatus, InstallmentStatus, LoanStatus
+from domain.exceptions import BusinessRuleViolation
+from domain.value_objects import Money
+from infrastructure.repositories.memory_repositories import (
+    FixedClock,
+    InMemoryAuditRepository,
+    InMemoryClientRepository,
+    InMemoryDashboardProjection,
+    InMemoryInstallmentRepository,
+    InMemoryInstallmentScheduler,
+    InMemoryLoanRepository,
+    InMemoryPaymentRepository,
+    InMemoryStore,
+)
+
+
+ACTOR = Actor(user_id=uuid4(), role="ANALYST")
+CLOCK = FixedClock(datetime(2026, 1, 10, tzinfo=timezone.utc))
+
+
+@pytest.fixture
+def store():
+    store = InMemoryStore()
+    store.add_client(
+        Client(
+            id=uuid4(),
+            name="ana",
+            email="ana@example.com",
+            status=ClientStatus.ACTIVE,
+            is_delinquent=False,
+            payment_capacity_monthly=Money(Decimal("5000.00"), "USD"),
+        )
+    )
+    return store
+
+
+def _create(store, principal="1200.00"):
+    client_id = next(iter(store.clients))
+    uc = CreateLoanUseCase(
+        loans=InMemoryLoanRepository(store),
+        clients=InMemoryClientRepository(store),
+        audit=InMemoryAuditRepository(store),
+        clock=CLOCK,
+    )
+    return uc.execute(ACTOR, CreateLoanCommand(client_id, Decimal(principal), "USD", Decimal("0.01"), 12)).loan_id
+
+
+def _decide(store, loan_id, analytics=None):
+    DecideLoanUseCase(
+        loans=InMemoryLoanRepository(store),
+        clients=InMemoryClientRepository(store),
+        audit=InMemoryAuditRepository(store),
+        clock=CLOCK,
+        analytics=analytics,
+        installments=InMemoryInstallmentScheduler(store),
+    ).execute(ACTOR, DecideLoanCommand(loan_id=loan_id, approve=True))
+
+
+def _pay(store, installment, reference):
+    uc = RegisterPaymentUseCase(
+        installments=InMemoryInstallmentRepository(store),
+        payments=InMemoryPaymentRepository(store),
+        audit=InMemoryAuditRepository(store),
+        clock=CLOCK,
+    )
+    return uc.execute(
+        ACTOR, RegisterPaymentCommand(installment.id, reference, installment.amount.amount, installment.amount.currency)
+    )
+
+
+def test_loan_lifecycle_runs_on_memory_repositories(store):
+    analytics = InMemoryDashboardProjection()
+    loan_id = _create(store)
+    _decide(store, loan_id, analytics)
+
+    assert store.loans[loan_id].status == LoanStatus.APPROVED
+    assert analytics.loans_by_status[LoanStatus.APPROVED] == 1
+    schedule = InMemoryInstallmentRepository(store).list_by_loan(loan_id)
+    assert [i.number for i in schedule] == list(range(1, 13))
+    assert store.open_installments[store.loans[loan_id].client_id] == 12
+
+    # El préstamo aprobado es deuda activa: otra aprobación del mismo cliente se rechaza.
+    with pytest.raises(BusinessRuleViolation, match="deuda activa"):
+        _decide(store, _create(store))
+
+    _pay(store, schedule[0], "REF-1")
+    assert store.installments[schedule[0].id].status == InstallmentStatus.PAID
+    assert store.open_installments[store.loans[loan_id].client_id] == 11
+    assert [e.action for e in store.audit] == ["loan.created", "loan.approved", "loan.created", "payment.registered"]
+
+    with pytest.raises(Conflict, match="Pago duplicado"):
+        _pay(store, schedule[1], "REF-1")
+
+
+def test_reads_are_copies_and_missing_ids_raise(store):
+    loan_id = _create(store)
+    repo = InMemoryLoanRepository(store)
+
+    repo.get(loan_id).approve()
+    assert store.loans[loan_id].status == LoanStatus.PENDING
+
+    with pytest.raises(NotFound):
+        repo.get(uuid4())
+    with pytest.raises(NotFound):
+        InMemoryInstallmentRepository(store).get(uuid4())
@@ -0,0 +1,102 @@
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from application.ports import Actor
+from application.use_cases import RegisterPaymentCommand, RegisterPaymentUseCase
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.loans import balances
+from infrastructure.django_apps.loans.installments import generate_installments
+from infrastructure.django_apps.loans.models import Installment, Loan
+from infrastructure.repositories.clock import SystemClock
+from infrastructure.repositories.django_repositories import (
+    DjangoAuditRepository,
+    DjangoClientRepository,
+    DjangoInstallmentRepository,
+    DjangoPaymentRepository,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profile():
+    user = User.objects.create(username="ana", role=User.Role.CLIENT)
+    return ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("5000.00"))
+
+
+def _approved_loan(profile, term=3) -> Loan:
+    loan = Loan.objects.create(
+        client_profile=profile,
+        principal_amount=Decimal("300.00"),
+        monthly_rate=Decimal("0.010000"),
+        term_months=term,
+        status=Loan.Status.APPROVED,
+    )
+    generate_installments([str(loan.id)], date(2026, 1, 1))
+    return loan
+
+
+def _counters(obj):
+    obj.refresh_from_db(fields=["open_installments", "open_balance"])
+    return obj.open_installments, obj.open_balance
+
+
+def _pay(installment: Installment, reference: str) -> None:
+    RegisterPaymentUseCase(
+        installments=DjangoInstallmentRepository(),
+        payments=DjangoPaymentRepository(),
+        audit=DjangoAuditRepository(),
+        clock=SystemClock(),
+    ).execute(
+        Actor(user_id=None, role="ANALYST"),
+        RegisterPaymentCommand(
+            installment_id=installment.id, reference=reference, amount=installment.amount, currency="USD"
+        ),
+    )
+
+
+def test_counters_follow_generation_and_payments(profile, django_assert_num_queries):
+    loan = _approved_loan(profile)
+    other = _approved_loan(profile, term=2)
+    schedule = list(loan.installments.order_by("number"))
+    total = sum(i.amount for i in schedule)
+
+    assert _counters(loan) == (3, total)
+    assert _counters(profile)[0] == 5
+
+    _pay(schedule[0], "REF-1")
+
+    assert _counters(loan) == (2, total - schedule[0].amount)
+    assert _counters(other)[0] == 2
+    assert _counters(profile)[0] == 4
+    with django_assert_num_queries(1):
+        assert DjangoClientRepository().has_active_debt(profile.id)
+
+
+def test_client_without_open_installments_has_no_debt(profile):
+    loan = _approved_loan(profile, term=1)
+    _pay(loan.installments.get(), "REF-1")
+
+    assert _counters(profile) == (0, Decimal("0.00"))
+    assert not DjangoClientRepository().has_active_debt(profile.id)
+    assert DjangoClientRepository().with_active_debt([profile.id, uuid4()]) == set()
+
+
+def test_reconcile_reports_and_fixes_drift(profile):
+    loan = _approved_loan(profile)
+    assert balances.reconcile_open_balances()["loans"] == 0
+
+    Installment.objects.filter(loan=loan, number=1).update(status=Installment.Status.PAID)
+    report = balances.reconcile_open_balances()
+
+    assert (report["loans"], report["clients"]) == (1, 1)
+    assert report["loans_sample"][0]["expected_installments"] == 2
+
+    balances.reconcile_open_balances(fix=True)
+    report = balances.reconcile_open_balances()
+    assert (report["loans"], report["clients"]) == (0, 0)
+    assert _counters(profile)[0] == 2
@@ -0,0 +1,108 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.analytics import snapshot
+from infrastructure.django_apps.analytics.models import DashboardCounter
+from infrastructure.django_apps.audit.models import AuditLog
+from infrastructure.django_apps.loans.installments import generate_installments
+from infrastructure.django_apps.loans.models import Installment, Loan
+from infrastructure.django_apps.loans.overdue import sweep_overdue_installments
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def portfolio():
+    loans = []
+    for name in ("ana", "luis", "eva"):
+        user = User.objects.create(username=name, role=User.Role.CLIENT)
+        profile = ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("5000.00"))
+        loans.append(
+            Loan.objects.create(
+                client_profile=profile,
+                principal_amount=Decimal("1200.00"),
+                monthly_rate=Decimal("0.010000"),
+                term_months=12,
+                status=Loan.Status.APPROVED,
+            )
+        )
+    # Cuotas 1..3 de ana y luis vencen antes del 2026-04-15; el plan de eva empieza después.
+    generate_installments([str(loans[0].id), str(loans[1].id)], date(2026, 1, 1))
+    generate_installments([str(loans[2].id)], date(2026, 6, 1))
+    Installment.objects.filter(loan=loans[1], number=1).update(status=Installment.Status.PAID)
+    snapshot.rebuild_snapshot()
+    return loans
+
+
+def _counter(metric, bucket=""):
+    return DashboardCounter.objects.get(metric=metric, bucket=bucket).count
+
+
+def test_sweep_marks_overdue_in_chunks(portfolio, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        result = sweep_overdue_installments(date(2026, 4, 15), chunk_size=2)
+
+    assert result == {"installments": 5, "clients": 2, "batches": 3}
+    late = Installment.objects.filter(status=Installment.Status.LATE)
+    assert sorted(late.values_list("loan__client_profile__user__username", "number")) == [
+        ("ana", 1), ("ana", 2), ("ana", 3), ("luis", 2), ("luis", 3),
+    ]
+    assert list(
+        ClientProfile.objects.order_by("user__username").values_list("user__username", "is_delinquent")
+    ) == [("ana", True), ("eva", False), ("luis", True)]
+
+    events = AuditLog.objects.filter(action="installments.marked_late")
+    assert sorted(event.after["installments"] for event in events) == [1, 2, 2]
+    assert sum(len(event.meta["client_ids"]) for event in events) == 2
+
+    assert _counter(snapshot.INSTALLMENTS_BY_STATUS, Installment.Status.LATE) == 5
+    assert _counter(snapshot.CLIENTS_DELINQUENT) == 2
+    assert not snapshot.diff_counters(snapshot.compute_counters(), snapshot.stored_counters())
+
+    # Pasar a `late` no cierra la cuota: los saldos abiertos no cambian.
+    assert Loan.objects.get(pk=portfolio[0].pk).open_installments == 12
+
+
+def test_sweep_is_idempotent(portfolio):
+    sweep_overdue_installments(date(2026, 4, 15))
+
+    assert sweep_overdue_installments(date(2026, 4, 15)) == {"installments": 0, "clients": 0, "batches": 0}
+
+
+def test_sweep_uses_constant_statements_per_chunk(portfolio, django_assert_num_queries):
+    # SELECT vencidas, UPDATE cuotas, SELECT y UPDATE clientes, INSERT auditoría y SELECT final
+    # vacío; dentro del test cada bloque suma SAVEPOINT/RELEASE.
+    with django_assert_num_queries(10):
+        sweep_overdue_installments(date(2026, 4, 15))
+
+
+def test_snapshot_serves_overdue_from_the_late_counter(
+    portfolio, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    # Contadores, top de clientes y sus usernames; ninguna consulta recorre las cuotas.
+    with django_assert_num_queries(3) as queries:
+        assert snapshot.dashboard_from_snapshot()["totals"]["overdue_installments"] == 0
+    assert not [query for query in queries.captured_queries if Installment._meta.db_table in query["sql"]]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        sweep_overdue_installments(date(2026, 4, 15))
+
+    assert snapshot.dashboard_from_snapshot()["totals"]["overdue_installments"] == 5
+
+
+def test_live_and_snapshot_dashboards_agree_on_overdue(portfolio, django_capture_on_commit_callbacks):
+    def overdue():
+        return (
+            snapshot.dashboard_from_snapshot()["totals"]["overdue_installments"],
+            snapshot.dashboard_live()["totals"]["overdue_installments"],
+        )
+
+    # Antes del barrido hay cuotas pendientes vencidas, pero ninguna `late` en ningún camino.
+    assert overdue() == (0, 0)
+    with django_capture_on_commit_callbacks(execute=True):
+        sweep_overdue_installments(date(2026, 4, 15))
+    assert overdue() == (5, 5)
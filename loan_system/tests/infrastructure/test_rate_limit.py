@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+
+import pytest
+from rest_framework.test import APIClient
+
+from infrastructure.security import rate_limit
+from infrastructure.security.rate_limit import RateLimiter, SQLiteStore, parse_rate
+
+
+NOW = 1_800_000_000.0
+
+
+def _allowed(limiters, limit, hits, now=NOW):
+    return sum(not limiters[i % len(limiters)].hit("k", limit, 60, now=now).limited for i in range(hits))
+
+
+def test_parse_rate():
+    assert parse_rate("10/m") == (10, 60)
+    assert parse_rate("100/5m") == (100, 300)
+
+
+def test_workers_share_the_sqlite_counter(tmp_path):
+    path = str(tmp_path / "rl.sqlite3")
+    # Dos limitadores sobre el mismo archivo = dos workers.
+    workers = [RateLimiter(SQLiteStore(path)), RateLimiter(SQLiteStore(path))]
+
+    # Límite bajo: bloques de 1, cuenta exacta.
+    assert _allowed(workers, 10, 30) == 10
+
+    # Límite alto: bloques de 5 por proceso; nunca se pasa del límite y pierde a lo sumo un bloque.
+    other = [RateLimiter(SQLiteStore(path)), RateLimiter(SQLiteStore(path))]
+    allowed = sum(not other[i % 2].hit("alto", 100, 60, now=NOW).limited for i in range(150))
+    assert 96 <= allowed <= 100
+
+    # La ventana siguiente empieza de cero.
+    assert _allowed(workers, 10, 10, now=NOW + 60) == 10
+
+
+def test_exhausted_window_does_not_hit_the_store():
+    class CountingStore:
+        calls = 0
+
+        def reserve(self, key, window, amount, ttl):
+            self.calls += 1
+            self.total = getattr(self, "total", 0) + amount
+            return self.total
+
+    store = CountingStore()
+    limiter = RateLimiter(store, lease_divisor=10)
+
+    usages = [limiter.hit("k", 50, 60, now=NOW) for _ in range(200)]
+
+    assert sum(not u.limited for u in usages) == 50
+    assert store.calls == 10
+    assert usages[0].remaining == 49 and usages[-1].remaining == 0
+
+
+@pytest.mark.django_db
+def test_endpoint_reports_quota_and_throttles(monkeypatch, settings):
+    settings.RATELIMIT_BACKEND = "local"
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    # Reloj fijo: las 11 llamadas caen en la misma ventana aunque el test cruce un cambio de minuto.
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: NOW + 1))
+    client = APIClient()
+
+    responses = [client.post("/api/auth/token/", {"username": "x", "password": "y"}) for _ in range(11)]
+
+    assert responses[0]["X-RateLimit-Limit"] == "10"
+    assert [r["X-RateLimit-Remaining"] for r in responses[:2]] == ["9", "8"]
+    assert responses[9].status_code == 401
+    assert responses[10].status_code == 429
+    assert responses[10]["X-RateLimit-Remaining"] == "0"
+    assert int(responses[10]["Retry-After"]) >= 1
+
+
+@pytest.mark.django_db
+def test_store_failure_lets_requests_through_unless_fail_closed(monkeypatch, settings):
+    class BrokenLimiter:
+        def hit(self, *args, **kwargs):
+            raise OSError("database is locked")
+
+    monkeypatch.setattr(rate_limit, "get_limiter", lambda: BrokenLimiter())
+    login = {"username": "x", "password": "y"}
+
+    response = APIClient().post("/api/auth/token/", login)
+    assert response.status_code == 401
+    assert "X-RateLimit-Limit" not in response
+
+    settings.RATELIMIT_FAIL_OPEN = False
+    assert APIClient().post("/api/auth/token/", login).status_code == 429
@@ -0,0 +1,103 @@
+import io
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from django.core.management import call_command
+
+from domain.amortization import amortization_schedule, outstanding_balance
+from domain.value_objects import Money, Rate
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.audit.models import AuditLog
+from infrastructure.django_apps.loans import balances
+from infrastructure.django_apps.loans.installments import generate_installments
+from infrastructure.django_apps.loans.models import Installment, Loan
+from infrastructure.django_apps.loans.repricing import RepriceOptions, id_ranges, reprice_loans
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def loans():
+    user = User.objects.create(username="ana", role=User.Role.CLIENT)
+    profile = ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("50000.00"))
+    loans = [
+        Loan.objects.create(
+            client_profile=profile,
+            principal_amount=Decimal("1000.00"),
+            monthly_rate=Decimal(rate),
+            term_months=12,
+            status=Loan.Status.APPROVED,
+        )
+        for rate in ("0.020000", "0.020000", "0.020000", "0.030000")
+    ]
+    generate_installments([str(loan.id) for loan in loans], date(2026, 1, 1))
+    Installment.objects.filter(loan__in=loans, number__lte=3).update(status=Installment.Status.PAID)
+    balances.recompute_open_balances()
+    return loans
+
+
+def _open_amounts(loan):
+    return list(
+        loan.installments.filter(status__in=Installment.OPEN_STATUSES).order_by("number").values_list("amount", flat=True)
+    )
+
+
+def test_new_rate_reprices_open_installments_in_chunks(loans):
+    before = {loan.id: _open_amounts(loan) for loan in loans}
+
+    result = reprice_loans(RepriceOptions(new_rate=Decimal("0.010000"), current_rate=Decimal("0.02"), chunk_size=2))
+
+    assert (result["loans"], result["installments"], result["chunks"]) == (3, 27, 2)
+    original = amortization_schedule(Money(Decimal("1000.00")), Rate(Decimal("0.02")), 12, date(2026, 1, 1))
+    balance = outstanding_balance([row.payment for row in original[3:]], Rate(Decimal("0.02")))
+    expected = amortization_schedule(balance, Rate(Decimal("0.01")), 9, date(2026, 1, 1))
+    for loan in loans[:3]:
+        loan.refresh_from_db()
+        assert loan.monthly_rate == Decimal("0.010000")
+        assert _open_amounts(loan) == [row.payment.amount for row in expected]
+        assert loan.open_balance == sum(row.payment.amount for row in expected)
+    assert _open_amounts(loans[3]) == before[loans[3].id]
+    assert Installment.objects.filter(status=Installment.Status.PAID, amount=original[0].payment.amount).count() == 9
+    profile = ClientProfile.objects.get()
+    assert profile.open_balance == sum(sum(_open_amounts(loan)) for loan in loans)
+    assert AuditLog.objects.filter(action="loans.repriced").count() == 2
+
+    # Los préstamos re-tasados quedan fuera del alcance: repetir no los vuelve a tocar.
+    again = reprice_loans(RepriceOptions(new_rate=Decimal("0.010000"), current_rate=Decimal("0.02")))
+    assert (again["loans"], again["installments"], again["chunks"]) == (0, 0, 0)
+
+
+def test_dry_run_reports_diff_without_writing(loans):
+    result = reprice_loans(RepriceOptions(new_rate=Decimal("0.015000"), dry_run=True, sample=3))
+
+    assert result["loans"] == 4
+    assert len(result["changes"]) == 3
+    assert Decimal(result["delta"]) < 0
+    assert Loan.objects.filter(monthly_rate=Decimal("0.015000")).count() == 0
+    assert not AuditLog.objects.filter(action="loans.repriced").exists()
+
+
+def test_id_ranges_partition_the_portfolio(loans):
+    ranges = id_ranges(4)
+
+    assert ranges[0][0] is None and ranges[-1][1] is None
+    assert [hi for _, hi in ranges[:-1]] == [lo for lo, _ in ranges[1:]]
+    assert ranges[1][0] == UUID("40000000-0000-0000-0000-000000000000")
+    seen = sum(
+        reprice_loans(RepriceOptions(new_rate=Decimal("0.025000"), dry_run=True), lo=lo, hi=hi)["loans"]
+        for lo, hi in ranges
+    )
+    assert seen == 4
+
+
+def test_command_dry_run_prints_diff(loans):
+    out = io.StringIO()
+    call_command("recalc_interest", "--rate", "0.03", "--dry-run", "--sample", "2", stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert len([line for line in lines if " cuota " in line]) == 2
+    assert "3 préstamos, 27 cuotas" in lines[-1] and "dry-run" in lines[-1]
+    assert Loan.objects.filter(monthly_rate=Decimal("0.030000")).count() == 1
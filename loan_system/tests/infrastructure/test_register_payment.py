@@ -0,0 +1,88 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.db import transaction
+
+from application.exceptions import Conflict
+from application.ports import Actor
+from application.use_cases import RegisterPaymentCommand, RegisterPaymentUseCase
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.loans.installments import generate_installments
+from infrastructure.django_apps.loans.models import Installment, Loan, Payment
+from infrastructure.repositories.clock import SystemClock
+from infrastructure.repositories.django_repositories import (
+    DjangoAuditRepository,
+    DjangoInstallmentRepository,
+    DjangoPaymentRepository,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def schedule():
+    user = User.objects.create(username="ana", role=User.Role.CLIENT)
+    profile = ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("5000.00"))
+    loan = Loan.objects.create(
+        client_profile=profile,
+        principal_amount=Decimal("300.00"),
+        monthly_rate=Decimal("0.010000"),
+        term_months=3,
+        status=Loan.Status.APPROVED,
+    )
+    generate_installments([str(loan.id)], date(2026, 1, 1))
+    return list(loan.installments.order_by("number"))
+
+
+def _pay(installment: Installment, reference: str):
+    return RegisterPaymentUseCase(
+        installments=DjangoInstallmentRepository(),
+        payments=DjangoPaymentRepository(),
+        audit=DjangoAuditRepository(),
+        clock=SystemClock(),
+    ).execute(
+        Actor(user_id=None, role="ANALYST"),
+        RegisterPaymentCommand(
+            installment_id=installment.id, reference=reference, amount=installment.amount, currency="USD"
+        ),
+    )
+
+
+def test_payment_uses_five_statements_plus_audit(schedule, django_assert_num_queries):
+    # SELECT cuota, UPDATE condicional, saldo de préstamo y de cliente, INSERT pago, INSERT auditoría.
+    with django_assert_num_queries(6):
+        _pay(schedule[0], "REF-1")
+
+    schedule[0].refresh_from_db()
+    assert schedule[0].status == Installment.Status.PAID
+
+
+def test_duplicate_reference_rolls_back_installment(schedule):
+    _pay(schedule[0], "REF-1")
+
+    with pytest.raises(Conflict, match="Pago duplicado"):
+        with transaction.atomic():
+            _pay(schedule[1], "REF-1")
+
+    schedule[1].refresh_from_db()
+    assert schedule[1].status == Installment.Status.PENDING
+    assert schedule[1].loan.open_installments == 2
+    assert Payment.objects.count() == 1
+
+
+def test_paid_installment_is_rejected(schedule):
+    _pay(schedule[0], "REF-1")
+
+    with pytest.raises(Conflict, match="ya está pagada"):
+        _pay(schedule[0], "REF-2")
+
+
+def test_saved_payment_is_immutable(schedule):
+    _pay(schedule[0], "REF-1")
+    payment = Payment.objects.get()
+
+    payment.reference = "REF-X"
+    with pytest.raises(ValueError):
+        payment.save()
@@ -0,0 +1,125 @@
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from application.ports import Actor
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.audit.models import AuditLog
+from infrastructure.django_apps.loans.installments import generate_installments
+from infrastructure.django_apps.loans.models import Installment, Loan, Payment
+from infrastructure.django_apps.loans.payment_import import ingest_payments
+
+
+pytestmark = pytest.mark.django_db
+
+ACTOR = Actor(user_id=None, role="ANALYST")
+
+
+@pytest.fixture
+def schedule():
+    user = User.objects.create(username="ana", role=User.Role.CLIENT)
+    profile = ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("5000.00"))
+    loan = Loan.objects.create(
+        client_profile=profile,
+        principal_amount=Decimal("600.00"),
+        monthly_rate=Decimal("0.010000"),
+        term_months=6,
+        status=Loan.Status.APPROVED,
+    )
+    generate_installments([str(loan.id)], date(2026, 1, 1))
+    return list(loan.installments.order_by("number"))
+
+
+def _row(installment, reference, amount=None):
+    return {
+        "installment_id": str(installment.id),
+        "reference": reference,
+        "amount": str(amount or installment.amount),
+        "currency": "USD",
+    }
+
+
+def test_reports_each_row_and_keeps_counters(schedule, django_capture_on_commit_callbacks):
+    list(ingest_payments([_row(schedule[5], "OLD")], ACTOR))
+    rows = [
+        _row(schedule[0], "A"),
+        _row(schedule[1], "B"),
+        _row(schedule[2], "A"),  # referencia repetida en el lote
+        _row(schedule[3], "OLD"),  # referencia ya registrada
+        _row(schedule[0], "C"),  # cuota pagada por la fila 1
+        _row(schedule[4], "D", amount=Decimal("1.00")),
+        {"installment_id": str(uuid4()), "reference": "E", "amount": "10.00"},
+        {"installment_id": "x", "reference": "F", "amount": "10.00"},
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        report = list(ingest_payments(rows, ACTOR, chunk_size=3))
+
+    assert [r["line"] for r in report] == list(range(1, 9))
+    assert [r["status"] for r in report] == ["accepted", "accepted"] + ["rejected"] * 6
+    assert [r["error"] for r in report[2:]] == [
+        "Pago duplicado",
+        "Pago duplicado",
+        "La cuota ya está pagada",
+        "Monto inválido para la cuota",
+        "Cuota no encontrada",
+        "installment_id inválido",
+    ]
+    assert set(Payment.objects.values_list("reference", flat=True)) == {"A", "B", "OLD"}
+    assert AuditLog.objects.filter(action="payment.registered").count() == 3  # OLD, A y B
+
+    loan = Loan.objects.get(pk=schedule[0].loan_id)
+    assert loan.open_installments == 3
+    assert loan.open_balance == sum(i.amount for i in schedule[2:5])
+    assert loan.client_profile.open_installments == 3
+
+
+def test_chunk_statements_do_not_grow_with_rows(schedule, django_assert_max_num_queries):
+    rows = [_row(installment, f"R-{n}") for n, installment in enumerate(schedule)]
+
+    # Bloqueo de cuotas, referencias, UPDATE, saldo (préstamos, préstamo y cliente), INSERT pagos y auditoría.
+    with django_assert_max_num_queries(10):
+        report = list(ingest_payments(rows, ACTOR))
+
+    assert all(r["status"] == "accepted" for r in report)
+    assert Installment.objects.filter(status=Installment.Status.PAID).count() == 6
+
+
+def test_bulk_endpoint_returns_per_row_results(schedule):
+    api = APIClient()
+    api.force_authenticate(User.objects.create(username="analyst", role=User.Role.ANALYST))
+
+    response = api.post(
+        "/api/payments/bulk/",
+        {"payments": [_row(schedule[0], "A"), _row(schedule[0], "B")]},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["accepted"], body["rejected"]) == (1, 1)
+    assert body["results"][1]["error"] == "La cuota ya está pagada"
+
+
+def test_import_command_streams_csv_and_writes_report(schedule, tmp_path):
+    source = tmp_path / "banco.csv"
+    lines = ["installment_id,reference,amount,currency"]
+    lines += [f"{i.id},CSV-{i.number},{i.amount},USD" for i in schedule[:3]]
+    lines.append(f"{schedule[3].id},CSV-X,abc,USD")
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    report_path = tmp_path / "reporte.ndjson"
+
+    out = io.StringIO()
+    call_command("import_payments", str(source), "--chunk-size", "2", "--report", str(report_path), stdout=out)
+
+    assert "3 pagos registrados, 1 rechazados" in out.getvalue()
+    report = [json.loads(line) for line in report_path.read_text(encoding="utf-8").splitlines()]
+    assert [r["status"] for r in report] == ["accepted"] * 3 + ["rejected"]
+    assert report[3]["error"] == "amount inválido"
+    assert Payment.objects.count() == 3
@@ -0,0 +1,112 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.loans.installments import generate_installments
+from infrastructure.django_apps.loans.models import Loan
+from infrastructure.django_apps.loans.overdue import sweep_overdue_installments
+from application.exceptions import Conflict
+from application.ports import Actor
+from application.use_cases import DecideLoanCommand, DecideLoanUseCase
+from infrastructure.django_apps.analytics import snapshot
+from infrastructure.repositories.clock import SystemClock
+from infrastructure.repositories.django_repositories import (
+    DjangoAuditRepository,
+    DjangoDashboardProjection,
+    client_repository,
+    loan_repository,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def shared_cache(settings):
+    settings.REPOSITORY_CACHE_TTL = 60
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def profile():
+    user = User.objects.create(username="ana", role=User.Role.CLIENT)
+    profile = ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("5000.00"))
+    loan = Loan.objects.create(
+        client_profile=profile,
+        principal_amount=Decimal("300.00"),
+        monthly_rate=Decimal("0.010000"),
+        term_months=3,
+        status=Loan.Status.APPROVED,
+    )
+    generate_installments([str(loan.id)], date(2026, 1, 1))
+    return profile
+
+
+def test_client_is_served_from_shared_cache_across_requests(shared_cache, profile, django_assert_num_queries):
+    client_repository().get(profile.id)
+
+    with django_assert_num_queries(0):
+        client = client_repository().get(profile.id)
+
+    assert client.name == "ana"
+
+
+def test_bulk_delinquency_update_invalidates_cached_clients(shared_cache, profile, django_capture_on_commit_callbacks):
+    assert client_repository().get(profile.id).is_delinquent is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        sweep_overdue_installments(date(2026, 3, 1))
+
+    assert client_repository().get(profile.id).is_delinquent is True
+
+
+def test_admin_edit_of_client_profile_invalidates_cached_client(shared_cache, profile):
+    assert client_repository().get(profile.id).is_delinquent is False
+
+    edited = ClientProfile.objects.get(pk=profile.pk)
+    edited.is_delinquent = True
+    edited.save()
+    profile.user.first_name = "Ana María"
+    profile.user.save(update_fields=["first_name"])
+
+    client = client_repository().get(profile.id)
+    assert (client.is_delinquent, client.name) == (True, "Ana María")
+
+
+def test_stale_cached_loan_cannot_be_decided_twice(shared_cache, profile, django_capture_on_commit_callbacks):
+    loan = Loan.objects.create(
+        client_profile=profile,
+        principal_amount=Decimal("200.00"),
+        monthly_rate=Decimal("0.010000"),
+        term_months=3,
+    )
+    snapshot.rebuild_snapshot()
+    stale = loan_repository().get(loan.id)
+
+    def reject():
+        DecideLoanUseCase(
+            loans=loan_repository(),
+            clients=client_repository(),
+            audit=DjangoAuditRepository(),
+            clock=SystemClock(),
+            analytics=DjangoDashboardProjection(),
+        ).execute(Actor(user_id=None, role="ANALYST"), DecideLoanCommand(loan_id=loan.id, approve=False))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        reject()
+    # Un lector concurrente vuelve a cachear la versión PENDING después de la invalidación.
+    cache.set(f"repo:loan:{loan.id}", stale, 60)
+
+    with pytest.raises(Conflict):
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                reject()
+
+    assert Loan.objects.get(pk=loan.pk).status == Loan.Status.REJECTED
+    assert snapshot.diff_counters(snapshot.compute_counters(), snapshot.stored_counters()) == []
@@ -0,0 +1,85 @@
+import json
+import logging
+
+import pytest
+from rest_framework.test import APIClient
+
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.security.request_metrics import registry
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(tmp_path, settings):
+    settings.METRICS_DIR = str(tmp_path)
+    settings.REQUEST_SLOW_MS = 60_000
+    registry.reset()
+    yield tmp_path
+    registry.reset()
+
+
+def _client(role):
+    client = APIClient()
+    client.force_authenticate(User.objects.create(username=role.lower(), role=role))
+    return client
+
+
+def _series(name, route):
+    return {
+        labels: values
+        for (metric, labels), values in registry._series.items()
+        if metric == name and labels[0] == route
+    }
+
+
+def test_request_is_measured_and_logged_with_its_request_id(caplog):
+    api = _client(User.Role.ANALYST)
+    with caplog.at_level(logging.INFO, logger="infrastructure.security.request_metrics"):
+        response = api.get("/api/loans/", HTTP_X_REQUEST_ID="req-1")
+
+    assert response.status_code == 200
+    [(labels, queries)] = _series("http_request_db_queries", "loan_create").items()
+    assert labels == ("loan_create", "GET", "200")
+    assert queries[-1] == 1 and queries[-2] >= 1
+    [(_, size)] = _series("http_response_size_bytes", "loan_create").items()
+    assert size[-2] == len(response.content)
+
+    [record] = [r for r in caplog.records if r.getMessage() == "request"]
+    assert record.request_id == "req-1"
+    assert (record.route, record.status, record.response_bytes) == ("loan_create", 200, len(response.content))
+
+
+def test_streaming_response_is_recorded_when_closed():
+    ClientProfile.objects.create(user=User.objects.create(username="ana", role=User.Role.CLIENT))
+    api = _client(User.Role.ANALYST)
+
+    response = api.get("/api/clients/?stream=ndjson")
+    assert not _series("http_response_size_bytes", "clients_list")
+    body = b"".join(response.streaming_content)
+    response.close()
+
+    [(_, size)] = _series("http_response_size_bytes", "clients_list").items()
+    assert size[-2] == len(body) and size[-1] == 1
+
+
+def test_endpoint_sums_every_worker_and_is_admin_only(metrics_dir):
+    other = {
+        "pid": 1,
+        "series": [["http_request_db_queries", ["loan_create", "GET", "200"], [0, 0, 3, 0, 0, 0, 0, 0, 0, 0, 6, 3]]],
+        "cache": {"loan": {"hits": 4, "shared_hits": 0, "misses": 1}},
+    }
+    (metrics_dir / "worker-1.json").write_text(json.dumps(other))
+    _client(User.Role.ANALYST).get("/api/loans/")
+
+    assert _client(User.Role.CLIENT).get("/api/metrics/").status_code == 403
+    response = _client(User.Role.ADMIN).get("/api/metrics/")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.content.decode()
+    assert "# TYPE http_request_db_queries histogram" in text
+    assert 'http_request_db_queries_count{route="loan_create",method="GET",status="200"} 4' in text
+    assert 'http_request_db_queries_bucket{route="loan_create",method="GET",status="200",le="+Inf"} 4' in text
+    assert 'repository_cache_lookups_total{repository="loan",outcome="hits"} 4' in text
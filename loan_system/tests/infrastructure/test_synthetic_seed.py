@@ -0,0 +1,78 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.loans.models import Installment, Loan, Payment
+from infrastructure.django_apps.loans.synthetic import SeedOptions, generate
+
+
+pytestmark = pytest.mark.django_db
+
+TODAY = date(2026, 6, 1)
+
+
+def _seed(**kwargs):
+    totals = None
+    for totals in generate(SeedOptions(clients=30, seed=7, today=TODAY, batch_size=8, **kwargs)):
+        pass
+    return totals
+
+
+def _open_counters(owner):
+    # Suma en Python: en SQLite el SUM de decimales se hace en coma flotante.
+    totals = {}
+    for key, amount in Installment.objects.filter(status__in=Installment.OPEN_STATUSES).values_list(owner, "amount"):
+        count, balance = totals.get(key, (0, Decimal("0.00")))
+        totals[key] = (count + 1, balance + amount)
+    return totals
+
+
+def _snapshot():
+    return (
+        sorted(Loan.objects.values_list("id", "principal_amount", "status", "created_at")),
+        sorted(Installment.objects.values_list("id", "due_date", "amount", "status")),
+        sorted(Payment.objects.values_list("reference", "paid_at")),
+    )
+
+
+def test_seed_is_consistent_with_denormalized_counters():
+    totals = _seed()
+
+    assert (totals.clients, totals.skipped) == (30, 0)
+    assert User.objects.filter(username__startswith="scale").count() == 30
+    assert Loan.objects.count() == totals.loans
+    assert Installment.objects.count() == totals.installments
+    # Un pago por cuota pagada, y las cuotas vencidas nunca quedan pendientes.
+    assert Payment.objects.count() == Installment.objects.filter(status=Installment.Status.PAID).count()
+    assert not Installment.objects.filter(status=Installment.Status.PENDING, due_date__lt=TODAY).exists()
+    assert not Installment.objects.exclude(loan__status=Loan.Status.APPROVED).exists()
+    assert _open_counters("loan_id") == {
+        loan.id: (loan.open_installments, loan.open_balance) for loan in Loan.objects.filter(open_installments__gt=0)
+    }
+    assert _open_counters("loan__client_profile_id") == {
+        p.id: (p.open_installments, p.open_balance) for p in ClientProfile.objects.filter(open_installments__gt=0)
+    }
+    delinquent = set(
+        Installment.objects.filter(status=Installment.Status.LATE).values_list("loan__client_profile_id", flat=True)
+    )
+    assert set(ClientProfile.objects.filter(is_delinquent=True).values_list("id", flat=True)) == delinquent
+    # Una sola contraseña (un único hash compartido) que sigue siendo válida.
+    assert User.objects.get(username="scale1").check_password("cliente123")
+    assert User.objects.values("password").distinct().count() == 1
+
+
+def test_same_seed_yields_same_rows_and_reruns_skip_existing():
+    _seed()
+    first = _snapshot()
+    assert _seed().skipped == 30
+
+    Payment.objects.all().delete()
+    Installment.objects.all().delete()
+    Loan.objects.all().delete()
+    ClientProfile.objects.all().delete()
+    User.objects.all().delete()
+    _seed()
+
+    assert _snapshot() == first
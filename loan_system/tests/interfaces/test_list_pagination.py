@@ -0,0 +1,71 @@
+import json
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+
+from infrastructure.django_apps.accounts.models import ClientProfile, User
+from infrastructure.django_apps.loans.models import Loan
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api():
+    client = APIClient()
+    client.force_authenticate(User.objects.create(username="analyst", role=User.Role.ANALYST))
+    return client
+
+
+@pytest.fixture
+def loans():
+    profiles = []
+    for name in ["carla", "ana", "eva", "beto", "dani"]:
+        user = User.objects.create(username=name, role=User.Role.CLIENT)
+        profiles.append(ClientProfile.objects.create(user=user))
+    return [
+        Loan.objects.create(
+            client_profile=profile,
+            principal_amount=Decimal("100.00"),
+            monthly_rate=Decimal("0.010000"),
+            term_months=6,
+        )
+        for profile in profiles
+    ]
+
+
+def _walk(api, url, limit):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        body = api.get(url, params).json()
+        seen.extend(body["results"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+def test_loans_keyset_pages_cover_table_newest_first(api, loans):
+    rows = _walk(api, "/api/loans/", limit=2)
+
+    expected = Loan.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+    assert [row["loan_id"] for row in rows] == [str(loan_id) for loan_id in expected]
+
+
+def test_clients_keyset_pages_follow_username_order(api, loans):
+    rows = _walk(api, "/api/clients/", limit=2)
+
+    assert [row["name"] for row in rows] == ["ana", "beto", "carla", "dani", "eva"]
+
+
+def test_loans_ndjson_stream_exports_every_row(api, loans):
+    response = api.get("/api/loans/", {"stream": "ndjson"})
+
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert {json.loads(line)["loan_id"] for line in lines} == {str(loan.id) for loan in loans}
+
+
+def test_invalid_cursor_is_rejected(api):
+    assert api.get("/api/loans/", {"cursor": "no-es-un-cursor"}).status_code == 400
@@ -0,0 +1,92 @@
+import pytest
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router, transaction
+from rest_framework import serializers
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from infrastructure.config import db_router
+from infrastructure.django_apps.accounts.models import User
+from interfaces.api.transactions import TransactionRoutedAPIView
+
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class ProbeView(TransactionRoutedAPIView):
+    permission_classes = [AllowAny]
+    replica_methods = frozenset({"GET"})
+
+    def get(self, request):
+        return Response({"reads": router.db_for_read(User)})
+
+    def post(self, request):
+        if request.data.get("fail"):
+            raise serializers.ValidationError("falla")
+        return Response({"reads": router.db_for_read(User)}, status=201)
+
+
+@pytest.fixture
+def replica(monkeypatch, settings):
+    # Solo se consulta al router: no hace falta una segunda base real.
+    monkeypatch.setattr(db_router, "replica_available", lambda: True)
+    settings.REPLICA_PIN_SECONDS = 5
+    caches[settings.REPLICA_PIN_CACHE_ALIAS].clear()
+
+
+def _call(user, method="GET", data=None):
+    factory = APIRequestFactory()
+    request = factory.get("/") if method == "GET" else factory.post("/", data or {}, format="json")
+    force_authenticate(request, user=user)
+    return ProbeView.as_view()(request)
+
+
+def test_without_replica_everything_reads_from_primary():
+    with db_router.replica_reads() as alias:
+        assert alias == "default"
+        assert router.db_for_read(User) == "default"
+
+
+def test_replica_reads_except_inside_a_primary_transaction(replica):
+    assert router.db_for_read(User) == "default"
+    with db_router.replica_reads():
+        assert router.db_for_read(User) == "replica"
+        assert router.db_for_write(User) == "default"
+        with transaction.atomic():
+            assert router.db_for_read(User) == "default"
+    assert not router.allow_migrate("replica", "loans")
+
+
+def test_writer_is_pinned_to_primary_and_others_are_not(replica):
+    ana = User.objects.create(username="ana")
+    beto = User.objects.create(username="beto")
+
+    assert _call(ana).data == {"reads": "replica"}
+    assert _call(ana, "POST").data == {"reads": "default"}
+    assert _call(ana).data == {"reads": "default"}
+    assert _call(beto).data == {"reads": "replica"}
+
+
+def test_failed_write_does_not_pin(replica):
+    ana = User.objects.create(username="ana")
+
+    assert _call(ana, "POST", {"fail": True}).status_code == 400
+    assert _call(ana).data == {"reads": "replica"}
+
+
+def test_bound_rows_keep_the_alias_after_the_block(replica):
+    with db_router.replica_reads():
+        rows = db_router.bind_reads(router.db_for_read(User) for _ in range(2))
+
+    assert list(rows) == ["replica", "replica"]
+
+
+def test_replica_requires_a_shared_pin_cache(monkeypatch):
+    monkeypatch.setattr(db_router, "replica_available", lambda: True)
+    with pytest.raises(ImproperlyConfigured, match="caché compartida"):
+        db_router.PrimaryReplicaRouter()
+
+    monkeypatch.setattr(db_router, "is_process_local", lambda alias: False)
+    db_router.PrimaryReplicaRouter()
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from rest_framework import serializers
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from infrastructure.django_apps.accounts.models import User
+from interfaces.api.transactions import TransactionRoutedAPIView
+from interfaces.api.views import RegisterPaymentsBulkView
+
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class ProbeView(TransactionRoutedAPIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response({"in_transaction": connection.in_atomic_block})
+
+    def post(self, request):
+        User.objects.create(username=request.data["username"])
+        if request.data.get("fail"):
+            raise serializers.ValidationError("falla después de escribir")
+        return Response({"in_transaction": connection.in_atomic_block})
+
+
+@pytest.fixture
+def atomic_requests(monkeypatch):
+    monkeypatch.setitem(connection.settings_dict, "ATOMIC_REQUESTS", True)
+
+
+class ChunkedWriteView(ProbeView):
+    non_atomic_methods = frozenset({"POST"})
+
+
+def _call(method, data=None, view=ProbeView):
+    factory = APIRequestFactory()
+    request = factory.get("/") if method == "GET" else factory.post("/", data, format="json")
+    return view.as_view()(request)
+
+
+def test_view_opts_out_of_the_handler_transaction():
+    assert "default" in ProbeView.as_view()._non_atomic_requests
+
+
+def test_reads_run_in_autocommit_and_writes_stay_atomic(atomic_requests, settings):
+    settings.READ_REQUEST_TRANSACTION = "none"
+    assert _call("GET").data == {"in_transaction": False}
+    assert _call("POST", {"username": "ana"}).data == {"in_transaction": True}
+
+    settings.READ_REQUEST_TRANSACTION = "atomic"
+    assert _call("GET").data == {"in_transaction": True}
+
+
+def test_handled_error_rolls_back_the_write(atomic_requests):
+    response = _call("POST", {"username": "beto", "fail": True})
+
+    assert response.status_code == 400
+    assert not User.objects.filter(username="beto").exists()
+
+
+def test_non_atomic_writes_run_in_autocommit(atomic_requests):
+    assert _call("POST", {"username": "eva"}, view=ChunkedWriteView).data == {"in_transaction": False}
+    # El bulk de pagos confirma cada bloque en su propia transacción.
+    assert "POST" in RegisterPaymentsBulkView.non_atomic_methods
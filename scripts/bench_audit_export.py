@@ -0,0 +1,83 @@
+"""
+Benchmark del exportador de auditoría: filas/segundo sobre una base SQLite temporal.
+
+Uso:
+    python scripts/bench_audit_export.py [--rows 200000] [--format ndjson|csv]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "loan_system"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-audit-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.sqlite3'}"
+    os.environ.pop("MYSQL_NAME", None)
+    os.environ.setdefault("DJANGO_SECRET_KEY", "bench-only")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "infrastructure.config.settings")
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+
+    from infrastructure.django_apps.audit.export import ExportOptions, export_audit_log
+    from infrastructure.django_apps.audit.models import AuditLog
+
+    call_command("migrate", verbosity=0)
+
+    since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    print(f"Insertando {args.rows} eventos de auditoría...")
+    batch = []
+    for i in range(args.rows):
+        batch.append(
+            AuditLog(
+                id=uuid4(),
+                action="payment.registered",
+                occurred_at=since + timedelta(seconds=i),
+                after={"payment_id": str(uuid4()), "reference": f"REF-{i}"},
+                meta={"loan_id": str(uuid4())},
+            )
+        )
+        if len(batch) == 10_000:
+            AuditLog.objects.bulk_create(batch)
+            batch = []
+    AuditLog.objects.bulk_create(batch)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    manifest = export_audit_log(
+        ExportOptions(since=since, until=since + timedelta(seconds=args.rows), fmt=args.format, chunk_size=args.chunk_size),
+        export_id="bench",
+        root=workdir,
+    )
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+
+    size = sum(part["bytes"] for part in manifest["parts"])
+    print(f"Formato:        {args.format} (chunk {args.chunk_size})")
+    print(f"Filas:          {manifest['rows']}")
+    print(f"Tiempo:         {elapsed:.2f}s")
+    print(f"Throughput:     {manifest['rows'] / elapsed:,.0f} filas/s")
+    print(f"Comprimido:     {size / 1e6:.1f} MB en {len(manifest['parts'])} partes")
+    print(f"Memoria pico:   {peak / 1e6:.1f} MB (Python, tracemalloc)")
+    print(f"Salida:         {workdir}")
+
+
+if __name__ == "__main__":
+    main()
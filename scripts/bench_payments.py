@@ -0,0 +1,125 @@
+"""
+Benchmark del registro de pagos: pagos/segundo y consultas SQL por pago (SQLite temporal).
+
+Recorre el mismo camino que `POST /api/payments/` (caso de uso dentro de
+`transaction.atomic()`, auditoría `buffered`, proyección del dashboard) y cuenta
+las sentencias emitidas, incluidas las de los callbacks `on_commit`.
+
+Uso:
+    python scripts/bench_payments.py [--payments 5000] [--duplicates 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "loan_system"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--payments", type=int, default=5000)
+    parser.add_argument("--duplicates", type=int, default=500, help="Pagos con referencia repetida")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-payments-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.sqlite3'}"
+    os.environ.pop("MYSQL_NAME", None)
+    os.environ.setdefault("DJANGO_SECRET_KEY", "bench-only")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "infrastructure.config.settings")
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection, transaction
+
+    from application.exceptions import Conflict
+    from application.ports import Actor
+    from application.use_cases import RegisterPaymentCommand, RegisterPaymentUseCase
+    from infrastructure.django_apps.accounts.models import ClientProfile, User
+    from infrastructure.django_apps.analytics.snapshot import rebuild_snapshot
+    from infrastructure.django_apps.loans.installments import generate_installments
+    from infrastructure.django_apps.loans.models import Installment, Loan
+    from infrastructure.repositories.clock import SystemClock
+    from infrastructure.repositories.django_repositories import (
+        DjangoDashboardProjection,
+        DjangoInstallmentRepository,
+        DjangoPaymentRepository,
+        audit_repository,
+    )
+
+    call_command("migrate", verbosity=0)
+
+    term = 12
+    user = User.objects.create(username="bench", role=User.Role.CLIENT)
+    profile = ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("1000000"))
+    loans = Loan.objects.bulk_create(
+        Loan(
+            client_profile=profile,
+            principal_amount=Decimal("1200.00"),
+            monthly_rate=Decimal("0.015000"),
+            term_months=term,
+            status=Loan.Status.APPROVED,
+        )
+        for _ in range(-(-(args.payments + args.duplicates) // term))
+    )
+    generate_installments([str(loan.id) for loan in loans], date(2026, 1, 1))
+    rebuild_snapshot()
+    rows = list(Installment.objects.values_list("id", "amount")[: args.payments + args.duplicates])
+    installments, spare = rows[: args.payments], rows[args.payments :]
+
+    statements = 0
+
+    def count_statements(execute, sql, params, many, context):
+        nonlocal statements
+        statements += 1
+        return execute(sql, params, many, context)
+
+    def register(installment_id, amount, reference):
+        uc = RegisterPaymentUseCase(
+            installments=DjangoInstallmentRepository(),
+            payments=DjangoPaymentRepository(),
+            audit=audit_repository(),
+            clock=SystemClock(),
+            analytics=DjangoDashboardProjection(),
+        )
+        with transaction.atomic():
+            uc.execute(
+                Actor(user_id=None, role="ANALYST"),
+                RegisterPaymentCommand(installment_id=installment_id, reference=reference, amount=amount, currency="USD"),
+            )
+
+    print(f"Registrando {len(installments)} pagos...")
+    with connection.execute_wrapper(count_statements):
+        started = time.perf_counter()
+        for n, (installment_id, amount) in enumerate(installments):
+            register(installment_id, amount, f"BENCH-{n}")
+        elapsed = time.perf_counter() - started
+        ok_statements, statements = statements, 0
+
+        # Referencias ya usadas sobre cuotas impagas: el pago debe rechazarse con 409.
+        rejected = 0
+        for n, (installment_id, amount) in enumerate(spare):
+            try:
+                register(installment_id, amount, f"BENCH-{n}")
+            except Conflict:
+                rejected += 1
+        dup_statements = statements
+
+    count = len(installments)
+    print(f"Pagos:                {count}")
+    print(f"Tiempo:               {elapsed:.2f}s ({count / elapsed:,.0f} pagos/s)")
+    print(f"SQL por pago:         {ok_statements / count:.1f} (incluye callbacks on_commit)")
+    if spare:
+        print(f"SQL por duplicado:    {dup_statements / len(spare):.1f} ({rejected}/{len(spare)} rechazados)")
+    print(f"Salida:               {workdir}")
+
+
+if __name__ == "__main__":
+    main()
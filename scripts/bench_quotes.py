@@ -0,0 +1,71 @@
+"""
+Microbenchmark de cotizaciones: costo por cotización sin caché, con caché LRU y en grilla.
+
+Uso:
+    python scripts/bench_quotes.py [--repeat 20000]
+"""
+import argparse
+import itertools
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "loan_system"))
+
+from application.use_cases import (  # noqa: E402
+    QuoteLoanCommand,
+    QuoteLoanGridCommand,
+    QuoteLoanGridUseCase,
+    QuoteLoanUseCase,
+    _price_quote,
+)
+
+
+# Movimientos de slider típicos: pocas combinaciones que se repiten.
+PRINCIPALS = [Decimal("1000.00"), Decimal("2500.00"), Decimal("5000.00")]
+RATES = [Decimal("0.015"), Decimal("0.020"), Decimal("0.025")]
+TERMS = [6, 12, 24, 36]
+COMMANDS = [
+    QuoteLoanCommand(principal, "USD", rate, term)
+    for principal, rate, term in itertools.product(PRINCIPALS, RATES, TERMS)
+]
+
+
+def bench(label: str, fn, calls: int) -> float:
+    seconds = min(timeit.repeat(fn, number=1, repeat=5))
+    per_quote = seconds / calls * 1e6
+    print(f"{label:<28} {per_quote:8.2f} µs/cotización")
+    return per_quote
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20000, help="Cotizaciones por medición")
+    args = parser.parse_args()
+
+    stream = list(itertools.islice(itertools.cycle(COMMANDS), args.repeat))
+    uncached = _price_quote.__wrapped__
+    use_case = QuoteLoanUseCase()
+
+    print(f"{args.repeat} cotizaciones sobre {len(COMMANDS)} combinaciones distintas\n")
+    before = bench(
+        "sin caché",
+        lambda: [uncached(c.principal_amount, c.currency, c.monthly_rate, c.term_months) for c in stream],
+        len(stream),
+    )
+    _price_quote.cache_clear()
+    after = bench("QuoteLoanUseCase (LRU)", lambda: [use_case.execute(c) for c in stream], len(stream))
+
+    grid = QuoteLoanGridCommand(Decimal("5000.00"), "USD", tuple(RATES), tuple(TERMS))
+    grids = args.repeat // (len(RATES) * len(TERMS))
+    bench(
+        "QuoteLoanGridUseCase",
+        lambda: [QuoteLoanGridUseCase().execute(grid) for _ in range(grids)],
+        grids * len(RATES) * len(TERMS),
+    )
+    print(f"\nAceleración LRU: x{before / after:.1f}  ({_price_quote.cache_info()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark de rate limiting: costo por chequeo y precisión con varios workers.
+
+Mide `infrastructure.security.rate_limit` en cada almacén: local, SQLite con
+bloques de 1 (cada chequeo va al archivo) y con bloques reservados por proceso,
+y Redis si `--redis` responde; si `django_ratelimit` está instalado (ya no es
+dependencia) lo incluye sobre LocMem como referencia del comportamiento anterior. Después lanza `--workers` procesos contra la misma
+clave en SQLite y reporta cuántos requests pasaron frente al límite.
+
+Uso:
+    python scripts/bench_ratelimit.py [--checks 20000] [--workers 4] [--redis redis://localhost:6379/2]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "loan_system"))
+
+
+KEYS = 200  # IPs distintas
+LIMIT = 1000
+PERIOD = 60
+
+
+def per_check_us(fn, checks: int) -> float:
+    started = time.perf_counter()
+    for n in range(checks):
+        fn(n % KEYS)
+    return (time.perf_counter() - started) / checks * 1e6
+
+
+def bench_django_ratelimit(checks: int) -> float:
+    from django.test import RequestFactory
+    from django_ratelimit.core import is_ratelimited
+
+    requests = [RequestFactory().get("/", REMOTE_ADDR=f"10.0.{k // 256}.{k % 256}") for k in range(KEYS)]
+    return per_check_us(
+        lambda k: is_ratelimited(requests[k], group="bench", key="ip", rate=f"{LIMIT}/m", increment=True), checks
+    )
+
+
+def bench_limiter(store, divisor: int, checks: int) -> float:
+    from infrastructure.security.rate_limit import RateLimiter
+
+    limiter = RateLimiter(store, lease_divisor=divisor)
+    return per_check_us(lambda k: limiter.hit(f"bench:{k}", LIMIT, PERIOD), checks)
+
+
+def _worker(path: str, limit: int, hits: int, divisor: int, queue) -> None:
+    from infrastructure.security.rate_limit import RateLimiter, SQLiteStore
+
+    limiter = RateLimiter(SQLiteStore(path), lease_divisor=divisor)
+    now = time.time()
+    queue.put(sum(not limiter.hit("shared", limit, 3600, now=now).limited for _ in range(hits)))
+
+
+def accuracy(path: str, workers: int, limit: int, divisor: int) -> int:
+    queue = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_worker, args=(path, limit, limit, divisor, queue)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    allowed = sum(queue.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+    return allowed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checks", type=int, default=20000, help="Chequeos por variante")
+    parser.add_argument("--workers", type=int, default=4, help="Procesos en la prueba de precisión")
+    parser.add_argument("--redis", default=None, help="URL de Redis (opcional)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-ratelimit-"))
+    os.environ.setdefault("DJANGO_SECRET_KEY", "bench-only")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "infrastructure.config.settings")
+
+    import django
+
+    django.setup()
+
+    from infrastructure.security.rate_limit import LocalStore, RedisStore, SQLiteStore
+
+    results = {}
+    try:
+        results["django_ratelimit (LocMem)"] = bench_django_ratelimit(args.checks)
+    except ImportError:
+        pass
+    results["local"] = bench_limiter(LocalStore(), 20, args.checks)
+    results["sqlite, bloque 1"] = bench_limiter(SQLiteStore(str(workdir / "exact.sqlite3")), LIMIT + 1, args.checks)
+    results[f"sqlite, bloque {LIMIT // 20}"] = bench_limiter(
+        SQLiteStore(str(workdir / "leased.sqlite3")), 20, args.checks
+    )
+    if args.redis:
+        results["redis, bloque 1"] = bench_limiter(RedisStore(args.redis), LIMIT + 1, args.checks)
+        results[f"redis, bloque {LIMIT // 20}"] = bench_limiter(RedisStore(args.redis), 20, args.checks)
+
+    print(f"{args.checks} chequeos sobre {KEYS} claves, límite {LIMIT}/{PERIOD}s\n")
+    for name, us in results.items():
+        print(f"{name:<28} {us:8.2f} µs/chequeo")
+
+    print(f"\n{args.workers} workers contra la misma clave (SQLite compartido)")
+    for limit, divisor in ((10, 20), (200, 20), (1000, 20)):
+        allowed = accuracy(str(workdir / f"acc-{limit}.sqlite3"), args.workers, limit, divisor)
+        print(f"  límite {limit:>5}: {allowed:>5} permitidos (bloque {max(1, limit // divisor)})")
+    print(f"\nSalida:                      {workdir}")
+
+
+if __name__ == "__main__":
+    main()
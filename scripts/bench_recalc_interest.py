@@ -0,0 +1,93 @@
+"""
+Benchmark de la re-tasación de cartera: préstamos/segundo y consultas SQL por bloque (SQLite temporal).
+
+Crea `--loans` préstamos aprobados de 12 cuotas (3 pagadas) y los lleva a otra
+tasa con `reprice_loans`, primero en dry-run y luego escribiendo.
+
+Uso:
+    python scripts/bench_recalc_interest.py [--loans 20000] [--chunk-size 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "loan_system"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--loans", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-recalc-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.sqlite3'}"
+    os.environ.pop("MYSQL_NAME", None)
+    os.environ.setdefault("DJANGO_SECRET_KEY", "bench-only")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "infrastructure.config.settings")
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    from infrastructure.django_apps.accounts.models import ClientProfile, User
+    from infrastructure.django_apps.loans import balances
+    from infrastructure.django_apps.loans.installments import generate_installments
+    from infrastructure.django_apps.loans.models import Installment, Loan
+    from infrastructure.django_apps.loans.repricing import RepriceOptions, reprice_loans
+
+    call_command("migrate", verbosity=0)
+
+    user = User.objects.create(username="bench", role=User.Role.CLIENT)
+    profile = ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("1000000"))
+    loans = Loan.objects.bulk_create(
+        Loan(
+            client_profile=profile,
+            principal_amount=Decimal(1000 + 50 * (n % 20)),
+            monthly_rate=Decimal("0.020000"),
+            term_months=12,
+            status=Loan.Status.APPROVED,
+        )
+        for n in range(args.loans)
+    )
+    ids = [str(loan.id) for loan in loans]
+    for offset in range(0, len(ids), 1000):
+        generate_installments(ids[offset : offset + 1000], date(2026, 1, 1))
+    Installment.objects.filter(number__lte=3).update(status=Installment.Status.PAID)
+    balances.recompute_open_balances()
+
+    statements = 0
+
+    def count_statements(execute, sql, params, many, context):
+        nonlocal statements
+        statements += 1
+        return execute(sql, params, many, context)
+
+    results = {}
+    for label, dry_run in (("dry-run", True), ("escritura", False)):
+        statements = 0
+        options = RepriceOptions(new_rate=Decimal("0.015000"), dry_run=dry_run, chunk_size=args.chunk_size)
+        with connection.execute_wrapper(count_statements):
+            started = time.perf_counter()
+            result = reprice_loans(options)
+            elapsed = time.perf_counter() - started
+        results[label] = (result, elapsed, statements)
+
+    for label, (result, elapsed, count) in results.items():
+        chunks = result["chunks"] or 1
+        print(f"{label:<10} préstamos: {result['loans']}  cuotas: {result['installments']}")
+        print(f"{'':<10} tiempo: {elapsed:.2f}s ({result['loans'] / elapsed:,.0f} préstamos/s)")
+        print(f"{'':<10} SQL por bloque: {count / chunks:.1f} ({chunks} bloques de {args.chunk_size})")
+    print(f"Salida:    {workdir}")
+
+
+if __name__ == "__main__":
+    main()
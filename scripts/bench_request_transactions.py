@@ -0,0 +1,182 @@
+"""
+Costo transaccional por endpoint: idas y vueltas a la base y tiempo con transacción abierta.
+
+Activa `ATOMIC_REQUESTS` (como la configuración MySQL) y llama a cada endpoint
+en el mismo proceso con cada valor de `READ_REQUEST_TRANSACTION`. Por request
+cuenta las sentencias SQL, las operaciones de control de transacción que van a
+la base (`SET autocommit`, `BEGIN`, `COMMIT`, `ROLLBACK`; los `SAVEPOINT` ya
+cuentan como sentencias) y el tiempo entre el inicio y el fin de la transacción,
+que es cuánto se retienen locks y snapshot. Las escrituras son atómicas en todos
+los modos; aparecen como referencia.
+
+Base de datos: SQLite temporal por defecto, o `--database mysql` con `MYSQL_*`
+(descartable: se migra y se siembra).
+
+Uso:
+    python scripts/bench_request_transactions.py [--requests 200] [--clients 500] [--database sqlite|mysql]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "loan_system"))
+
+
+MODES = ("atomic", "read_only", "none")
+
+
+class TransactionProbe:
+    """Cuenta sentencias y control de transacción de una conexión, y mide la transacción abierta."""
+
+    CONTROL = ("_set_autocommit", "_commit", "_rollback", "_start_transaction_under_autocommit")
+
+    def __init__(self, connection) -> None:
+        self.connection = connection
+        self.statements = self.control = 0
+        self.open_seconds = 0.0
+        self._opened = None
+        for name in self.CONTROL:
+            if hasattr(connection, name):
+                setattr(connection, name, self._wrap(name, getattr(connection, name)))
+
+    def _wrap(self, name, method):
+        def wrapped(*args, **kwargs):
+            # El BEGIN de SQLite pasa por el cursor y ya cuenta como sentencia.
+            self.control += name != "_start_transaction_under_autocommit"
+            starts = name == "_start_transaction_under_autocommit" or (name == "_set_autocommit" and args[0] is False)
+            if starts and self._opened is None:
+                self._opened = time.perf_counter()
+            if name in ("_commit", "_rollback") and self._opened is not None:
+                self.open_seconds += time.perf_counter() - self._opened
+                self._opened = None
+            return method(*args, **kwargs)
+
+        return wrapped
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements += 1
+        return execute(sql, params, many, context)
+
+    def reset(self) -> None:
+        self.statements = self.control = 0
+        self.open_seconds = 0.0
+
+
+def seed(clients: int) -> dict:
+    from infrastructure.django_apps.accounts.models import User
+    from infrastructure.django_apps.analytics.snapshot import rebuild_snapshot
+    from infrastructure.django_apps.loans.models import Installment
+    from infrastructure.django_apps.loans.synthetic import SeedOptions, generate
+    from infrastructure.security.jwt_auth import RoleTokenObtainPairSerializer
+
+    for _ in generate(SeedOptions(clients=clients, prefix="tx", today=date(2026, 1, 1))):
+        pass
+    rebuild_snapshot()
+    analyst = User.objects.create(username="tx-analyst", role=User.Role.ANALYST)
+    return {
+        "token": str(RoleTokenObtainPairSerializer.get_token(analyst).access_token),
+        "installments": list(
+            Installment.objects.filter(status=Installment.Status.PENDING).values_list("id", "amount")[:5000]
+        ),
+    }
+
+
+def endpoints(data: dict):
+    installments = iter(data["installments"])
+
+    def payment(n):
+        installment_id, amount = next(installments)
+        return {"installment_id": str(installment_id), "reference": f"TX-{n}-{installment_id}", "amount": str(amount), "currency": "USD"}
+
+    quote = {"principal_amount": "1200.00", "currency": "USD", "monthly_rate": "0.015", "term_months": 12}
+    return [
+        ("GET /api/analytics/dashboard/", "get", "/api/analytics/dashboard/", None),
+        ("GET /api/loans/", "get", "/api/loans/", None),
+        ("GET /api/clients/", "get", "/api/clients/", None),
+        ("POST /api/loans/quote/", "post", "/api/loans/quote/", lambda n: quote),
+        ("POST /api/payments/ (escritura)", "post", "/api/payments/", payment),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200, help="Requests por endpoint y modo")
+    parser.add_argument("--clients", type=int, default=500, help="Clientes sintéticos a sembrar")
+    parser.add_argument("--database", choices=("sqlite", "mysql"), default="sqlite")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-request-tx-"))
+    if args.database == "sqlite":
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.sqlite3'}"
+        os.environ.pop("MYSQL_NAME", None)
+    elif not os.environ.get("MYSQL_NAME"):
+        sys.exit("--database mysql requiere MYSQL_NAME/MYSQL_USER/MYSQL_PASSWORD en el entorno")
+    os.environ.setdefault("DJANGO_SECRET_KEY", "bench-only-secret-key-not-for-production-use")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "infrastructure.config.settings")
+    os.environ["DJANGO_DEBUG"] = "0"
+    os.environ["DJANGO_SECURE_SSL_REDIRECT"] = "0"
+    os.environ["DJANGO_ALLOWED_HOSTS"] = "testserver"
+    os.environ["CELERY_BROKER_URL"] = "memory://"
+    os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
+
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+
+    call_command("migrate", verbosity=0)
+    data = seed(args.clients)
+    settings.RATELIMIT_ENABLE = False
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    connection.settings_dict["ATOMIC_REQUESTS"] = True
+
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {data['token']}")
+    probe = TransactionProbe(connection)
+    rows = []
+    with connection.execute_wrapper(probe):
+        for label, method, path, body in endpoints(data):
+            modes = MODES if not label.endswith("(escritura)") else ("atomic",)
+            for mode in modes:
+                settings.READ_REQUEST_TRANSACTION = mode
+                latencies = []
+                probe.reset()
+                for n in range(args.requests):
+                    started = time.perf_counter()
+                    if method == "get":
+                        response = client.get(path)
+                    else:
+                        response = client.post(path, body(n), content_type="application/json")
+                    latencies.append(time.perf_counter() - started)
+                    assert response.status_code < 400, (label, response.status_code, response.content[:200])
+                rows.append(
+                    (
+                        label,
+                        mode,
+                        probe.statements / args.requests,
+                        probe.control / args.requests,
+                        probe.open_seconds / args.requests * 1000,
+                        statistics.median(latencies) * 1000,
+                    )
+                )
+
+    print(f"{args.requests} requests por endpoint y modo, {connection.vendor}, ATOMIC_REQUESTS=True\n")
+    print(f"{'endpoint':<34} {'modo':<10} {'SQL':>6} {'ctl tx':>7} {'idas':>6} {'tx abierta':>11} {'p50':>9}")
+    for label, mode, statements, control, open_ms, p50 in rows:
+        print(
+            f"{label:<34} {mode:<10} {statements:>6.1f} {control:>7.1f} {statements + control:>6.1f} "
+            f"{open_ms:>8.2f} ms {p50:>6.2f} ms"
+        )
+    print(f"\nSalida: {workdir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Benchmark de casos de uso: operaciones/segundo con repositorios en memoria y con Django (SQLite temporal).
+
+Ejecuta `CreateLoanUseCase`, `DecideLoanUseCase` y `RegisterPaymentUseCase` con
+las implementaciones en memoria de los puertos y con las de Django (una unidad de
+trabajo por operación, como en las vistas). La diferencia entre ambas columnas es
+el costo del ORM y la base; la columna en memoria es el costo de dominio y
+aplicación. `QuoteLoanUseCase` no usa repositorios y se mide una sola vez, con y
+sin el LRU.
+
+Uso:
+    python scripts/bench_use_cases.py [--ops 2000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "loan_system"))
+
+
+PRINCIPAL = Decimal("1200.00")
+RATE = Decimal("0.015")
+TERM = 12
+
+
+def timed(fn, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - started)
+
+
+def run_memory(ops: int) -> dict[str, float]:
+    from application.ports import Actor
+    from application.use_cases import (
+        CreateLoanCommand,
+        CreateLoanUseCase,
+        DecideLoanCommand,
+        DecideLoanUseCase,
+        RegisterPaymentCommand,
+        RegisterPaymentUseCase,
+    )
+    from domain.entities import Client, ClientStatus
+    from domain.value_objects import Money
+    from infrastructure.repositories.memory_repositories import (
+        FixedClock,
+        InMemoryAuditRepository,
+        InMemoryClientRepository,
+        InMemoryDashboardProjection,
+        InMemoryInstallmentRepository,
+        InMemoryInstallmentScheduler,
+        InMemoryLoanRepository,
+        InMemoryPaymentRepository,
+        InMemoryStore,
+    )
+
+    store = InMemoryStore()
+    client = store.add_client(
+        Client(uuid4(), "bench", "bench@example.com", ClientStatus.ACTIVE, False, Money(Decimal("1000000"), "USD"))
+    )
+    actor, clock, analytics = Actor(user_id=None, role="ANALYST"), FixedClock(), InMemoryDashboardProjection()
+    create = CreateLoanUseCase(
+        loans=InMemoryLoanRepository(store),
+        clients=InMemoryClientRepository(store),
+        audit=InMemoryAuditRepository(store),
+        clock=clock,
+        analytics=analytics,
+    )
+    decide = DecideLoanUseCase(
+        loans=InMemoryLoanRepository(store),
+        clients=InMemoryClientRepository(store),
+        audit=InMemoryAuditRepository(store),
+        clock=clock,
+        analytics=analytics,
+    )
+    pay = RegisterPaymentUseCase(
+        installments=InMemoryInstallmentRepository(store),
+        payments=InMemoryPaymentRepository(store),
+        audit=InMemoryAuditRepository(store),
+        clock=clock,
+        analytics=analytics,
+    )
+
+    command = CreateLoanCommand(client.id, PRINCIPAL, "USD", RATE, TERM)
+    results = {"CreateLoan": timed(lambda _: create.execute(actor, command), range(ops))}
+    loan_ids = list(store.loans)
+    results["DecideLoan"] = timed(lambda loan_id: decide.execute(actor, DecideLoanCommand(loan_id, True)), loan_ids)
+
+    InMemoryInstallmentScheduler(store).loans_approved(
+        [store.loans[i] for i in loan_ids[: -(-ops // TERM)]], datetime.now(tz=timezone.utc)
+    )
+    installments = list(store.installments.values())[:ops]
+    results["RegisterPayment"] = timed(
+        lambda i: pay.execute(actor, RegisterPaymentCommand(i.id, f"BENCH-{i.id}", i.amount.amount, "USD")),
+        installments,
+    )
+    return results
+
+
+def run_django(ops: int) -> dict[str, float]:
+    from application.ports import Actor
+    from application.use_cases import (
+        CreateLoanCommand,
+        CreateLoanUseCase,
+        DecideLoanCommand,
+        DecideLoanUseCase,
+        RegisterPaymentCommand,
+        RegisterPaymentUseCase,
+    )
+    from django.core.management import call_command
+    from infrastructure.django_apps.accounts.models import ClientProfile, User
+    from infrastructure.django_apps.analytics.snapshot import rebuild_snapshot
+    from infrastructure.django_apps.loans.installments import generate_installments
+    from infrastructure.django_apps.loans.models import Installment, Loan
+    from infrastructure.repositories.clock import SystemClock
+    from infrastructure.repositories.django_repositories import (
+        DjangoDashboardProjection,
+        client_repository,
+        unit_of_work,
+    )
+
+    call_command("migrate", verbosity=0)
+    user = User.objects.create(username="bench", role=User.Role.CLIENT)
+    profile = ClientProfile.objects.create(user=user, payment_capacity_monthly=Decimal("1000000"))
+    rebuild_snapshot()
+    actor, clock, analytics = Actor(user_id=None, role="ANALYST"), SystemClock(), DjangoDashboardProjection()
+
+    def create(command):
+        with unit_of_work() as uow:
+            CreateLoanUseCase(
+                loans=uow.loans, clients=client_repository(), audit=uow.audit, clock=clock, analytics=analytics, uow=uow
+            ).execute(actor, command)
+
+    def decide(loan_id):
+        with unit_of_work() as uow:
+            DecideLoanUseCase(
+                loans=uow.loans, clients=client_repository(), audit=uow.audit, clock=clock, analytics=analytics, uow=uow
+            ).execute(actor, DecideLoanCommand(loan_id, True))
+
+    def pay(row):
+        installment_id, amount = row
+        with unit_of_work() as uow:
+            RegisterPaymentUseCase(
+                installments=uow.installments,
+                payments=uow.payments,
+                audit=uow.audit,
+                clock=clock,
+                analytics=analytics,
+                uow=uow,
+            ).execute(actor, RegisterPaymentCommand(installment_id, f"BENCH-{installment_id}", amount, "USD"))
+
+    command = CreateLoanCommand(profile.id, PRINCIPAL, "USD", RATE, TERM)
+    results = {"CreateLoan": timed(create, [command] * ops)}
+    loan_ids = list(Loan.objects.order_by("created_at").values_list("id", flat=True))
+    results["DecideLoan"] = timed(decide, loan_ids)
+
+    generate_installments([str(i) for i in loan_ids[: -(-ops // TERM)]])
+    rows = list(Installment.objects.values_list("id", "amount")[:ops])
+    results["RegisterPayment"] = timed(pay, rows)
+    return results
+
+
+def run_quotes(ops: int) -> dict[str, float]:
+    from application.use_cases import QuoteLoanCommand, QuoteLoanUseCase, _price_quote
+
+    commands = [QuoteLoanCommand(PRINCIPAL, "USD", RATE, TERM + n % 24) for n in range(ops)]
+    uncached = _price_quote.__wrapped__
+    _price_quote.cache_clear()
+    use_case = QuoteLoanUseCase()
+    return {
+        "Quote (sin caché)": timed(lambda c: uncached(c.principal_amount, c.currency, c.monthly_rate, c.term_months), commands),
+        "Quote (LRU)": timed(use_case.execute, commands),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=2000, help="Operaciones por caso de uso")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-use-cases-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.sqlite3'}"
+    os.environ.pop("MYSQL_NAME", None)
+    os.environ.setdefault("DJANGO_SECRET_KEY", "bench-only")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "infrastructure.config.settings")
+
+    import django
+
+    django.setup()
+
+    memory = run_memory(args.ops)
+    sqlite = run_django(args.ops)
+
+    print(f"{args.ops} operaciones por caso de uso\n")
+    print(f"{'caso de uso':<20} {'memoria':>15} {'sqlite':>15} {'ORM+DB':>12}")
+    for name, mem_rate in memory.items():
+        orm_us = (1 / sqlite[name] - 1 / mem_rate) * 1e6
+        print(f"{name:<20} {mem_rate:>10,.0f} op/s {sqlite[name]:>10,.0f} op/s {orm_us:>9.0f} µs/op")
+    for name, rate in run_quotes(args.ops).items():
+        print(f"{name:<20} {rate:>10,.0f} op/s {'-':>15} {'-':>12}")
+    print(f"\nSalida:               {workdir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Prueba de carga HTTP de la API: latencia p50/p95/p99, throughput y consultas SQL por endpoint, en JSON.
+
+Levanta la aplicación WSGI en un servidor HTTP con un hilo por request (como
+gunicorn con workers `gthread`), siembra datos en bloque y golpea los endpoints
+con `--concurrency` clientes simultáneos, un endpoint por fase:
+
+    quote      POST /api/loans/quote/
+    create     POST /api/loans/
+    decide     POST /api/loans/<id>/decision/   (aprueba; cuotas generadas en el acto)
+    pay        POST /api/payments/
+    dashboard  GET  /api/analytics/dashboard/
+    list       GET  /api/loans/
+
+Base de datos: SQLite temporal (WAL) por defecto; con `--database mysql` usa la
+base configurada en `MYSQL_*` (por ejemplo, el contenedor de `scripts/e2e_mysql.ps1`),
+que debe ser descartable porque se migra y se siembra. El rate limit se
+desactiva salvo `--keep-ratelimit`. Guardar el JSON por commit permite comparar
+corridas.
+
+Uso:
+    python scripts/loadtest_api.py [--requests 500] [--concurrency 16] [--clients 2000]
+        [--endpoints quote,create,decide,pay,dashboard,list] [--database sqlite|mysql] [--output out.json]
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loan_system"))
+
+ENDPOINTS = ("quote", "create", "decide", "pay", "dashboard", "list")
+ENDPOINT_HEADER = "X-Loadtest-Endpoint"
+
+
+class ThreadingServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class QueryProbe:
+    """Middleware WSGI: cuenta las sentencias SQL de cada request (incluido el cuerpo y los on_commit)."""
+
+    def __init__(self, app):
+        self.app = app
+        self.lock = threading.Lock()
+        self.queries: dict[str, list[int]] = {}
+
+    def __call__(self, environ, start_response):
+        from django.db import connection
+
+        count = 0
+
+        def counter(execute, sql, params, many, context):
+            nonlocal count
+            count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(counter):
+            result = self.app(environ, start_response)
+            try:
+                body = b"".join(result)
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+        endpoint = environ.get("HTTP_" + ENDPOINT_HEADER.upper().replace("-", "_"), "otro")
+        with self.lock:
+            self.queries.setdefault(endpoint, []).append(count)
+        return [body]
+
+
+def configure_environment(args) -> Path:
+    workdir = Path(tempfile.mkdtemp(prefix="loadtest-api-"))
+    if args.database == "sqlite":
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'loadtest.sqlite3'}"
+        os.environ.pop("MYSQL_NAME", None)
+    elif not os.environ.get("MYSQL_NAME"):
+        sys.exit("--database mysql requiere MYSQL_NAME/MYSQL_USER/MYSQL_PASSWORD en el entorno")
+    os.environ.setdefault("DJANGO_SECRET_KEY", "loadtest-only-secret-key-not-for-production")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "infrastructure.config.settings")
+    os.environ["DJANGO_DEBUG"] = "0"
+    os.environ["DJANGO_SECURE_SSL_REDIRECT"] = "0"
+    os.environ["DJANGO_ALLOWED_HOSTS"] = "127.0.0.1,localhost"
+    os.environ["JWT_ACCESS_MINUTES"] = "240"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Sin broker: la generación de cuotas de las aprobaciones corre dentro del request.
+    os.environ["CELERY_BROKER_URL"] = "memory://"
+    os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
+    return workdir
+
+
+def seed(args) -> dict:
+    """Clientes con un préstamo aprobado y su plan de cuotas, más clientes con un préstamo pendiente."""
+    from infrastructure.django_apps.accounts.models import ClientProfile, User
+    from infrastructure.django_apps.analytics.snapshot import rebuild_snapshot
+    from infrastructure.django_apps.loans.installments import generate_installments
+    from infrastructure.django_apps.loans.models import Installment, Loan
+
+    pending = args.requests  # una decisión por préstamo pendiente
+    total = args.clients + pending
+    users = User.objects.bulk_create(
+        User(username=f"lt-client-{n}", role=User.Role.CLIENT) for n in range(total)
+    )
+    profiles = ClientProfile.objects.bulk_create(
+        ClientProfile(user=user, payment_capacity_monthly=Decimal("5000.00")) for user in users
+    )
+    loans = Loan.objects.bulk_create(
+        Loan(
+            client_profile=profile,
+            principal_amount=Decimal("1200.00"),
+            monthly_rate=Decimal("0.015000"),
+            term_months=12,
+            status=Loan.Status.APPROVED if n < args.clients else Loan.Status.PENDING,
+        )
+        for n, profile in enumerate(profiles)
+    )
+    approved = [str(loan.id) for loan in loans[: args.clients]]
+    for offset in range(0, len(approved), 1000):
+        generate_installments(approved[offset : offset + 1000], date(2026, 1, 1))
+    rebuild_snapshot()
+
+    analyst = User.objects.create(username="lt-analyst", role=User.Role.ANALYST)
+    return {
+        "analyst": analyst,
+        "clients": [str(p.id) for p in profiles[: args.clients]],
+        "pending_loans": [str(loan.id) for loan in loans[args.clients :]],
+        "installments": [
+            (str(i), str(amount))
+            for i, amount in Installment.objects.filter(number=1).values_list("id", "amount")[: args.requests]
+        ],
+        "counts": {"clients": total, "loans": len(loans), "installments": Installment.objects.count()},
+    }
+
+
+def plan(endpoint: str, n: int, data: dict) -> tuple[str, str, dict | None]:
+    if endpoint == "quote":
+        return "POST", "/api/loans/quote/", {
+            "principal_amount": str(1000 + (n % 50) * 100), "currency": "USD", "monthly_rate": "0.015", "term_months": 12,
+        }
+    if endpoint == "create":
+        client_id = data["clients"][n % len(data["clients"])]
+        return "POST", "/api/loans/", {
+            "client_id": client_id, "principal_amount": "1200.00", "currency": "USD", "monthly_rate": "0.015", "term_months": 12,
+        }
+    if endpoint == "decide":
+        return "POST", f"/api/loans/{data['pending_loans'][n % len(data['pending_loans'])]}/decision/", {"approve": True}
+    if endpoint == "pay":
+        installment_id, amount = data["installments"][n % len(data["installments"])]
+        return "POST", "/api/payments/", {
+            "installment_id": installment_id, "reference": f"LT-{n}", "amount": amount, "currency": "USD",
+        }
+    if endpoint == "dashboard":
+        return "GET", "/api/analytics/dashboard/", None
+    return "GET", "/api/loans/", None
+
+
+def run_phase(base_url: str, token: str, endpoint: str, data: dict, args) -> dict:
+    def call(n):
+        method, path, body = plan(endpoint, n, data)
+        request = urllib.request.Request(
+            base_url + path,
+            method=method,
+            data=json.dumps(body).encode() if body is not None else None,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+                ENDPOINT_HEADER: endpoint,
+            },
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as exc:
+            status = exc.code
+        except OSError:
+            status = 0
+        return time.perf_counter() - started, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(call, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    statuses: dict[str, int] = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(results),
+        "errors": sum(1 for _, status in results if not 200 <= status < 300),
+        "statuses": statuses,
+        "throughput_rps": round(len(results) / elapsed, 1),
+        "p50_ms": percentile_ms(latencies, 0.50),
+        "p95_ms": percentile_ms(latencies, 0.95),
+        "p99_ms": percentile_ms(latencies, 0.99),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def percentile_ms(ordered: list[float], p: float) -> float:
+    # Rango más cercano: el valor bajo el cual queda al menos el p% de las muestras.
+    return round(ordered[max(0, math.ceil(p * len(ordered)) - 1)] * 1000, 2)
+
+
+def query_stats(counts: list[int]) -> dict:
+    ordered = sorted(counts)
+    return {
+        "queries_mean": round(sum(ordered) / len(ordered), 2),
+        "queries_p95": ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)],
+        "queries_max": ordered[-1],
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500, help="Requests por endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=2000, help="Clientes sembrados con un préstamo aprobado")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--database", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--keep-ratelimit", action="store_true", help="No desactivar el rate limiting")
+    parser.add_argument("--output", default=None, help="Archivo JSON de salida (default: stdout)")
+    args = parser.parse_args()
+
+    endpoints = [e for e in args.endpoints.split(",") if e]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"Endpoints desconocidos: {', '.join(sorted(unknown))}")
+    if args.requests > args.clients:
+        parser.error("--requests no puede superar --clients (cada pago usa una cuota distinta)")
+
+    workdir = configure_environment(args)
+
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.core.wsgi import get_wsgi_application
+    from django.core.management import call_command
+    from django.db import connection
+    from infrastructure.security.jwt_auth import RoleTokenObtainPairSerializer
+
+    if connection.vendor == "sqlite":
+        # Escrituras concurrentes: WAL y espera del lock en lugar de "database is locked".
+        settings.DATABASES["default"].setdefault("OPTIONS", {}).update(
+            timeout=30, transaction_mode="IMMEDIATE", init_command="PRAGMA journal_mode=WAL;"
+        )
+        connection.settings_dict["OPTIONS"] = settings.DATABASES["default"]["OPTIONS"]
+    settings.RATELIMIT_ENABLE = args.keep_ratelimit
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    call_command("migrate", verbosity=0)
+    print("Sembrando datos...", file=sys.stderr)
+    data = seed(args)
+    token = str(RoleTokenObtainPairSerializer.get_token(data["analyst"]).access_token)
+    connection.close()
+
+    probe = QueryProbe(get_wsgi_application())
+    server = make_server("127.0.0.1", 0, probe, server_class=ThreadingServer, handler_class=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(tz=timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "requests_per_endpoint": args.requests,
+            "concurrency": args.concurrency,
+            "seed": data["counts"],
+            "ratelimit": args.keep_ratelimit,
+            "django": django.get_version(),
+            "python": sys.version.split()[0],
+        },
+        "endpoints": {},
+    }
+    try:
+        for endpoint in endpoints:
+            print(f"Fase {endpoint}...", file=sys.stderr)
+            result = run_phase(base_url, token, endpoint, data, args)
+            result.update(query_stats(probe.queries.get(endpoint, [0])))
+            report["endpoints"][endpoint] = result
+    finally:
+        server.shutdown()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"Reporte: {args.output} (datos en {workdir})", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Primaria y réplica con dos archivos SQLite: ruteo de lecturas y demora de replicación.
+
+La "replicación" es una copia del archivo primario al de la réplica
+(`sqlite3.Connection.backup`) que solo ocurre cuando el script la pide; entre
+copias la réplica queda atrasada, como una réplica con demora. Recorre:
+
+1. Listados y dashboard de un analista: consultas a la réplica, ninguna a la primaria.
+2. El analista crea un cliente: lo ve en su listado (fijado a la primaria por
+   `REPLICA_PIN_SECONDS`); otro analista todavía no (réplica atrasada).
+3. Vence la fijación: el autor vuelve a leer de la réplica y tampoco lo ve.
+4. Se replica: ambos lo ven.
+
+Termina con error si alguna lectura no fue a la base esperada.
+
+Uso:
+    python scripts/replica_lag_demo.py [--clients 200] [--pin-seconds 1]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "loan_system"))
+
+
+class AliasProbe:
+    """Cuenta las sentencias que llegan a cada base."""
+
+    def __init__(self) -> None:
+        self.counts = Counter()
+
+    def wrapper(self, alias):
+        def count(execute, sql, params, many, context):
+            self.counts[alias] += 1
+            return execute(sql, params, many, context)
+
+        return count
+
+
+def replicate(primary: Path, replica: Path) -> None:
+    from django.db import connections
+
+    connections["replica"].close()
+    with sqlite3.connect(primary) as source, sqlite3.connect(replica) as target:
+        source.backup(target)
+
+
+def client_ids(client) -> set:
+    response = client.get("/api/clients/?stream=ndjson")
+    assert response.status_code == 200, response.status_code
+    return {json.loads(line)["client_id"] for line in b"".join(response.streaming_content).splitlines()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=200, help="Clientes sintéticos a sembrar")
+    parser.add_argument("--pin-seconds", type=int, default=1, help="REPLICA_PIN_SECONDS")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="replica-lag-"))
+    primary, replica = workdir / "primary.sqlite3", workdir / "replica.sqlite3"
+    os.environ["DATABASE_URL"] = f"sqlite:///{primary}"
+    os.environ["REPLICA_DATABASE_URL"] = f"sqlite:///{replica}"
+    os.environ["REPLICA_PIN_SECONDS"] = str(args.pin_seconds)
+    # La fijación a la primaria necesita una caché compartida; entre procesos de la misma máquina basta un directorio.
+    os.environ["CACHE_URL"] = f"filecache://{workdir / 'cache'}"
+    os.environ.pop("MYSQL_NAME", None)
+    os.environ.setdefault("DJANGO_SECRET_KEY", "bench-only-secret-key-not-for-production-use")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "infrastructure.config.settings")
+    os.environ["DJANGO_DEBUG"] = "0"
+    os.environ["DJANGO_SECURE_SSL_REDIRECT"] = "0"
+    os.environ["DJANGO_ALLOWED_HOSTS"] = "testserver"
+    os.environ["CELERY_BROKER_URL"] = "memory://"
+    os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
+
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+    from django.test import Client
+
+    from infrastructure.django_apps.accounts.models import User
+    from infrastructure.django_apps.analytics.snapshot import rebuild_snapshot
+    from infrastructure.django_apps.loans.synthetic import SeedOptions, generate
+    from infrastructure.security.jwt_auth import RoleTokenObtainPairSerializer
+
+    call_command("migrate", verbosity=0)
+    for _ in generate(SeedOptions(clients=args.clients, prefix="lag", today=date(2026, 1, 1))):
+        pass
+    rebuild_snapshot()
+    clients = {}
+    for name in ("autor", "otro"):
+        analyst = User.objects.create(username=f"lag-{name}", role=User.Role.ANALYST)
+        token = RoleTokenObtainPairSerializer.get_token(analyst).access_token
+        clients[name] = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+    settings.RATELIMIT_ENABLE = False
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    replicate(primary, replica)
+
+    probe = AliasProbe()
+    failures = []
+
+    def step(label, expected_alias, fn):
+        probe.counts.clear()
+        with connections["default"].execute_wrapper(probe.wrapper("default")), connections[
+            "replica"
+        ].execute_wrapper(probe.wrapper("replica")):
+            result = fn()
+        other = "default" if expected_alias == "replica" else "replica"
+        ok = probe.counts[expected_alias] > 0 and probe.counts[other] == 0
+        failures.extend([] if ok else [label])
+        print(f"{label:<52} primaria {probe.counts['default']:>3}  réplica {probe.counts['replica']:>3}  {'ok' if ok else 'FALLA'}")
+        return result
+
+    author, other = clients["autor"], clients["otro"]
+    step("GET /api/analytics/dashboard/", "replica", lambda: other.get("/api/analytics/dashboard/"))
+    step("GET /api/loans/", "replica", lambda: other.get("/api/loans/"))
+    step("GET /api/clients/?stream=ndjson", "replica", lambda: client_ids(other))
+
+    response = author.post(
+        "/api/clients/", {"name": "Cliente Nuevo", "email": "nuevo@example.com"}, content_type="application/json"
+    )
+    assert response.status_code == 201, response.content[:200]
+    created = response.json()["client_id"]
+
+    seen = {
+        "autor, fijado": step("autor lista clientes (fijado a la primaria)", "default", lambda: created in client_ids(author)),
+        "otro, réplica atrasada": step("otro analista lista clientes (réplica)", "replica", lambda: created in client_ids(other)),
+    }
+    time.sleep(args.pin_seconds + 0.1)
+    seen["autor, fijación vencida"] = step("autor lista clientes (vencida la fijación)", "replica", lambda: created in client_ids(author))
+    replicate(primary, replica)
+    seen["otro, replicado"] = step("otro analista lista clientes (replicado)", "replica", lambda: created in client_ids(other))
+
+    print()
+    expected = {"autor, fijado": True, "otro, réplica atrasada": False, "autor, fijación vencida": False, "otro, replicado": True}
+    for label, visible in seen.items():
+        print(f"{label:<28} ve el cliente nuevo: {'sí' if visible else 'no'}")
+        if visible != expected[label]:
+            failures.append(label)
+    print(f"\nSalida: {workdir}")
+    if failures:
+        sys.exit(f"Lecturas inesperadas: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()